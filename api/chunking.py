@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -7,6 +7,7 @@ from utils.metadata_extractor import MetadataExtractor
 from utils.db import SessionLocal
 from repositories.master_repository import MasterRepository
 from repositories.document_repository import DocumentRepository
+from services.chunk_sync_service import ChunkSyncService
 from schemas.chunking import ChunkingRequest, ChunkingResponse, ChunkResponse, StandardResponse,ChunkUpdateRequest,ChunkBulkUpdateRequest
 
 router = APIRouter(prefix="/api/chunks", tags=["Chunking"])
@@ -22,6 +23,23 @@ def get_db():
 # ------------------------------
 # CREATE / Chunk Documents
 # ------------------------------
+def sync_chunk_changes():
+    """
+    Terapkan change feed (edit/delete chunk) ke ChromaDB setelah response;
+    jika gagal, event tetap tersimpan dan diambil embedding worker
+    """
+    from api.embeding import get_embedding_service
+
+    db = SessionLocal()
+    try:
+        ChunkSyncService(db, get_embedding_service()).drain_changes()
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Sync chunk ke Chroma gagal: {e}")
+    finally:
+        db.close()
+
+
 @router.post("/process", response_model=ChunkingResponse)
 def chunk_documents(payload: ChunkingRequest, db: Session = Depends(get_db)):
     chunker = EnhancedChunker(config_path="config/config.yaml")
@@ -53,18 +71,28 @@ def chunk_documents(payload: ChunkingRequest, db: Session = Depends(get_db)):
         documents.append(doc_data)
     chunks = processor.process_multiple_documents(documents)
 
-    saved_chunks = []
+    # Chunking ulang file yang sama: chunk identik dipertahankan,
+    # hanya yang berubah ditambah / dihapus (tidak duplikat, tidak embed ulang)
+    by_filename = {}
     for chunk in chunks:
         if chunk is None:
             continue
         metadata = chunk.metadata or {}
-        filename = metadata.get("filename")
-        saved = master_repo.save_chunk(
-            content=chunk.page_content,
-            metadata=metadata,
-            filename=filename
+        by_filename.setdefault(metadata.get("filename"), []).append(
+            {"content": chunk.page_content, "metadata": metadata}
         )
-        saved_chunks.append(saved)
+
+    saved_chunks = []
+    for filename, items in by_filename.items():
+        if filename is None:
+            saved_chunks.extend(
+                master_repo.save_chunk(content=item["content"], metadata=item["metadata"])
+                for item in items
+            )
+            continue
+        result = master_repo.sync_chunks_for_filename(filename, items)
+        saved_chunks.extend(result["kept"] + result["added"])
+        print(f"♻️ {filename}: {len(result['kept'])} tetap, {len(result['added'])} baru, {len(result['removed'])} dihapus")
 
     return ChunkingResponse(
         total_chunks=len(saved_chunks),
@@ -112,7 +140,12 @@ def get_chunk(chunk_id: int, db: Session = Depends(get_db)):
 # UPDATE chunk
 # ------------------------------
 @router.put("/{chunk_id}", response_model=StandardResponse)
-def update_chunk(chunk_id: int, payload: ChunkUpdateRequest, db: Session = Depends(get_db)):
+def update_chunk(
+    chunk_id: int,
+    payload: ChunkUpdateRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     repo = MasterRepository(db)
     
     updated = repo.update_chunk(
@@ -123,6 +156,8 @@ def update_chunk(chunk_id: int, payload: ChunkUpdateRequest, db: Session = Depen
 
     if not updated:
         raise HTTPException(status_code=404, detail="Chunk not found")
+
+    background_tasks.add_task(sync_chunk_changes)
     
     chunk_response = ChunkResponse(
         content=updated.content,
@@ -139,12 +174,14 @@ def update_chunk(chunk_id: int, payload: ChunkUpdateRequest, db: Session = Depen
 # DELETE chunk
 # ------------------------------
 @router.delete("/{chunk_id}", response_model=StandardResponse)
-def delete_chunk(chunk_id: int, db: Session = Depends(get_db)):
+def delete_chunk(chunk_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     repo = MasterRepository(db)
     success = repo.delete_chunk(chunk_id)
     
     if not success:
         raise HTTPException(status_code=404, detail="Chunk not found")
+
+    background_tasks.add_task(sync_chunk_changes)
     
     return StandardResponse(
         status_code=200,
@@ -190,6 +227,7 @@ def get_chunks_by_filename(filename: str, db: Session = Depends(get_db)):
 def bulk_update_chunks_by_filename(
     filename: str,
     payload: ChunkBulkUpdateRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     repo = MasterRepository(db)
@@ -205,6 +243,8 @@ def bulk_update_chunks_by_filename(
             detail="No chunks updated (check filename or IDs)"
         )
 
+    background_tasks.add_task(sync_chunk_changes)
+
     return StandardResponse(
         status_code=200,
         message=f"{updated_count} chunks updated for filename {filename}",
@@ -1,14 +1,19 @@
 # app/routes/document_routes.py
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, BackgroundTasks, Query
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 import math
+import threading
 
+from core.config_loader import APP_CONFIG
 from utils.db import SessionLocal
+from utils.upload_stream import UploadTooLarge
 from services.document_service import DocumentService
+from services.document_job_queue import DocumentJobQueue
 from schemas.document_schema import (
     DocumentUploadResponse,
-    DocumentProcessResponse,
+    DocumentJobResponse,
+    DocumentJobQueueStatus,
     DocumentResponse,
     DocumentDetailResponse,
     DocumentListResponse,
@@ -31,9 +36,38 @@ def get_document_service(db: Session = Depends(get_db)) -> DocumentService:
     """Dependency untuk DocumentService"""
     return DocumentService(db)
 
+# ==============================
+# Job queue (lazy)
+# ==============================
+jobs_cfg = APP_CONFIG.get("document_processing", {}).get("jobs", {})
+_queue: Optional[DocumentJobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_document_job_queue() -> DocumentJobQueue:
+    """Singleton DocumentJobQueue dengan setting dari document_processing.jobs"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = DocumentJobQueue(
+                    concurrency=jobs_cfg.get("concurrency", 2),
+                    poll_interval=jobs_cfg.get("poll_interval", 2),
+                    lease_seconds=jobs_cfg.get("lease_seconds", 600),
+                    max_attempts=jobs_cfg.get("max_attempts", 3)
+                )
+    return _queue
+
+
+def shutdown_document_job_queue() -> None:
+    """Stop worker jika pernah dibuat"""
+    if _queue is not None:
+        _queue.stop(timeout=30)
+
 @router.post("/upload", response_model=DocumentUploadResponse)
 async def upload_document(
     file: UploadFile = File(...),
+    replace_document_id: Optional[int] = Query(None, description="Upload sebagai versi baru document ini"),
     background_tasks: BackgroundTasks = None,
     service: DocumentService = Depends(get_document_service)
 ):
@@ -41,53 +75,93 @@ async def upload_document(
     Upload PDF document
     
     - **file**: PDF file to upload
+    - **replace_document_id**: optional; hanya halaman yang berubah diproses ulang
     - Returns: document_id dan status
     """
     try:
-        result = await service.upload_document(file)
+        result = await service.upload_document(file, replace_document_id=replace_document_id)
+        
+        if result["duplicate"]:
+            message = "Document already uploaded (identical content), processing skipped"
+        elif result["updated"]:
+            message = "Document updated, only changed pages will be reprocessed"
+        else:
+            message = "Document uploaded successfully"
         
         return DocumentUploadResponse(
             success=True,
-            message="Document uploaded successfully",
+            message=message,
             document_id=result["document_id"],
             filename=result["original_filename"],
             status=result["status"]
         )
     
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
-@router.post("/{document_id}/process", response_model=DocumentProcessResponse)
-def process_document(
-    document_id: int,
-    service: DocumentService = Depends(get_document_service)
-):
+@router.post("/{document_id}/process", response_model=DocumentJobResponse, status_code=202)
+def process_document(document_id: int):
     """
-    Process uploaded document (extract content)
+    Queue uploaded document for processing (PDF → knowledge base)
     
     - **document_id**: ID of the document to process
-    - Returns: extraction results
+    - Returns: job; poll GET /api/documents/jobs/{job_id} for progress
     """
     try:
-        result = service.process_document(document_id)
-        
-        return DocumentProcessResponse(
-            success=result["success"],
-            message="Document processed successfully",
-            document_id=result["document_id"],
-            raw_text_preview=result.get("raw_text_preview"),
-            total_pages=result.get("total_pages"),
-            text_length=result.get("text_length"),
-            tables_count=result.get("tables_count"),
-            images_count=result.get("images_count")
-        )
-    
+        return get_document_job_queue().enqueue(document_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Enqueue failed: {str(e)}")
+
+@router.get("/jobs", response_model=List[DocumentJobResponse])
+def list_jobs(
+    status: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100)
+):
+    """
+    List processing jobs (newest first)
+    
+    - **status**: queued, running, completed, failed, cancelled
+    """
+    return get_document_job_queue().list_jobs(status=status, skip=(page - 1) * page_size, limit=page_size)
+
+@router.get("/jobs/status", response_model=DocumentJobQueueStatus)
+def job_queue_status():
+    """Worker aktif + jumlah job per status"""
+    return get_document_job_queue().get_status()
+
+@router.get("/jobs/{job_id}", response_model=DocumentJobResponse)
+def get_job(job_id: int):
+    """Status, tahap & progress satu job"""
+    job = get_document_job_queue().get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/jobs/{job_id}/cancel", response_model=DocumentJobResponse)
+def cancel_job(job_id: int):
+    """
+    Cancel job: queued langsung dibatalkan, running berhenti di
+    laporan progress berikutnya (dokumen kembali pending)
+    """
+    job = get_document_job_queue().cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/{document_id}/job", response_model=DocumentJobResponse)
+def get_document_job(document_id: int):
+    """Job terakhir untuk dokumen"""
+    job = get_document_job_queue().get_latest_job(document_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="No job for this document")
+    return job
 
 @router.get("/{document_id}", response_model=DocumentDetailResponse)
 def get_document(
@@ -1,17 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-import os, sys, yaml, torch
-from dotenv import load_dotenv
-from typing import List
+import threading
+from typing import List, Optional
 
 from utils.db import SessionLocal
 from models.chunk import ChunkModel
 from models.embedding import EmbeddingModel
+from services.embedding_service import EmbeddingService
+from services.embedding_worker import EmbeddingWorker
+from services.collection_migration import CollectionMigration, rollback_active_collection
 
-from langchain_chroma import Chroma
-from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings
-from langchain_huggingface import HuggingFaceEmbeddings
+from core.config_loader import APP_CONFIG
+from core.vectorstore_registry import get_active_state, get_vector_store, get_vectordb_type
 
 router = APIRouter(prefix="/api/embed", tags=["Embedding"])
 
@@ -25,81 +25,55 @@ def get_db():
     finally:
         db.close()
 
-# ==============================
-# Project root
-# ==============================
-ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-sys.path.insert(0, ROOT_DIR)
-
-load_dotenv()
+embedding_cfg = APP_CONFIG["embeddings"]
+_lock = threading.RLock()
 
 # ==============================
-# Load config.yaml
+# Embeddings + ChromaDB (shared registry, lazy)
 # ==============================
-config_path = os.path.join(ROOT_DIR, "config", "config.yaml")
-with open(config_path, "r", encoding="utf-8") as f:
-    config = yaml.safe_load(f)
+_service: Optional[EmbeddingService] = None
 
-def resolve_env_vars(d):
-    if isinstance(d, dict):
-        return {k: resolve_env_vars(v) for k, v in d.items()}
-    elif isinstance(d, list):
-        return [resolve_env_vars(v) for v in d]
-    elif isinstance(d, str) and d.startswith("${") and d.endswith("}"):
-        return os.getenv(d[2:-1], "")
-    return d
 
-config = resolve_env_vars(config)
+def get_embedding_service() -> EmbeddingService:
+    """EmbeddingService dengan embedding & collection aktif dari registry"""
+    global _service
+    if _service is None:
+        with _lock:
+            if _service is None:
+                # Tanpa instance tetap: ikut collection aktif (lihat registry)
+                _service = EmbeddingService()
+    return _service
 
 # ==============================
-# Embeddings
+# Background worker (lazy)
 # ==============================
-embedding_cfg = config["embeddings"]
+_worker: Optional[EmbeddingWorker] = None
 
-if embedding_cfg["model"] == "openai":
-    embeddings = OpenAIEmbeddings(
-        model=embedding_cfg["openai"]["model_name"],
-        openai_api_key=os.getenv("OPENAI_API_KEY")
-    )
 
-elif embedding_cfg["model"] == "huggingface":
-    device = embedding_cfg["huggingface"].get("device", "cpu")
-    if device == "cuda" and not torch.cuda.is_available():
-        device = "cpu"
+def get_embedding_worker() -> EmbeddingWorker:
+    """Singleton EmbeddingWorker dengan setting dari embeddings.worker"""
+    global _worker
+    if _worker is None:
+        with _lock:
+            if _worker is None:
+                worker_cfg = embedding_cfg.get("worker", {})
+                _worker = EmbeddingWorker(
+                    service=get_embedding_service(),
+                    batch_size=worker_cfg.get("batch_size", 64),
+                    max_in_flight=worker_cfg.get("max_in_flight", 2),
+                    checkpoint_path=worker_cfg.get(
+                        "checkpoint_path", "./data/embedding_worker_checkpoint.json"
+                    ),
+                    poll_interval=worker_cfg.get("poll_interval", 10),
+                    lease_seconds=worker_cfg.get("lease_seconds", 300)
+                )
+    return _worker
 
-    embeddings = HuggingFaceEmbeddings(
-        model_name=embedding_cfg["huggingface"]["model_name"],
-        model_kwargs={"device": device},
-        encode_kwargs={"normalize_embeddings": True}
-    )
 
-else:
-    raise RuntimeError("Embedding model tidak didukung")
-
-# ==============================
-# ChromaDB
-# ==============================
-chroma_cfg = config["vectordb"]["chroma"]
-collection_metadata = {"hnsw:space": chroma_cfg.get("distance_function", "cosine")}
-
-vectorstore = Chroma(
-    collection_name=chroma_cfg["collection_name"],
-    persist_directory=chroma_cfg["persist_directory"],
-    embedding_function=embeddings,
-    collection_metadata=collection_metadata
-)
-
-def sanitize_metadata(metadata: dict) -> dict:
-    """Sanitize metadata untuk ChromaDB (hanya str, int, float, bool)"""
-    safe = {}
-    for k, v in metadata.items():
-        if isinstance(v, (str, int, float, bool)) or v is None:
-            safe[k] = v
-        elif isinstance(v, list):
-            safe[k] = ", ".join(map(str, v))
-        else:
-            safe[k] = str(v)
-    return safe
+def shutdown_embedding_worker() -> None:
+    """Stop worker jika pernah dibuat (tanpa memicu load model)"""
+    if _worker is not None:
+        _worker.stop(timeout=30)
 
 # ==============================
 # API: Embed pending chunks
@@ -109,81 +83,136 @@ def embed_chunks(limit: int = 100, db: Session = Depends(get_db)):
     """
     Embed pending chunks:
     1. Generate embeddings batch (efisien)
-    2. Simpan vector ke PostgreSQL (audit/backup)
-    3. Simpan ke ChromaDB untuk similarity search
+    2. Upsert ke ChromaDB untuk similarity search
+    3. Simpan vector ke PostgreSQL (audit/backup)
+    Untuk volume besar gunakan background worker (/api/embed/worker/start)
     """
     
-    chunks = (
-        db.query(ChunkModel)
-        .filter(ChunkModel.status == "pending")
-        .limit(limit)
-        .all()
+    # Claim (FOR UPDATE SKIP LOCKED + lease) → embed → upsert ChromaDB
+    # → audit PostgreSQL + status (satu commit). Request paralel tidak
+    # pernah mendapat chunk yang sama.
+    total = get_embedding_service().embed_pending(
+        db,
+        limit=limit,
+        lease_seconds=embedding_cfg.get("worker", {}).get("lease_seconds", 300)
     )
 
-    if not chunks:
+    if not total:
         return {"message": "No pending chunks"}
 
-    # 1️⃣ Generate embeddings secara batch (lebih efisien)
-    contents = [chunk.content for chunk in chunks]
-    vectors = embeddings.embed_documents(contents)
-
-    # 2️⃣ Siapkan documents untuk ChromaDB
-    documents: List[Document] = []
-    chunk_ids: List[str] = []
-
-    for chunk, vector in zip(chunks, vectors):
-        # Simpan vector ke PostgreSQL (untuk audit/backup)
-        db.add(
-            EmbeddingModel(
-                chunk_id=chunk.id,
-                vector=vector
-            )
-        )
-
-        # Siapkan document untuk ChromaDB
-        safe_metadata = sanitize_metadata(chunk.metadata_json or {})
-        safe_metadata["chunk_id"] = chunk.id  # Track chunk_id di metadata
-        
-        documents.append(
-            Document(
-                page_content=chunk.content,
-                metadata=safe_metadata
-            )
-        )
-        
-        chunk_ids.append(str(chunk.id))
-
-        # Update status
-        chunk.status = "embedded"
-
-    # 3️⃣ Commit ke PostgreSQL
-    db.commit()
-
-    # 4️⃣ Add ke ChromaDB dengan explicit IDs
-    # ChromaDB akan re-embed, tapi kita track dengan chunk_id
-    vectorstore.add_documents(documents, ids=chunk_ids)
-
     return {
         "message": "Chunks embedded & added to Knowledge Base",
-        "total_chunks": len(chunks),
+        "total_chunks": total,
         "storage": {
             "postgresql": "vectors saved for audit",
             "chromadb": "vectors indexed for search"
         }
     }
 
+# ==============================
+# API: Background embedding worker
+# ==============================
+@router.post("/worker/start")
+def start_embedding_worker(once: bool = False):
+    """
+    Jalankan embedding worker di background thread
+    once=True: berhenti setelah semua chunk pending selesai
+    """
+    worker = get_embedding_worker()
+    started = worker.start(once=once)
+    return {
+        "message": "Embedding worker started" if started else "Embedding worker already running",
+        "status": worker.get_status()
+    }
+
+
+@router.post("/worker/stop")
+def stop_embedding_worker():
+    """Hentikan worker setelah batch yang sedang berjalan ditulis"""
+    worker = get_embedding_worker()
+    worker.stop(timeout=30)
+    return {"message": "Embedding worker stopped", "status": worker.get_status()}
+
+
+@router.get("/worker/status")
+def embedding_worker_status():
+    """Progress & throughput (chunks/s) embedding worker"""
+    return get_embedding_worker().get_status()
+
+# ==============================
+# API: Embedding model migration (shadow collection)
+# ==============================
+_migration: Optional[CollectionMigration] = None
+
+
+@router.post("/migration/start")
+def start_model_migration(model: str, rate_limit: Optional[float] = None):
+    """
+    Migrasi ke embedding model lain tanpa downtime
+    model: openai | huggingface | onnx (setting dari section embeddings.<model>)
+    Query tetap dilayani collection lama sampai flip.
+    """
+    global _migration
+
+    if model not in ("openai", "huggingface", "onnx") or model not in embedding_cfg:
+        raise HTTPException(status_code=400, detail=f"Embedding model tidak dikenali: {model}")
+
+    with _lock:
+        if _migration is not None and _migration.is_running():
+            raise HTTPException(status_code=409, detail="Migrasi sedang berjalan")
+
+        migration_cfg = embedding_cfg.get("migration", {})
+        target_cfg = {**embedding_cfg, "model": model}
+        _migration = CollectionMigration(
+            target_embedding_cfg=target_cfg,
+            batch_size=migration_cfg.get("batch_size", 32),
+            rate_limit=rate_limit if rate_limit is not None else migration_cfg.get("rate_limit", 20)
+        )
+        _migration.start()
+
+    return {"message": "Migration started", "status": _migration.get_status()}
+
+
+@router.get("/migration/status")
+def model_migration_status():
+    """Progress migrasi + collection aktif"""
+    return {
+        "active": get_active_state()["collection"],
+        "migration": _migration.get_status() if _migration is not None else None
+    }
+
+
+@router.post("/migration/cancel")
+def cancel_model_migration():
+    """Batalkan migrasi (collection aktif tidak berubah jika belum flip)"""
+    if _migration is None or not _migration.is_running():
+        raise HTTPException(status_code=404, detail="Tidak ada migrasi yang berjalan")
+    _migration.cancel(timeout=30)
+    return {"message": "Migration cancelled", "status": _migration.get_status()}
+
+
+@router.post("/migration/rollback")
+def rollback_model_migration():
+    """Kembalikan collection aktif ke collection sebelum flip terakhir"""
+    try:
+        state = rollback_active_collection()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Rolled back", "active": state["collection"]}
+
 # ==============================
 # API: Get vectorstore info
 # ==============================
 @router.get("/info")
 def get_vectorstore_info():
-    """Debug info untuk ChromaDB collection"""
-    collection = vectorstore._collection
+    """Debug info untuk vector store aktif (backend dari vectordb.type)"""
+    store = get_vector_store()
     return {
-        "name": collection.name,
-        "count": collection.count(),
-        "metadata": collection.metadata,
-        "distance_function": collection.metadata.get("hnsw:space", "unknown")
+        "name": store.name,
+        "backend": get_vectordb_type(),
+        "count": store.count(),
+        "metadata": store.metadata,
+        "distance_function": store.metadata.get("hnsw:space", "unknown")
     }
 
 # ==============================
@@ -213,7 +242,7 @@ def delete_embedding(chunk_id: int, db: Session = Depends(get_db)):
     
     # Hapus dari ChromaDB
     try:
-        vectorstore.delete(ids=[str(chunk_id)])
+        get_vector_store().delete(ids=[str(chunk_id)])
     except Exception as e:
         # ChromaDB mungkin tidak punya ID ini
         pass
@@ -230,7 +259,8 @@ def delete_embedding(chunk_id: int, db: Session = Depends(get_db)):
 def reembed_chunks(chunk_ids: List[int], db: Session = Depends(get_db)):
     """
     Re-embed chunks yang sudah pernah di-embed
-    Berguna kalau ganti embedding model
+    (untuk ganti embedding model gunakan /api/embed/migration/start)
+    (chunk yang text-nya tidak berubah diambil dari embedding cache)
     """
     chunks = db.query(ChunkModel).filter(
         ChunkModel.id.in_(chunk_ids)
@@ -245,11 +275,13 @@ def reembed_chunks(chunk_ids: List[int], db: Session = Depends(get_db)):
     ).delete(synchronize_session=False)
     
     # Hapus dari ChromaDB
-    vectorstore.delete(ids=[str(cid) for cid in chunk_ids])
+    get_vector_store().delete(ids=[str(cid) for cid in chunk_ids])
     
-    # Set status ke pending
+    # Set status ke pending (claim worker lain ikut dibatalkan)
     for chunk in chunks:
         chunk.status = "pending"
+        chunk.claimed_by = None
+        chunk.lease_expires_at = None
     
     db.commit()
     
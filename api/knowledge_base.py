@@ -0,0 +1,83 @@
+# api/knowledge_base.py
+"""
+Admin endpoint untuk versi knowledge base (blue/green)
+
+Alur re-ingestion tanpa mengganggu chatbot:
+    POST /api/kb/versions          → versi baru jadi staging (ingestion ke sini)
+    ... upload / chunking / embed seperti biasa ...
+    POST /api/kb/promote           → staging jadi aktif (atomik)
+    POST /api/kb/rollback          → kembali ke versi sebelumnya
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+
+from core.vectorstore_registry import get_active_state
+from services.kb_snapshot_service import KnowledgeBaseSnapshots
+
+router = APIRouter(prefix="/api/kb", tags=["Knowledge Base"])
+
+snapshots = KnowledgeBaseSnapshots()
+
+
+def _state_summary() -> dict:
+    state = get_active_state()
+    return {
+        "active": state["collection"],
+        "staging": state.get("staging"),
+        "previous": (state.get("previous") or {}).get("collection"),
+        "flipped_at": state.get("flipped_at"),
+    }
+
+
+@router.get("/versions")
+def list_versions():
+    return {**_state_summary(), "versions": snapshots.list_versions()}
+
+
+@router.post("/versions")
+def create_version(copy_from_active: bool = True):
+    """Buat versi baru (staging); copy_from_active=false untuk ingestion penuh"""
+    try:
+        result = snapshots.create_version(copy_from_active=copy_from_active)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"message": "Version created", **result, **_state_summary()}
+
+
+@router.post("/promote")
+def promote_version(version: Optional[str] = None):
+    """Jadikan staging (atau versi tertentu) aktif; chain menukar retriever"""
+    try:
+        snapshots.promote(version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Promoted", **_state_summary()}
+
+
+@router.post("/rollback")
+def rollback_version():
+    try:
+        snapshots.rollback()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Rolled back", **_state_summary()}
+
+
+@router.delete("/staging")
+def discard_staging():
+    try:
+        result = snapshots.discard_staging()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Staging discarded", **result, **_state_summary()}
+
+
+@router.delete("/versions/{version}")
+def delete_version(version: str):
+    try:
+        result = snapshots.delete_version(version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Version deleted", **result}
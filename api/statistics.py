@@ -8,18 +8,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func, case
 from typing import Dict, Any
-import os
-import sys
-import yaml
-from dotenv import load_dotenv
 from sqlalchemy import text
 from utils.db import SessionLocal
 from models.document import Document, DocumentStatus
 from models.chunk import ChunkModel
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
-from langchain_huggingface import HuggingFaceEmbeddings
-import torch
+from core.vectorstore_registry import get_vector_store
 
 router = APIRouter(prefix="/api/statistics", tags=["Statistics"])
 
@@ -33,54 +26,6 @@ def get_db():
     finally:
         db.close()
 
-# ==============================
-# Setup ChromaDB & Config
-# ==============================
-ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-sys.path.insert(0, ROOT_DIR)
-load_dotenv()
-
-config_path = os.path.join(ROOT_DIR, "config", "config.yaml")
-with open(config_path, "r", encoding="utf-8") as f:
-    config = yaml.safe_load(f)
-
-def resolve_env_vars(d):
-    if isinstance(d, dict):
-        return {k: resolve_env_vars(v) for k, v in d.items()}
-    elif isinstance(d, list):
-        return [resolve_env_vars(v) for v in d]
-    elif isinstance(d, str) and d.startswith("${") and d.endswith("}"):
-        return os.getenv(d[2:-1], "")
-    return d
-
-config = resolve_env_vars(config)
-
-# Setup embeddings
-embedding_cfg = config["embeddings"]
-if embedding_cfg["model"] == "openai":
-    embeddings = OpenAIEmbeddings(
-        model=embedding_cfg["openai"]["model_name"],
-        openai_api_key=os.getenv("OPENAI_API_KEY")
-    )
-elif embedding_cfg["model"] == "huggingface":
-    device = embedding_cfg["huggingface"].get("device", "cpu")
-    if device == "cuda" and not torch.cuda.is_available():
-        device = "cpu"
-    embeddings = HuggingFaceEmbeddings(
-        model_name=embedding_cfg["huggingface"]["model_name"],
-        model_kwargs={"device": device},
-        encode_kwargs={"normalize_embeddings": True}
-    )
-
-# Setup ChromaDB
-chroma_cfg = config["vectordb"]["chroma"]
-vectorstore = Chroma(
-    collection_name=chroma_cfg["collection_name"],
-    embedding_function=embeddings,
-    persist_directory=chroma_cfg["persist_directory"]
-)
-
-
 # ==============================
 # Helper Functions
 # ==============================
@@ -154,14 +99,14 @@ def get_chunk_stats(db: Session) -> Dict[str, Any]:
 
 
 def get_vectorstore_stats() -> Dict[str, Any]:
-    """Get ChromaDB vectorstore statistics"""
+    """Get vectorstore statistics (chroma / numpy)"""
     
     try:
-        collection = vectorstore._collection
-        total_vectors = collection.count()
+        store = get_vector_store()
+        total_vectors = store.count()
         
         # Get sample metadata to analyze
-        sample = collection.get(limit=1000, include=["metadatas"])
+        sample = store.get(limit=1000, include=["metadatas"])
         
         by_jenjang = {}
         by_kategori = {}
@@ -335,7 +280,7 @@ def health_check(db: Session = Depends(get_db)):
         db.execute(text("SELECT 1"))
 
         # Test vectorstore connection
-        vectorstore._collection.count()
+        get_vector_store().count()
 
         return {
             "status": "healthy",
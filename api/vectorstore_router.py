@@ -1,99 +1,140 @@
 # api/vectorstore_router.py
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-import sys
-import os
-import yaml
-from dotenv import load_dotenv
-from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
-from langchain_huggingface import HuggingFaceEmbeddings
-import torch
+import base64
+import json
+from typing import Any, Dict, Iterator, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from core.vectorstore_registry import get_vector_store
 
 router = APIRouter(prefix="/api/vectorstore", tags=["Vectorstore"])
 
-# ==============================
-# Setup project root
-# ==============================
-ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-sys.path.insert(0, ROOT_DIR)
+MAX_PAGE_SIZE = 1000
+FILTER_KEYS = ("jenjang", "kategori", "cabang", "tahun", "filename", "source")
 
-# ==============================
-# Load .env
-# ==============================
-load_dotenv()
 
 # ==============================
-# Load config.yaml
+# Helpers
 # ==============================
-config_path = os.path.join(ROOT_DIR, "config", "config.yaml")
-with open(config_path, "r", encoding="utf-8") as f:
-    config = yaml.safe_load(f)
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset}).encode()).decode()
 
-# ==============================
-# Helper: resolve env vars
-# ==============================
-def resolve_env_vars(d):
-    if isinstance(d, dict):
-        return {k: resolve_env_vars(v) for k, v in d.items()}
-    elif isinstance(d, list):
-        return [resolve_env_vars(v) for v in d]
-    elif isinstance(d, str) and d.startswith("${") and d.endswith("}"):
-        return os.getenv(d[2:-1], "")
-    else:
-        return d
-
-config = resolve_env_vars(config)
 
-# ==============================
-# Setup embeddings
-# ==============================
-embedding_cfg = config["embeddings"]
-if embedding_cfg["model"] == "openai":
-    model_name = embedding_cfg["openai"]["model_name"]
-    embeddings = OpenAIEmbeddings(
-        model=model_name,
-        openai_api_key=os.getenv("OPENAI_API_KEY")
-    )
-elif embedding_cfg["model"] == "huggingface":
-    model_name = embedding_cfg["huggingface"]["model_name"]
-    device = embedding_cfg["huggingface"].get("device", "cpu")
-    if device == "cuda" and not torch.cuda.is_available():
-        device = "cpu"  # fallback jika CUDA tidak tersedia
-    embeddings = HuggingFaceEmbeddings(
-        model_name=model_name,
-        model_kwargs={"device": device},
-        encode_kwargs={"normalize_embeddings": True}
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))["offset"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor tidak valid")
+
+
+def build_where(filters: Dict[str, Optional[str]], where: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Gabungkan filter metadata sederhana (?jenjang=SMP) dan
+    filter Chroma mentah (?where={"tahun": {"$gte": "2024"}})
+    """
+    clauses = [{key: value} for key, value in filters.items() if value is not None]
+
+    if where:
+        try:
+            clauses.append(json.loads(where))
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Parameter where harus JSON")
+
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+def read_page(where: Optional[Dict[str, Any]], limit: int, offset: int) -> list:
+    docs = get_vector_store().get(
+        where=where,
+        limit=limit,
+        offset=offset,
+        include=["documents", "metadatas"]
     )
-else:
-    raise NotImplementedError(f"Model embeddings {embedding_cfg['model']} belum didukung.")
+    return [
+        {"id": doc_id, "content": content, "metadata": metadata}
+        for doc_id, content, metadata in zip(docs["ids"], docs["documents"], docs["metadatas"])
+    ]
 
-# ==============================
-# Setup ChromaDB
-# ==============================
-chroma_cfg = config["vectordb"]["chroma"]
-collection_metadata = {"hnsw:space": chroma_cfg.get("distance_function", "cosine")}
-vectorstore = Chroma(
-    collection_name=chroma_cfg["collection_name"],
-    embedding_function=embeddings,
-    persist_directory=chroma_cfg["persist_directory"],
-    collection_metadata=collection_metadata
-)
 
 # ==============================
-# Endpoint: Get all documents
+# Endpoint: Get documents (paginated)
 # ==============================
-@router.get("/", summary="Get all documents from vectorstore")
-def get_documents():
+@router.get("/", summary="Get documents from vectorstore (paginated)")
+def get_documents(
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor dari response sebelumnya"),
+    jenjang: Optional[str] = None,
+    kategori: Optional[str] = None,
+    cabang: Optional[str] = None,
+    tahun: Optional[str] = None,
+    filename: Optional[str] = None,
+    source: Optional[str] = None,
+    where: Optional[str] = Query(None, description="Filter Chroma mentah (JSON)")
+):
+    if cursor:
+        offset = decode_cursor(cursor)
+
+    filters = dict(zip(FILTER_KEYS, (jenjang, kategori, cabang, tahun, filename, source)))
+    where_clause = build_where(filters, where)
+
     try:
-        docs = vectorstore._collection.get(include=["documents", "metadatas"])
-        results = []
-        for idx, (content, metadata) in enumerate(zip(docs["documents"], docs["metadatas"])):
-            results.append({
-                "content": content,
-                "metadata": metadata,
-            })
-        return {"status_code": 200, "message": f"{len(results)} documents retrieved", "data": results}
+        results = read_page(where_clause, limit, offset)
+        # Total hanya tanpa filter (count() murah; filter butuh full scan)
+        total = get_vector_store().count() if where_clause is None else None
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    has_more = len(results) == limit and (total is None or offset + limit < total)
+
+    return {
+        "status_code": 200,
+        "message": f"{len(results)} documents retrieved",
+        "data": results,
+        "pagination": {
+            "limit": limit,
+            "offset": offset,
+            "total": total,
+            "next_cursor": encode_cursor(offset + limit) if has_more else None
+        }
+    }
+
+
+# ==============================
+# Endpoint: Stream all documents (NDJSON)
+# ==============================
+@router.get("/stream", summary="Stream documents from vectorstore as NDJSON")
+def stream_documents(
+    page_size: int = Query(500, ge=1, le=MAX_PAGE_SIZE),
+    jenjang: Optional[str] = None,
+    kategori: Optional[str] = None,
+    cabang: Optional[str] = None,
+    tahun: Optional[str] = None,
+    filename: Optional[str] = None,
+    source: Optional[str] = None,
+    where: Optional[str] = Query(None, description="Filter Chroma mentah (JSON)")
+):
+    """
+    Satu dokumen per baris (application/x-ndjson); collection dibaca
+    per halaman sehingga memory worker tetap konstan
+    """
+    filters = dict(zip(FILTER_KEYS, (jenjang, kategori, cabang, tahun, filename, source)))
+    where_clause = build_where(filters, where)
+
+    def generate() -> Iterator[str]:
+        offset = 0
+        while True:
+            page = read_page(where_clause, page_size, offset)
+            for item in page:
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+            if len(page) < page_size:
+                break
+            offset += page_size
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
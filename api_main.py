@@ -1,15 +1,72 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from api.chunking import router as chunking_router
 from api.vectorstore_router import router as vectorstore_router
-from api.embeding import router as embedding_router  # ⬅️ TAMBAH INI
+from api.embeding import (  # ⬅️ TAMBAH INI
+    router as embedding_router,
+    embedding_cfg,
+    get_embedding_worker,
+    shutdown_embedding_worker
+)
 from api.chat import router as chat_router  # ⬅️ TAMBAH INI
 # from api.chat_enhanced import router as chat_router  # ⬅️ TAMBAH INI
-from api.document_router import router as document_router
+from api.document_router import (
+    router as document_router,
+    jobs_cfg as document_jobs_cfg,
+    get_document_job_queue,
+    shutdown_document_job_queue
+)
 from api.statistics import router as statistics_router
+from api.knowledge_base import router as knowledge_base_router
+from core.conversation_memory import shutdown_conversation_memory
+from services.pdf_to_knowledge import shutdown_extraction_pool
+from core.warmup import (
+    get_warmup_config,
+    get_warmup_status,
+    is_ready,
+    mark_ready,
+    start_warm_up,
+    warm_up
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: RAG stack di-load sebelum chat pertama (performance.warmup)
+    warmup_cfg = get_warmup_config()
+    if not warmup_cfg.get("enabled", True):
+        mark_ready()
+    elif warmup_cfg.get("blocking", False):
+        await asyncio.to_thread(warm_up)
+    else:
+        start_warm_up()
+
+    # Opsional: embed chunk pending di background (embeddings.worker.autostart)
+    if embedding_cfg.get("worker", {}).get("autostart", False):
+        get_embedding_worker().start()
+
+    # Worker antrian proses dokumen (document_processing.jobs.autostart)
+    if document_jobs_cfg.get("autostart", True):
+        get_document_job_queue().start()
+
+    yield
+
+    # Shutdown
+    shutdown_document_job_queue()
+    shutdown_embedding_worker()
+    # Flush write-behind buffer supaya history tidak hilang saat worker berhenti
+    shutdown_conversation_memory()
+    shutdown_extraction_pool()
+
+
 app = FastAPI(
     title="Chatbot API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Mengizinkan semua origin
@@ -26,4 +83,23 @@ app.include_router(vectorstore_router)
 app.include_router(embedding_router)      
 app.include_router(chat_router)  
 app.include_router(document_router)
-app.include_router(statistics_router)
\ No newline at end of file
+app.include_router(statistics_router)
+app.include_router(knowledge_base_router)
+
+
+@app.get("/health", tags=["Health"])
+def health():
+    """Liveness: proses hidup (tidak menunggu warm-up)"""
+    return {"status": "ok"}
+
+
+@app.get("/ready", tags=["Health"])
+def ready():
+    """Readiness: 503 sampai RAG stack warm (load balancer menunggu ini)"""
+    status = get_warmup_status()
+    if is_ready():
+        return status
+    if status["status"] == "failed":
+        # Coba lagi di background pada probe berikutnya
+        start_warm_up()
+    return JSONResponse(status_code=503, content=status)
@@ -7,12 +7,28 @@ from sqlalchemy import create_engine, Column, Integer, String, Text, JSON, TIMES
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, List, Dict, Any
 import json
+import os
+import sys
+
+# Codec vector dipakai bersama aplikasi RAG (tabel document_embeddings yang sama)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.vector_codec import vector_column_type
 
 Base = declarative_base()
 
 
+# Harus sama dengan `database.vector_storage` aplikasi RAG (tabel yang sama)
+# json (legacy), bytea, atau pgvector; migrasi data lama: run_vector_migration.py
+# pgvector tanpa package terinstall → fallback ke float32 bytea
+VECTOR_STORAGE = os.getenv("VECTOR_STORAGE", "json")
+
+
 # ==================== DATABASE MODELS ====================
 
 class DocumentChunk(Base):
@@ -43,7 +59,7 @@ class DocumentEmbedding(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     chunk_id = Column(Integer, ForeignKey('document_chunks.id'), nullable=False)
-    vector = Column(JSON)  # Storing as JSON for simplicity
+    vector = Column(vector_column_type(VECTOR_STORAGE))
     created_at = Column(TIMESTAMP, default=datetime.now)
     
     # Relationship
@@ -3,7 +3,7 @@ File Storage Handler
 Handle actual file uploads dengan storage ke local filesystem atau cloud
 """
 
-import os
+import sys
 import uuid
 from pathlib import Path
 from typing import Optional, Tuple
@@ -11,6 +11,15 @@ from datetime import datetime
 from config import settings
 import shutil
 
+from fastapi import UploadFile
+
+# Streaming upload dipakai bersama aplikasi RAG (utils/upload_stream.py)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.upload_stream import UploadTooLarge, stream_upload
+
 
 class FileStorageHandler:
     """Handle file upload and storage"""
@@ -68,13 +77,7 @@ class FileStorageHandler:
         session_dir.mkdir(parents=True, exist_ok=True)
         
         # Generate unique filename
-        file_ext = Path(original_filename).suffix.lower()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
-        new_filename = f"{document_type}_{timestamp}_{unique_id}{file_ext}"
-        
-        # Full file path
-        file_path = session_dir / new_filename
+        file_path = session_dir / self._new_filename(original_filename, document_type)
         
         # Save file
         with open(file_path, 'wb') as f:
@@ -83,6 +86,43 @@ class FileStorageHandler:
         # Return relative path (for database storage)
         return str(file_path.relative_to(self.upload_dir))
     
+    async def save_upload(
+        self,
+        file: UploadFile,
+        session_id: str,
+        document_type: str
+    ) -> Tuple[str, int, str]:
+        """
+        Stream upload ke storage tanpa membaca seluruh file ke memory
+        (utils.upload_stream: ukuran dicek & sha256 dihitung selagi byte
+        masuk, lalu file sementara di-rename atomik ke nama akhir)
+        
+        Returns:
+            (file_path relatif, file_size, sha256)
+        
+        Raises:
+            ValueError: format tidak didukung / file terlalu besar
+        """
+        is_valid, error_msg = self.validate_file(file.filename, 0)
+        if not is_valid:
+            raise ValueError(error_msg)
+        
+        session_dir = self.upload_dir / session_id
+        try:
+            upload = await stream_upload(file, session_dir, max_bytes=self.max_file_size)
+        except UploadTooLarge:
+            max_mb = self.max_file_size / (1024 * 1024)
+            raise ValueError(f"File terlalu besar. Maksimal {max_mb}MB")
+        
+        file_path = upload.commit(session_dir / self._new_filename(file.filename, document_type))
+        return str(file_path.relative_to(self.upload_dir)), upload.size, upload.sha256
+    
+    def _new_filename(self, original_filename: str, document_type: str) -> str:
+        file_ext = Path(original_filename).suffix.lower()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        unique_id = str(uuid.uuid4())[:8]
+        return f"{document_type}_{timestamp}_{unique_id}{file_ext}"
+    
     def get_file_path(self, relative_path: str) -> Path:
         """Get absolute file path from relative path"""
         return self.upload_dir / relative_path
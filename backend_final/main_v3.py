@@ -269,25 +269,18 @@ async def upload_document(
     if not state:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Read file content
-    file_content = await file.read()
-    
     # Get file storage handler
     storage = get_file_storage()
     
-    # Validate file
-    is_valid, error_msg = storage.validate_file(file.filename, len(file_content))
-    if not is_valid:
-        raise HTTPException(status_code=400, detail=error_msg)
-    
-    # Save file
+    # Stream file ke disk (validasi format + ukuran selagi dibaca)
     try:
-        file_path = storage.save_file(
-            file_content=file_content,
-            original_filename=file.filename,
+        file_path, file_size, file_sha256 = await storage.save_upload(
+            file=file,
             session_id=session_id,
             document_type=field_name
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
     
@@ -299,7 +292,9 @@ async def upload_document(
         "success": True,
         "message": f"Document uploaded successfully",
         "field_name": field_name,
-        "file_path": file_path
+        "file_path": file_path,
+        "file_size": file_size,
+        "sha256": file_sha256
     }
 
 
@@ -5,10 +5,18 @@ Conversation Memory System
 Maintains chat history and context for multi-turn conversations
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
+import atexit
+import heapq
 import threading
+import time
+
+from core.conversation_store import (
+    ConversationStore,
+    InMemoryConversationStore,
+    build_conversation_store
+)
 
 class ConversationMessage:
     """Represents a single message in conversation"""
@@ -36,24 +44,79 @@ class ConversationMessage:
 
 class ConversationMemory:
     """
-    In-memory conversation storage with automatic cleanup
+    Conversation storage with local read-through cache and write-behind batching
     Stores conversation history per session_id
+
+    - Writes are buffered and flushed to the store in batches
+    - Reads are served from the local cache, refreshed from the store
+      after `cache_ttl_seconds` so other workers' messages become visible
+    - Sessions expire lazily on access plus via a min-heap of deadlines,
+      so cleanup only touches expired sessions (no full sweep)
+    - Locks are striped by session_id so concurrent chats don't serialize
+    - In summary mode, messages folded into the rolling summary are hidden
+      from get_history and the summary is cached per session
     """
     
-    def __init__(self, max_history: int = 10, ttl_minutes: int = 60):
+    def __init__(
+        self,
+        max_history: int = 10,
+        ttl_minutes: int = 60,
+        store: Optional[ConversationStore] = None,
+        flush_interval: float = 1.0,
+        batch_size: int = 50,
+        cache_ttl_seconds: float = 10.0,
+        lock_stripes: int = 64,
+        purge_interval: float = 300.0,
+        summary_mode: bool = False
+    ):
         """
         Args:
-            max_history: Maximum number of messages to keep per session
+            max_history: Maximum number of messages to keep per session (window mode only)
             ttl_minutes: Time-to-live for sessions in minutes
+            store: Persistent backend (default: process-local memory)
+            flush_interval: Seconds between write-behind flushes
+            batch_size: Pending writes that trigger an early flush
+            cache_ttl_seconds: Seconds before a cached session is re-read from the store
+            lock_stripes: Number of locks session_ids are hashed onto
+            purge_interval: Seconds between expired-session purges in the store
+            summary_mode: Load rolling summaries and hide messages they cover
         """
-        self.conversations: Dict[str, List[ConversationMessage]] = defaultdict(list)
+        self.conversations: Dict[str, List[ConversationMessage]] = {}
+        self.summaries: Dict[str, Dict] = {}
+        self.summary_mode = summary_mode
         self.last_activity: Dict[str, datetime] = {}
         self.max_history = max_history
         self.ttl = timedelta(minutes=ttl_minutes)
-        self.lock = threading.Lock()
         
-        # Start cleanup thread
-        self._start_cleanup_thread()
+        # Lock striping: session -> stripes[hash(session_id) % n]
+        self._stripes = [threading.Lock() for _ in range(max(1, lock_stripes))]
+        
+        # Expiry: deadline per session + min-heap of (deadline, session_id)
+        # Heap entries are never updated in place; stale ones are skipped on pop
+        self._deadlines: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._heap_lock = threading.Lock()
+        self.purge_interval = purge_interval
+        self._last_purge = time.monotonic()
+        
+        # Persistent backend + write-behind buffer
+        self.store = store or InMemoryConversationStore()
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._cache_loaded_at: Dict[str, float] = {}
+        self._pending: List[Dict] = []
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._closed = False
+        
+        # Start background flusher (also drains due expiries)
+        self._start_flush_thread()
+    
+    def _session_lock(self, session_id: str) -> threading.Lock:
+        """Lock stripe for a session"""
+        return self._stripes[hash(session_id) % len(self._stripes)]
     
     def add_message(self, session_id: str, role: str, content: str) -> None:
         """
@@ -64,14 +127,33 @@ class ConversationMemory:
             role: 'user' or 'assistant'
             content: Message content
         """
-        with self.lock:
+        self._expire_due()
+        
+        with self._session_lock(session_id):
+            self._ensure_cached(session_id)
+            
             message = ConversationMessage(role, content)
-            self.conversations[session_id].append(message)
-            self.last_activity[session_id] = datetime.now()
+            history = self.conversations.setdefault(session_id, [])
+            history.append(message)
+            self._touch(session_id, message.timestamp)
+            self._cache_loaded_at.setdefault(session_id, time.monotonic())
+            
+            # Window mode: trim history if exceeds max_history
+            # (summary mode keeps every unsummarized message; the
+            # summarizer's fold threshold bounds the raw tail instead)
+            if not self.summary_mode and len(history) > self.max_history:
+                self.conversations[session_id] = history[-self.max_history:]
             
-            # Trim history if exceeds max_history
-            if len(self.conversations[session_id]) > self.max_history:
-                self.conversations[session_id] = self.conversations[session_id][-self.max_history:]
+            # Queue for write-behind flush
+            with self._pending_lock:
+                self._pending.append({
+                    'session_id': session_id,
+                    'role': message.role,
+                    'content': message.content,
+                    'timestamp': message.timestamp
+                })
+                if len(self._pending) >= self.batch_size:
+                    self._flush_event.set()
     
     def get_history(self, session_id: str, limit: Optional[int] = None) -> List[ConversationMessage]:
         """
@@ -84,12 +166,152 @@ class ConversationMemory:
         Returns:
             List of ConversationMessage objects
         """
-        with self.lock:
-            messages = self.conversations.get(session_id, [])
+        with self._session_lock(session_id):
+            self._ensure_cached(session_id)
+            messages = list(self.conversations.get(session_id, []))
             if limit:
                 messages = messages[-limit:]
             return messages
     
+    def _touch(self, session_id: str, activity: datetime) -> None:
+        """
+        Record activity and push a new expiry deadline onto the heap
+        Caller must hold the session's lock stripe
+        """
+        idle = max(0.0, (datetime.now() - activity).total_seconds())
+        deadline = time.monotonic() + self.ttl.total_seconds() - idle
+        self.last_activity[session_id] = activity
+        self._deadlines[session_id] = deadline
+        with self._heap_lock:
+            heapq.heappush(self._expiry_heap, (deadline, session_id))
+    
+    def _evict(self, session_id: str) -> None:
+        """Drop a session from the local cache (store is left untouched)"""
+        self.conversations.pop(session_id, None)
+        self.summaries.pop(session_id, None)
+        self.last_activity.pop(session_id, None)
+        self._cache_loaded_at.pop(session_id, None)
+        self._deadlines.pop(session_id, None)
+    
+    def _ensure_cached(self, session_id: str) -> None:
+        """
+        Read-through: load session from store if missing, stale or expired
+        Caller must hold the session's lock stripe
+        """
+        now = time.monotonic()
+        
+        # Lazy expiry on access
+        deadline = self._deadlines.get(session_id)
+        if deadline is not None and deadline <= now:
+            self._evict(session_id)
+        
+        loaded_at = self._cache_loaded_at.get(session_id)
+        if loaded_at is not None and now - loaded_at < self.cache_ttl_seconds:
+            return
+        
+        # Flush buffered writes first so the reload includes them
+        self.flush()
+        
+        summary = None
+        if self.summary_mode:
+            # Every message not yet folded into the summary (not just max_history)
+            summary = self.store.load_summary(session_id)
+            after = summary['covered_until'] if summary else None
+            records = self.store.load(session_id, after=after)
+        else:
+            records = self.store.load(session_id, self.max_history)
+        
+        last_activity = records[-1]['timestamp'] if records else (summary['covered_until'] if summary else None)
+        if last_activity is not None and datetime.now() - last_activity > self.ttl:
+            # Expired for every worker (latest message anywhere is too old)
+            self.store.delete(session_id)
+            records, summary, last_activity = [], None, None
+        
+        if last_activity is None:
+            # Unknown session: don't cache, so empty lookups never pile up
+            self._evict(session_id)
+            return
+        
+        if summary:
+            self.summaries[session_id] = summary
+        else:
+            self.summaries.pop(session_id, None)
+        
+        self.conversations[session_id] = [
+            ConversationMessage(r['role'], r['content'], r['timestamp'])
+            for r in records
+        ]
+        self._cache_loaded_at[session_id] = now
+        if session_id not in self._deadlines:
+            self._touch(session_id, last_activity)
+    
+    def get_summary(self, session_id: str) -> Optional[str]:
+        """
+        Get cached rolling summary for a session (summary mode only)
+        
+        Returns:
+            Summary text, or None if nothing has been folded yet
+        """
+        with self._session_lock(session_id):
+            self._ensure_cached(session_id)
+            summary = self.summaries.get(session_id)
+            return summary['summary'] if summary else None
+    
+    def set_summary(self, session_id: str, summary: str, covered_until: datetime) -> None:
+        """
+        Replace the rolling summary and drop the messages it now covers
+        
+        Args:
+            session_id: Unique session identifier
+            summary: New incremental summary (previous summary + folded turns)
+            covered_until: Timestamp of the last message folded into the summary
+        """
+        with self._session_lock(session_id):
+            # Folded messages must be in the store before the watermark moves
+            self.flush()
+            self.store.save_summary(session_id, summary, covered_until)
+            
+            self.summaries[session_id] = {'summary': summary, 'covered_until': covered_until}
+            if session_id in self.conversations:
+                self.conversations[session_id] = [
+                    m for m in self.conversations[session_id] if m.timestamp > covered_until
+                ]
+    
+    def flush(self) -> int:
+        """
+        Write buffered messages to the store in one batch
+        
+        Returns:
+            Number of messages written
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+                self._flush_event.clear()
+            
+            if not batch:
+                return 0
+            
+            try:
+                self.store.append_many(batch)
+            except Exception as e:
+                # Put the batch back in front so ordering is preserved
+                with self._pending_lock:
+                    self._pending = batch + self._pending
+                print(f"[ConversationMemory] Flush failed ({len(batch)} messages): {e}")
+                return 0
+            
+            return len(batch)
+    
+    def close(self) -> None:
+        """Flush pending writes and release the store (call on shutdown)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._flush_event.set()
+        self.flush()
+        self.store.close()
+    
     def get_formatted_history(self, session_id: str, limit: Optional[int] = None) -> str:
         """
         Get conversation history formatted as string for LLM context
@@ -115,70 +337,129 @@ class ConversationMemory:
     
     def clear_session(self, session_id: str) -> None:
         """Clear conversation history for a specific session"""
-        with self.lock:
-            if session_id in self.conversations:
-                del self.conversations[session_id]
-            if session_id in self.last_activity:
-                del self.last_activity[session_id]
+        with self._session_lock(session_id):
+            self._evict(session_id)
+            with self._pending_lock:
+                self._pending = [r for r in self._pending if r['session_id'] != session_id]
+            self.store.delete(session_id)
     
     def clear_all(self) -> None:
         """Clear all conversation histories"""
-        with self.lock:
+        for stripe in self._stripes:
+            stripe.acquire()
+        try:
             self.conversations.clear()
             self.last_activity.clear()
+            self._cache_loaded_at.clear()
+            self._deadlines.clear()
+            with self._heap_lock:
+                self._expiry_heap.clear()
+            with self._pending_lock:
+                self._pending = []
+            self.store.delete_all()
+        finally:
+            for stripe in reversed(self._stripes):
+                stripe.release()
     
-    def _cleanup_expired_sessions(self) -> None:
-        """Remove sessions that have exceeded TTL"""
-        with self.lock:
-            now = datetime.now()
-            expired_sessions = [
-                session_id for session_id, last_time in self.last_activity.items()
-                if now - last_time > self.ttl
-            ]
-            
-            for session_id in expired_sessions:
-                del self.conversations[session_id]
-                del self.last_activity[session_id]
-            
-            if expired_sessions:
-                print(f"[ConversationMemory] Cleaned up {len(expired_sessions)} expired sessions")
-    
-    def _start_cleanup_thread(self) -> None:
-        """Start background thread for periodic cleanup"""
-        def cleanup_loop():
-            import time
-            while True:
-                time.sleep(300)  # Run every 5 minutes
-                self._cleanup_expired_sessions()
-        
-        thread = threading.Thread(target=cleanup_loop, daemon=True)
+    def _expire_due(self) -> int:
+        """
+        Pop due deadlines from the heap and evict those sessions
+        O(expired * log n); stale heap entries (session touched again) are skipped
+        
+        Returns:
+            Number of sessions evicted
+        """
+        now = time.monotonic()
+        due = []
+        with self._heap_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                due.append(heapq.heappop(self._expiry_heap))
+        
+        evicted = 0
+        for deadline, session_id in due:
+            with self._session_lock(session_id):
+                current = self._deadlines.get(session_id)
+                if current is not None and current <= now:
+                    self._evict(session_id)
+                    evicted += 1
+        
+        if evicted:
+            print(f"[ConversationMemory] Cleaned up {evicted} expired sessions")
+        return evicted
+    
+    def _purge_store(self) -> None:
+        """Delete expired sessions from the persistent store (no memory locks held)"""
+        try:
+            self.store.purge_expired(datetime.now() - self.ttl)
+        except Exception as e:
+            print(f"[ConversationMemory] Store purge failed: {e}")
+    
+    def _start_flush_thread(self) -> None:
+        """Start background thread for write-behind flushing"""
+        def flush_loop():
+            while not self._closed:
+                self._flush_event.wait(self.flush_interval)
+                self.flush()
+                self._expire_due()
+                
+                if time.monotonic() - self._last_purge >= self.purge_interval:
+                    self._last_purge = time.monotonic()
+                    self._purge_store()
+        
+        thread = threading.Thread(target=flush_loop, daemon=True)
         thread.start()
     
     def get_stats(self) -> dict:
         """Get memory statistics"""
-        with self.lock:
-            return {
-                'total_sessions': len(self.conversations),
-                'total_messages': sum(len(msgs) for msgs in self.conversations.values()),
-                'max_history_per_session': self.max_history,
-                'ttl_minutes': self.ttl.total_seconds() / 60
-            }
+        conversations = list(self.conversations.values())
+        return {
+            'total_sessions': len(conversations),
+            'total_messages': sum(len(msgs) for msgs in conversations),
+            'max_history_per_session': self.max_history,
+            'ttl_minutes': self.ttl.total_seconds() / 60,
+            'backend': type(self.store).__name__,
+            'pending_writes': len(self._pending),
+            'scheduled_expiries': len(self._expiry_heap)
+        }
 
 
 # Global singleton instance
 _conversation_memory = None
 
+_memory_init_lock = threading.Lock()
+
 def get_conversation_memory() -> ConversationMemory:
     """Get or create global conversation memory instance"""
     global _conversation_memory
     if _conversation_memory is None:
-        _conversation_memory = ConversationMemory(
-            max_history=10,  # Keep last 10 messages
-            ttl_minutes=60   # 1 hour session timeout
-        )
+        with _memory_init_lock:
+            if _conversation_memory is None:
+                from core.config_loader import APP_CONFIG
+                
+                cfg = APP_CONFIG.get("conversation", {})
+                write_behind = cfg.get("write_behind", {})
+                
+                _conversation_memory = ConversationMemory(
+                    max_history=cfg.get("max_history", 10),  # Keep last 10 messages
+                    ttl_minutes=cfg.get("ttl_minutes", 60),  # 1 hour session timeout
+                    store=build_conversation_store(cfg.get("backend", "memory"), cfg),
+                    flush_interval=write_behind.get("flush_interval", 1.0),
+                    batch_size=write_behind.get("batch_size", 50),
+                    cache_ttl_seconds=cfg.get("cache_ttl_seconds", 10.0),
+                    lock_stripes=cfg.get("lock_stripes", 64),
+                    purge_interval=cfg.get("purge_interval", 300.0),
+                    summary_mode=cfg.get("memory_mode", "window") == "summary"
+                )
+                atexit.register(_conversation_memory.close)
     return _conversation_memory
 
 
+def shutdown_conversation_memory() -> None:
+    """Flush buffered messages to the store (FastAPI shutdown hook)"""
+    if _conversation_memory is not None:
+        _conversation_memory.close()
+
+
 # Utility functions for easy access
 
 def add_user_message(session_id: str, content: str) -> None:
@@ -200,18 +481,30 @@ def get_conversation_context(session_id: str, max_turns: int = 5) -> str:
     Args:
         session_id: Session identifier
         max_turns: Maximum number of conversation turns to include
+            (window mode only; summary mode includes every message not yet
+            folded into the summary, bounded by the summarizer's threshold)
     
     Returns:
         Formatted context string
     """
     memory = get_conversation_memory()
-    # Get last N*2 messages (N user + N assistant)
-    history = memory.get_formatted_history(session_id, limit=max_turns * 2)
+    # Window: last N*2 messages (N user + N assistant)
+    limit = None if memory.summary_mode else max_turns * 2
+    history = memory.get_formatted_history(session_id, limit=limit)
+    summary = memory.get_summary(session_id) if memory.summary_mode else None
     
-    if history == "No previous conversation.":
+    if history == "No previous conversation." and not summary:
         return ""
     
-    return f"""
+    summary_block = ""
+    if summary:
+        summary_block = f"""
+=== CONVERSATION SUMMARY (earlier turns) ===
+{summary}
+=== END SUMMARY ===
+"""
+    
+    return f"""{summary_block}
 === CONVERSATION HISTORY ===
 {history}
 === END HISTORY ===
@@ -0,0 +1,452 @@
+# core/conversation_store.py
+
+"""
+Conversation Storage Backends
+Persistent storage untuk ConversationMemory agar history bisa dibagi
+antar uvicorn worker (tanpa sticky session)
+
+Backends:
+- memory   : process-local (default, perilaku lama)
+- sqlite   : file lokal, cocok untuk beberapa worker di satu host
+- postgres : shared database, cocok untuk scaling horizontal
+"""
+
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class ConversationStore(ABC):
+    """
+    Interface storage untuk conversation history
+
+    Setiap record adalah dict dengan keys:
+    session_id, role, content, timestamp (datetime)
+
+    Summary (rolling summary mode) disimpan per session sebagai dict:
+    summary (str), covered_until (datetime message terakhir yang sudah diringkas)
+    """
+
+    @abstractmethod
+    def append_many(self, records: List[Dict]) -> None:
+        """Simpan batch message (dipanggil oleh write-behind flusher)"""
+
+    @abstractmethod
+    def load(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        after: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Ambil message session, urut dari yang terlama
+
+        Args:
+            limit: Hanya `limit` message terakhir (None = semua)
+            after: Hanya message dengan timestamp > after (mis. covered_until summary)
+        """
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Hapus semua message untuk session"""
+
+    @abstractmethod
+    def delete_all(self) -> None:
+        """Hapus semua message"""
+
+    @abstractmethod
+    def purge_expired(self, cutoff: datetime) -> int:
+        """Hapus session yang message terakhirnya lebih lama dari cutoff"""
+
+    @abstractmethod
+    def load_summary(self, session_id: str) -> Optional[Dict]:
+        """Ambil rolling summary session (None jika belum ada)"""
+
+    @abstractmethod
+    def save_summary(self, session_id: str, summary: str, covered_until: datetime) -> None:
+        """Simpan/replace rolling summary session"""
+
+    def close(self) -> None:
+        """Release resources (connection, file handle)"""
+
+
+class InMemoryConversationStore(ConversationStore):
+    """Process-local storage (tidak dibagi antar worker)"""
+
+    def __init__(self):
+        self._messages: Dict[str, List[Dict]] = {}
+        self._summaries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def append_many(self, records: List[Dict]) -> None:
+        with self._lock:
+            for record in records:
+                self._messages.setdefault(record['session_id'], []).append(dict(record))
+
+    def load(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        after: Optional[datetime] = None
+    ) -> List[Dict]:
+        with self._lock:
+            records = self._messages.get(session_id, [])
+            if after is not None:
+                records = [r for r in records if r['timestamp'] > after]
+            if limit is not None:
+                records = records[-limit:]
+            return [dict(r) for r in records]
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._messages.pop(session_id, None)
+            self._summaries.pop(session_id, None)
+
+    def delete_all(self) -> None:
+        with self._lock:
+            self._messages.clear()
+            self._summaries.clear()
+
+    def purge_expired(self, cutoff: datetime) -> int:
+        with self._lock:
+            expired = [
+                session_id for session_id, msgs in self._messages.items()
+                if msgs and msgs[-1]['timestamp'] < cutoff
+            ]
+            for session_id in expired:
+                del self._messages[session_id]
+                self._summaries.pop(session_id, None)
+            return len(expired)
+
+    def load_summary(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            summary = self._summaries.get(session_id)
+            return dict(summary) if summary else None
+
+    def save_summary(self, session_id: str, summary: str, covered_until: datetime) -> None:
+        with self._lock:
+            self._summaries[session_id] = {'summary': summary, 'covered_until': covered_until}
+
+
+class SQLiteConversationStore(ConversationStore):
+    """
+    SQLite storage (WAL mode) - aman untuk beberapa worker di host yang sama
+    """
+
+    def __init__(self, path: str = "./data/conversations.db"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS conversation_messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_conversation_messages_session "
+                "ON conversation_messages (session_id, id)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS conversation_summaries (
+                    session_id TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    covered_until TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+
+    def append_many(self, records: List[Dict]) -> None:
+        if not records:
+            return
+        rows = [
+            (r['session_id'], r['role'], r['content'], r['timestamp'].isoformat())
+            for r in records
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO conversation_messages (session_id, role, content, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def load(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        after: Optional[datetime] = None
+    ) -> List[Dict]:
+        query = "SELECT role, content, created_at FROM conversation_messages WHERE session_id = ?"
+        params: list = [session_id]
+        if after is not None:
+            query += " AND created_at > ?"
+            params.append(after.isoformat())
+        query += " ORDER BY id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [
+            {
+                'session_id': session_id,
+                'role': role,
+                'content': content,
+                'timestamp': datetime.fromisoformat(created_at)
+            }
+            for role, content, created_at in reversed(rows)
+        ]
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM conversation_messages WHERE session_id = ?",
+                (session_id,)
+            )
+            self._conn.execute(
+                "DELETE FROM conversation_summaries WHERE session_id = ?",
+                (session_id,)
+            )
+            self._conn.commit()
+
+    def delete_all(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM conversation_messages")
+            self._conn.execute("DELETE FROM conversation_summaries")
+            self._conn.commit()
+
+    def purge_expired(self, cutoff: datetime) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                DELETE FROM conversation_messages WHERE session_id IN (
+                    SELECT session_id FROM conversation_messages
+                    GROUP BY session_id HAVING MAX(created_at) < ?
+                )
+                """,
+                (cutoff.isoformat(),)
+            )
+            self._conn.execute(
+                "DELETE FROM conversation_summaries WHERE session_id NOT IN "
+                "(SELECT DISTINCT session_id FROM conversation_messages)"
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def load_summary(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, covered_until FROM conversation_summaries WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+
+        if not row:
+            return None
+        return {'summary': row[0], 'covered_until': datetime.fromisoformat(row[1])}
+
+    def save_summary(self, session_id: str, summary: str, covered_until: datetime) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversation_summaries (session_id, summary, covered_until) "
+                "VALUES (?, ?, ?)",
+                (session_id, summary, covered_until.isoformat())
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class PostgresConversationStore(ConversationStore):
+    """
+    PostgreSQL storage - shared antar node, memakai engine dari utils.db
+    """
+
+    def __init__(self, engine=None):
+        from sqlalchemy import text
+
+        if engine is None:
+            from utils.db import engine
+
+        self.engine = engine
+        self._text = text
+
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                """
+                CREATE TABLE IF NOT EXISTS conversation_messages (
+                    id BIGSERIAL PRIMARY KEY,
+                    session_id VARCHAR(255) NOT NULL,
+                    role VARCHAR(20) NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at TIMESTAMP NOT NULL
+                )
+                """
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_conversation_messages_session "
+                "ON conversation_messages (session_id, id)"
+            ))
+            conn.execute(text(
+                """
+                CREATE TABLE IF NOT EXISTS conversation_summaries (
+                    session_id VARCHAR(255) PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    covered_until TIMESTAMP NOT NULL
+                )
+                """
+            ))
+
+    def append_many(self, records: List[Dict]) -> None:
+        if not records:
+            return
+        rows = [
+            {
+                'session_id': r['session_id'],
+                'role': r['role'],
+                'content': r['content'],
+                'created_at': r['timestamp']
+            }
+            for r in records
+        ]
+        with self.engine.begin() as conn:
+            conn.execute(
+                self._text(
+                    "INSERT INTO conversation_messages (session_id, role, content, created_at) "
+                    "VALUES (:session_id, :role, :content, :created_at)"
+                ),
+                rows
+            )
+
+    def load(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+        after: Optional[datetime] = None
+    ) -> List[Dict]:
+        query = (
+            "SELECT role, content, created_at FROM conversation_messages "
+            "WHERE session_id = :session_id"
+        )
+        params: Dict = {'session_id': session_id}
+        if after is not None:
+            query += " AND created_at > :after"
+            params['after'] = after
+        query += " ORDER BY id DESC"
+        if limit is not None:
+            query += " LIMIT :limit"
+            params['limit'] = limit
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(self._text(query), params).fetchall()
+
+        return [
+            {
+                'session_id': session_id,
+                'role': role,
+                'content': content,
+                'timestamp': created_at
+            }
+            for role, content, created_at in reversed(rows)
+        ]
+
+    def delete(self, session_id: str) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                self._text("DELETE FROM conversation_messages WHERE session_id = :session_id"),
+                {'session_id': session_id}
+            )
+            conn.execute(
+                self._text("DELETE FROM conversation_summaries WHERE session_id = :session_id"),
+                {'session_id': session_id}
+            )
+
+    def delete_all(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(self._text("DELETE FROM conversation_messages"))
+            conn.execute(self._text("DELETE FROM conversation_summaries"))
+
+    def purge_expired(self, cutoff: datetime) -> int:
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                self._text(
+                    """
+                    DELETE FROM conversation_messages WHERE session_id IN (
+                        SELECT session_id FROM conversation_messages
+                        GROUP BY session_id HAVING MAX(created_at) < :cutoff
+                    )
+                    """
+                ),
+                {'cutoff': cutoff}
+            )
+            conn.execute(self._text(
+                "DELETE FROM conversation_summaries WHERE session_id NOT IN "
+                "(SELECT DISTINCT session_id FROM conversation_messages)"
+            ))
+            return result.rowcount
+
+    def load_summary(self, session_id: str) -> Optional[Dict]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                self._text(
+                    "SELECT summary, covered_until FROM conversation_summaries "
+                    "WHERE session_id = :session_id"
+                ),
+                {'session_id': session_id}
+            ).fetchone()
+
+        if not row:
+            return None
+        return {'summary': row[0], 'covered_until': row[1]}
+
+    def save_summary(self, session_id: str, summary: str, covered_until: datetime) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                self._text(
+                    """
+                    INSERT INTO conversation_summaries (session_id, summary, covered_until)
+                    VALUES (:session_id, :summary, :covered_until)
+                    ON CONFLICT (session_id) DO UPDATE
+                    SET summary = EXCLUDED.summary, covered_until = EXCLUDED.covered_until
+                    """
+                ),
+                {'session_id': session_id, 'summary': summary, 'covered_until': covered_until}
+            )
+
+
+def build_conversation_store(backend: str = "memory", config: Optional[dict] = None) -> ConversationStore:
+    """
+    Factory untuk conversation store berdasarkan config
+
+    Args:
+        backend: memory, sqlite, atau postgres
+        config: Section `conversation` dari config.yaml
+    """
+    config = config or {}
+
+    if backend == "memory":
+        return InMemoryConversationStore()
+    elif backend == "sqlite":
+        return SQLiteConversationStore(config.get('sqlite_path', './data/conversations.db'))
+    elif backend == "postgres":
+        return PostgresConversationStore()
+    else:
+        raise ValueError(f"Conversation backend tidak dikenali: {backend}")
@@ -0,0 +1,160 @@
+# core/conversation_summarizer.py
+
+"""
+Rolling Conversation Summary
+Folds older turns into an incremental summary so the per-request prompt
+stays bounded no matter how long a session runs.
+
+Summarization runs in a background executor after the response is sent;
+the result is cached per session by ConversationMemory.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Set
+
+from core.conversation_memory import ConversationMemory, ConversationMessage
+from core.prompt_manager_enhanced import get_conversation_summary_prompt
+
+
+class RollingSummarizer:
+    """
+    Incremental summarizer on top of ConversationMemory
+
+    When the unsummarized history exceeds `token_threshold`, every message
+    except the last `keep_recent_messages` is folded into the summary.
+    """
+
+    def __init__(
+        self,
+        memory: ConversationMemory,
+        llm,
+        token_threshold: int = 1500,
+        keep_recent_messages: int = 4,
+        max_workers: int = 2
+    ):
+        """
+        Args:
+            memory: ConversationMemory (summary_mode=True)
+            llm: LangChain chat model used to write the summary
+            token_threshold: Estimated history tokens that trigger a fold
+            keep_recent_messages: Most recent messages kept verbatim
+            max_workers: Concurrent background summarizations
+        """
+        self.memory = memory
+        self.llm = llm
+        self.token_threshold = token_threshold
+        self.keep_recent_messages = keep_recent_messages
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="conversation-summary"
+        )
+        self._in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Rough token estimate (~4 characters per token)"""
+        return len(text) // 4 + 1
+
+    def _history_tokens(self, messages: List[ConversationMessage]) -> int:
+        return sum(self.estimate_tokens(m.content) for m in messages)
+
+    def needs_summary(self, session_id: str) -> bool:
+        """Check if unsummarized history is over the token threshold"""
+        messages = self.memory.get_history(session_id)
+        if len(messages) <= self.keep_recent_messages:
+            return False
+        return self._history_tokens(messages) > self.token_threshold
+
+    def schedule(self, session_id: str) -> Optional[Future]:
+        """
+        Queue a background fold for the session (no-op if not needed
+        or already running for this session)
+        """
+        if not self.needs_summary(session_id):
+            return None
+
+        with self._lock:
+            if session_id in self._in_flight:
+                return None
+            self._in_flight.add(session_id)
+
+        return self._executor.submit(self._run, session_id)
+
+    def _run(self, session_id: str) -> Optional[str]:
+        try:
+            return self.summarize(session_id)
+        except Exception as e:
+            print(f"[RollingSummarizer] Summary failed for {session_id}: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._in_flight.discard(session_id)
+
+    def summarize(self, session_id: str) -> Optional[str]:
+        """
+        Fold older turns into the session summary (synchronous)
+
+        Returns:
+            New summary text, or None if nothing was folded
+        """
+        messages = self.memory.get_history(session_id)
+        if len(messages) <= self.keep_recent_messages:
+            return None
+        if self._history_tokens(messages) <= self.token_threshold:
+            return None
+
+        to_fold = messages[:-self.keep_recent_messages] if self.keep_recent_messages else messages
+        previous = self.memory.get_summary(session_id) or "(belum ada ringkasan)"
+
+        turns = "\n".join(
+            f"{'User' if m.role == 'user' else 'Assistant'}: {m.content}"
+            for m in to_fold
+        )
+        prompt = get_conversation_summary_prompt().format(
+            summary=previous,
+            turns=turns
+        )
+
+        response = self.llm.invoke(prompt)
+        summary = response.content.strip()
+
+        self.memory.set_summary(session_id, summary, covered_until=to_fold[-1].timestamp)
+        print(f"[RollingSummarizer] Folded {len(to_fold)} messages for session {session_id}")
+
+        return summary
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the background executor"""
+        self._executor.shutdown(wait=wait)
+
+
+# Global singleton instance
+_rolling_summarizer = None
+_summarizer_init_lock = threading.Lock()
+
+
+def get_rolling_summarizer(llm) -> RollingSummarizer:
+    """
+    Get or create global rolling summarizer
+
+    Args:
+        llm: Chat model used on first creation (ignored afterwards)
+    """
+    global _rolling_summarizer
+    if _rolling_summarizer is None:
+        with _summarizer_init_lock:
+            if _rolling_summarizer is None:
+                from core.config_loader import APP_CONFIG
+                from core.conversation_memory import get_conversation_memory
+
+                cfg = APP_CONFIG.get("conversation", {}).get("summary", {})
+                _rolling_summarizer = RollingSummarizer(
+                    memory=get_conversation_memory(),
+                    llm=llm,
+                    token_threshold=cfg.get("token_threshold", 1500),
+                    keep_recent_messages=cfg.get("keep_recent_messages", 4),
+                    max_workers=cfg.get("max_workers", 2)
+                )
+    return _rolling_summarizer
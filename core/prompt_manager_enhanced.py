@@ -436,6 +436,28 @@ User sekarang: "Kalau SMP?"
 """
 
 
+def get_conversation_summary_prompt() -> str:
+    """
+    Prompt for folding older turns into the rolling conversation summary
+    """
+    return """Anda merangkum percakapan antara orang tua/calon siswa dan chatbot YPI Al-Azhar.
+
+RINGKASAN SEBELUMNYA:
+{summary}
+
+PERCAKAPAN BARU YANG PERLU DIGABUNGKAN:
+{turns}
+
+INSTRUKSI:
+1. Gabungkan ringkasan sebelumnya dengan percakapan baru menjadi SATU ringkasan
+2. Pertahankan fakta penting: jenjang, cabang, tahun ajaran, kategori, angka biaya, dan keputusan user
+3. Catat pertanyaan yang belum terjawab
+4. Maksimal 150 kata, Bahasa Indonesia, tanpa salam pembuka
+
+RINGKASAN:
+"""
+
+
 def get_clarification_prompt() -> str:
     """
     Prompt when query is ambiguous
@@ -1,15 +1,21 @@
+import threading
+
 from langchain_openai import ChatOpenAI
-from langchain_chroma import Chroma
 from core.config_loader import APP_CONFIG
 from core.prompt_manager import get_system_prompt, get_query_prompt
 from dotenv import load_dotenv
 
 from utils.smart_retriever import SmartRetriever, EnhancedQueryChain
-from utils.embeddings import EmbeddingManager, EmbeddingModel
+from core.vectorstore_registry import get_active_state, get_embeddings, get_vector_store, get_vectordb_type
+from services.kb_archive_service import get_retrieval_archive
 
 load_dotenv()
 
 _query_chain = None  # Singleton
+_query_chain_collection = None  # collection yang dipakai _query_chain
+_query_chain_embeddings = None  # embedding config saat _query_chain dibangun
+_smart_retriever = None
+_build_lock = threading.Lock()
 
 
 def build_llm():
@@ -55,16 +61,38 @@ def get_query_chain():
     
     Flow:
     1. Load embeddings (OpenAI/HuggingFace)
-    2. Load vector database (ChromaDB)
+    2. Load vector database (vectordb.type: chroma / numpy)
     3. Initialize retriever
     4. Initialize LLM
     5. Create query chain
     """
-    global _query_chain
+    global _query_chain_collection
 
-    if _query_chain is not None:
+    active = get_active_state()
+    active_collection = active["collection"]
+    if _query_chain is not None and _query_chain_collection == active_collection:
         return _query_chain
 
+    # Warm-up (startup) dan request pertama tidak membangun chain dua kali
+    with _build_lock:
+        if _query_chain is not None and _query_chain_collection == active_collection:
+            return _query_chain
+
+        # Versi KB baru (promote/rollback) dengan model yang sama:
+        # cukup tukar retriever, LLM & embedding model tetap
+        if _query_chain is not None and _query_chain_embeddings == active["embeddings"]:
+            _smart_retriever.set_vectorstore(get_vector_store(active_collection))
+            print(f"🔀 Retriever → {active_collection}")
+            _query_chain_collection = active_collection
+            return _query_chain
+
+        # Embedding model berubah (migrasi): rebuild penuh
+        return _build_query_chain(active_collection, active["embeddings"])
+
+
+def _build_query_chain(active_collection: str, active_embeddings: dict):
+    global _query_chain, _query_chain_collection, _query_chain_embeddings, _smart_retriever
+
     print("🔄 Initializing RAG (ONCE)")
 
     # =========================
@@ -72,26 +100,8 @@ def get_query_chain():
     # =========================
     embedding_cfg = APP_CONFIG["embeddings"]
     
-    if embedding_cfg["model"] == "openai":
-        embedding_manager = EmbeddingManager(
-            model_type=EmbeddingModel.OPENAI,
-            config={
-                "model_name": embedding_cfg["openai"]["model_name"],
-                "dimensions": embedding_cfg["openai"]["dimensions"]
-            },
-        )
-    elif embedding_cfg["model"] == "huggingface":
-        embedding_manager = EmbeddingManager(
-            model_type=EmbeddingModel.HUGGINGFACE,
-            config={
-                "model_name": embedding_cfg["huggingface"]["model_name"],
-                "device": embedding_cfg["huggingface"]["device"]
-            },
-        )
-    else:
-        raise ValueError(f"Embedding model tidak didukung: {embedding_cfg['model']}")
-    
-    embeddings = embedding_manager.get_embeddings()
+    # Embedding & vector store bersama dengan router lain (registry)
+    embeddings = get_embeddings()
     
     print(f"✅ Embedding: {embedding_cfg['model']}")
     print(f"   Model: {embedding_cfg[embedding_cfg['model']]['model_name']}")
@@ -99,18 +109,10 @@ def get_query_chain():
     # =========================
     # Vector Database
     # =========================
-    chroma_cfg = APP_CONFIG["vectordb"]["chroma"]
-    collection_metadata = {"hnsw:space": chroma_cfg.get("distance_function", "cosine")}
-    
-    vectorstore = Chroma(
-        collection_name=chroma_cfg["collection_name"],
-        embedding_function=embeddings,
-        persist_directory=chroma_cfg["persist_directory"],
-        collection_metadata=collection_metadata
-    )
+    vectorstore = get_vector_store(active_collection)
     
-    print(f"✅ Vector DB: ChromaDB")
-    print(f"   Collection: {chroma_cfg['collection_name']}")
+    print(f"✅ Vector DB: {get_vectordb_type()}")
+    print(f"   Collection: {active_collection}")
 
     # =========================
     # Retriever (Simplified)
@@ -122,7 +124,8 @@ def get_query_chain():
         embedding_function=embeddings,
         top_k=retrieval_cfg["top_k"],
         similarity_threshold=retrieval_cfg.get("similarity_threshold", 0.5),
-        min_docs_required=2  # ✅ Minimal 2 dokumen
+        min_docs_required=2,  # ✅ Minimal 2 dokumen
+        archive=get_retrieval_archive()
     )
     
     print(f"✅ Retriever initialized")
@@ -147,4 +150,7 @@ def get_query_chain():
     )
 
     print("✅ RAG READY\n")
+    _query_chain_collection = active_collection
+    _query_chain_embeddings = active_embeddings
+    _smart_retriever = smart_retriever
     return _query_chain
\ No newline at end of file
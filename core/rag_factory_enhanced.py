@@ -6,9 +6,9 @@ Integrates all RAG components with improved architecture
 WITH CONVERSATION MEMORY SUPPORT
 """
 
+import threading
 from typing import Dict, Any
 from langchain_openai import ChatOpenAI
-from langchain_chroma import Chroma
 from dotenv import load_dotenv
 
 from core.config_loader import APP_CONFIG
@@ -23,20 +23,27 @@ from repositories.master_repository import MasterRepository
 from utils.query_processor import QueryProcessor
 from utils.smart_retriever_enhanced import EnhancedSmartRetriever
 from utils.enhanced_query_chain import EnhancedQueryChain, ConversationManager
-from utils.embeddings import EmbeddingManager, EmbeddingModel
+from core.vectorstore_registry import get_active_state, get_embeddings, get_vector_store, get_vectordb_type
+from services.kb_archive_service import get_retrieval_archive
 
 # NEW: Import conversation memory
 from core.conversation_memory import (
     add_user_message, 
     add_assistant_message, 
-    get_conversation_context
+    get_conversation_context,
+    get_conversation_memory
 )
+from core.conversation_summarizer import get_rolling_summarizer
 
 load_dotenv()
 
 # Global instances (singleton pattern)
 _query_chain = None
+_query_chain_collection = None  # collection yang dipakai _query_chain
+_query_chain_embeddings = None  # embedding config saat _query_chain dibangun
+_smart_retriever = None
 _conversation_manager = None
+_build_lock = threading.Lock()
 
 
 def build_llm():
@@ -86,11 +93,34 @@ def get_query_chain():
     Returns:
         EnhancedQueryChain instance
     """
-    global _query_chain
+    global _query_chain_collection
 
-    if _query_chain is not None:
+    active = get_active_state()
+    active_collection = active["collection"]
+    if _query_chain is not None and _query_chain_collection == active_collection:
         return _query_chain
 
+    # Warm-up (startup), promote dan request bersamaan tidak membangun /
+    # menukar retriever dua kali
+    with _build_lock:
+        if _query_chain is not None and _query_chain_collection == active_collection:
+            return _query_chain
+
+        # Versi KB baru (promote/rollback) dengan model yang sama:
+        # cukup tukar retriever, LLM & embedding model tetap
+        if _query_chain is not None and _query_chain_embeddings == active["embeddings"]:
+            _smart_retriever.set_vectorstore(get_vector_store(active_collection))
+            print(f"🔀 Retriever → {active_collection}")
+            _query_chain_collection = active_collection
+            return _query_chain
+
+        # Embedding model berubah (migrasi): rebuild penuh
+        return _build_query_chain(active_collection, active["embeddings"])
+
+
+def _build_query_chain(active_collection: str, active_embeddings: dict):
+    global _query_chain, _query_chain_collection, _query_chain_embeddings, _smart_retriever
+
     print("\n" + "="*60)
     print("🚀 Initializing Enhanced RAG System")
     print("="*60)
@@ -108,37 +138,23 @@ def get_query_chain():
     # =========================
     print("\n🔢 Step 2: Initializing embeddings...")
     
-    # Choose embedding model
-    # Option 1: HuggingFace (local, free)
-    embedding_manager = EmbeddingManager(
-        model_type=EmbeddingModel.HUGGINGFACE,
-        config={"model_name": "sentence-transformers/all-MiniLM-L6-v2"},
-    )
-    
-    # Option 2: OpenAI (cloud, paid but better)
-    # embedding_manager = EmbeddingManager(
-    #     model_type=EmbeddingModel.OPENAI,
-    #     config={"model_name": "text-embedding-3-small"},
-    # )
-    
-    embeddings = embedding_manager.get_embeddings()
+    # Model dipilih dari embeddings.model di config.yaml
+    # (openai, huggingface, atau onnx = MiniLM int8 tanpa torch),
+    # instance bersama dengan router lain lewat registry (di-load di sini
+    # agar tidak tertunda ke query pertama; retriever memakai registry)
+    get_embeddings()
     print("   ✅ Embeddings ready")
 
     # =========================
     # 3. Vector Store
     # =========================
     print("\n💾 Step 3: Loading vector store...")
-    vectorstore = Chroma(
-        collection_name="ypi_knowledge_base",
-        embedding_function=embeddings,
-        persist_directory="./chroma_db",
-    )
+    vectorstore = get_vector_store(active_collection)
     
     # Check collection size
     try:
-        collection = vectorstore._collection
-        count = collection.count()
-        print(f"   ✅ Vector store ready: {count} documents")
+        count = vectorstore.count()
+        print(f"   ✅ Vector store ready: {count} documents ({get_vectordb_type()})")
     except:
         print(f"   ✅ Vector store ready")
 
@@ -169,7 +185,8 @@ def get_query_chain():
         top_k=5,
         use_hybrid=False,  # Set True to enable hybrid search
         enable_reranking=True,
-        diversity_threshold=0.7
+        diversity_threshold=0.7,
+        archive=get_retrieval_archive()  # arsip tahun lampau (retrieval.archive)
     )
     print("   ✅ Smart retriever ready")
 
@@ -190,6 +207,9 @@ def get_query_chain():
     print("✅ RAG System Initialized Successfully!")
     print("="*60 + "\n")
 
+    _query_chain_collection = active_collection
+    _query_chain_embeddings = active_embeddings
+    _smart_retriever = smart_retriever
     return _query_chain
 
 
@@ -212,12 +232,16 @@ def reset_rag_system():
     """
     Reset RAG system (force re-initialization)
     Useful when config changes or for testing
+    (ganti versi knowledge base tidak perlu reset: /api/kb/promote)
     """
-    global _query_chain, _conversation_manager
+    global _query_chain, _query_chain_collection, _smart_retriever, _conversation_manager
     
     print("🔄 Resetting RAG system...")
-    _query_chain = None
-    _conversation_manager = None
+    with _build_lock:
+        _query_chain = None
+        _query_chain_collection = None
+        _smart_retriever = None
+        _conversation_manager = None
     print("✅ RAG system reset complete")
 
 
@@ -287,6 +311,10 @@ INSTRUCTION: Consider the conversation history above. If the current question re
     add_assistant_message(session_id, result['answer'])
     print("   ✅ Assistant response saved to memory")
     
+    # 5b. Rolling summary: fold older turns in the background
+    if get_conversation_memory().summary_mode:
+        get_rolling_summarizer(get_query_chain().llm).schedule(session_id)
+    
     # 6. Add metadata
     result['has_context'] = has_context
     result['session_id'] = session_id
@@ -0,0 +1,709 @@
+# ============================================================================
+# core/vector_store.py
+# ============================================================================
+"""
+Vector store interface + backend
+
+Interface kecil yang dipakai SmartRetriever, EnhancedSmartRetriever,
+EmbeddingService, api/embeding.py dan router listing/statistik, sehingga
+backend bisa dipilih lewat vectordb.type:
+
+- "chroma": ChromaVectorStore (langchain Chroma, SQLite + HNSW)
+- "numpy":  NumpyVectorStore (in-process, float32 mmap + filter bitmap,
+            opsional faiss-cpu). Untuk KB puluhan ribu chunk brute-force
+            matrix × vector lebih cepat daripada HNSW ber-filter Chroma.
+
+Ambil instance lewat core.vectorstore_registry.get_vector_store().
+"""
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa lock antar proses
+    fcntl = None
+
+
+class VectorStore(ABC):
+    """
+    Operasi yang dibutuhkan aplikasi dari vector store
+
+    Format get() mengikuti chromadb Collection.get():
+        {"ids": [...], "documents": [...], "metadatas": [...], "embeddings": [...]}
+    Filter (where) memakai sintaks Chroma: {"jenjang": "SMP"},
+    {"tahun": {"$gte": "2024"}}, {"$and": [...]}, {"$or": [...]}.
+    Score pencarian = cosine distance (0 = identik), sama dengan Chroma.
+    """
+
+    name: str
+
+    @property
+    def metadata(self) -> dict:
+        return {}
+
+    @abstractmethod
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[dict]
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        ...
+
+    @abstractmethod
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[dict] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Sequence[str] = ("documents", "metadatas")
+    ) -> Dict[str, list]:
+        ...
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    @abstractmethod
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[dict] = None
+    ) -> List[Tuple[Document, float]]:
+        ...
+
+    @abstractmethod
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[dict] = None
+    ) -> List[Tuple[Document, float]]:
+        ...
+
+    def similarity_search(self, query: str, k: int = 4, filter: Optional[dict] = None) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+
+
+class ChromaVectorStore(VectorStore):
+    """Adapter langchain Chroma → VectorStore"""
+
+    def __init__(self, vectorstore):
+        self.vectorstore = vectorstore
+        self.collection = vectorstore._collection
+        self.name = self.collection.name
+
+    @property
+    def metadata(self) -> dict:
+        return self.collection.metadata or {}
+
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        # Vector sudah dihitung: langsung ke collection (add_documents meng-embed ulang)
+        self.collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+
+    def delete(self, ids: List[str]) -> None:
+        if ids:
+            self.collection.delete(ids=ids)
+
+    def get(self, ids=None, where=None, limit=None, offset=None, include=("documents", "metadatas")):
+        return self.collection.get(ids=ids, where=where, limit=limit, offset=offset, include=list(include))
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4, filter=None):
+        results = self.collection.query(
+            query_embeddings=[embedding],
+            n_results=k,
+            where=filter,
+            include=["documents", "metadatas", "distances"]
+        )
+        return [
+            (Document(page_content=document, metadata=metadata or {}), distance)
+            for document, metadata, distance in zip(
+                results["documents"][0], results["metadatas"][0], results["distances"][0]
+            )
+        ]
+
+    def similarity_search_with_score(self, query, k=4, filter=None):
+        return self.vectorstore.similarity_search_with_score(query, k=k, filter=filter)
+
+    def similarity_search(self, query, k=4, filter=None):
+        return self.vectorstore.similarity_search(query, k=k, filter=filter)
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Vector store in-process: float32 matrix (mmap) + metadata kolomnar
+
+    Layout <persist_directory>/<name>/:
+        manifest.json          {"dimensions", "generation", ...}
+        vectors.<gen>.f32      float32 [capacity, dims], vector ter-normalisasi (L2)
+        records.<gen>.jsonl    log append-only upsert/delete (id, slot, document, metadata)
+
+    - Vector ditulis ke slot di mmap lalu record di-append ke log (fsync);
+      crash sebelum append = slot diabaikan saat load
+    - Filter: setiap metadata key disimpan sebagai kolom kode int32; bitmap
+      per (key, value) dihitung vectorized dan di-cache sampai ada write
+    - Search: skor cosine = matrix @ query (BLAS), top-k via argpartition;
+      dengan filter hanya slot yang lolos bitmap yang dihitung
+    - faiss-cpu (opsional, use_faiss) untuk query tanpa filter: IndexFlatIP,
+      atau IVF jika nlist > 0; di-update inkremental
+    - Proses lain (worker CLI / API) melihat write lewat tail log; write
+      antar proses diserialisasi dengan flock
+    - Slot yang dihapus/di-overwrite di-compact otomatis (compact_ratio)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        name: str,
+        embedding_function=None,
+        dimensions: Optional[int] = None,
+        use_faiss: bool = False,
+        nlist: int = 0,
+        nprobe: int = 8,
+        compact_ratio: float = 0.5,
+        initial_capacity: int = 1024
+    ):
+        self.path = path
+        self.name = name
+        self.embedding_function = embedding_function
+        self.use_faiss = use_faiss
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.compact_ratio = compact_ratio
+        self.initial_capacity = initial_capacity
+
+        self._lock = threading.RLock()
+        os.makedirs(path, exist_ok=True)
+
+        manifest_path = os.path.join(path, "manifest.json")
+        if not os.path.exists(manifest_path):
+            self._write_manifest({
+                "name": name,
+                "dimensions": dimensions,
+                "distance": "cosine",
+                "generation": 0,
+                "created_at": datetime.now().isoformat()
+            })
+        self._load()
+
+        stored = self._manifest.get("dimensions")
+        if stored and dimensions and stored != dimensions:
+            print(
+                f"⚠️ Vector store {name} berisi vector {stored} dims, model aktif {dimensions} dims. "
+                f"Ganti dimensi lewat: python run_collection_migration.py"
+            )
+
+    @classmethod
+    def from_config(cls, name: str, numpy_cfg: dict, embedding_function=None, dimensions: Optional[int] = None):
+        return cls(
+            path=os.path.join(numpy_cfg.get("persist_directory", "./vector_db"), name),
+            name=name,
+            embedding_function=embedding_function,
+            dimensions=dimensions,
+            use_faiss=numpy_cfg.get("use_faiss", False),
+            nlist=numpy_cfg.get("nlist", 0),
+            nprobe=numpy_cfg.get("nprobe", 8),
+            compact_ratio=numpy_cfg.get("compact_ratio", 0.5)
+        )
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _file(self, kind: str, generation: Optional[int] = None) -> str:
+        generation = self._manifest["generation"] if generation is None else generation
+        suffix = "f32" if kind == "vectors" else "jsonl"
+        return os.path.join(self.path, f"{kind}.{generation}.{suffix}")
+
+    def _write_manifest(self, manifest: dict) -> None:
+        manifest_path = os.path.join(self.path, "manifest.json")
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    @contextmanager
+    def _write_lock(self):
+        """Lock thread + antar proses (flock) untuk operasi tulis"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.path, ".lock"), "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self) -> None:
+        """Load penuh: manifest, mmap vector, replay log"""
+        with open(os.path.join(self.path, "manifest.json"), "r", encoding="utf-8") as f:
+            self._manifest = json.load(f)
+        self._manifest_mtime = os.stat(os.path.join(self.path, "manifest.json")).st_mtime
+
+        self._ids: List[Optional[str]] = []
+        self._slots: Dict[str, int] = {}
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[Optional[dict]] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._codes: Dict[str, np.ndarray] = {}
+        self._vocab: Dict[str, Dict[Any, int]] = {}
+        self._bitmaps: Dict[Tuple[str, Any], np.ndarray] = {}
+        self._size = 0
+        self._log_offset = 0
+        self._vectors = None
+        self._faiss = None
+        self._faiss_pending: set = set()
+
+        self._map_vectors()
+        self._tail_log()
+
+    def _map_vectors(self) -> None:
+        dims = self._manifest.get("dimensions")
+        if not dims:
+            self._vectors = None
+            return
+
+        path = self._file("vectors")
+        if not os.path.exists(path):
+            open(path, "wb").close()
+        rows = os.path.getsize(path) // (dims * 4)
+        if rows == 0:
+            self._vectors = np.zeros((0, dims), dtype=np.float32)
+        else:
+            self._vectors = np.memmap(path, dtype=np.float32, mode="r+", shape=(rows, dims))
+
+    def _grow_vectors(self, rows: int) -> None:
+        """Perbesar file vector (kapasitas dobel) lalu map ulang"""
+        if self._vectors is not None and len(self._vectors) >= rows:
+            return
+        dims = self._manifest["dimensions"]
+        capacity = max(self.initial_capacity, len(self._vectors) if self._vectors is not None else 0)
+        while capacity < rows:
+            capacity *= 2
+
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+        self._vectors = None
+        with open(self._file("vectors"), "r+b") as f:
+            f.truncate(capacity * dims * 4)
+        self._map_vectors()
+
+    def _sync(self) -> None:
+        """Ambil perubahan dari proses lain (compaction atau record baru)"""
+        manifest_path = os.path.join(self.path, "manifest.json")
+        if os.stat(manifest_path).st_mtime != self._manifest_mtime:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest["generation"] != self._manifest["generation"] or (
+                manifest.get("dimensions") != self._manifest.get("dimensions")
+            ):
+                self._load()
+                return
+            self._manifest_mtime = os.stat(manifest_path).st_mtime
+
+        log_path = self._file("records")
+        if os.path.exists(log_path) and os.path.getsize(log_path) > self._log_offset:
+            self._tail_log()
+
+    def _tail_log(self) -> None:
+        log_path = self._file("records")
+        if not os.path.exists(log_path):
+            return
+
+        with open(log_path, "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read()
+
+        # Baris terakhir yang belum lengkap (write sedang berjalan) diproses nanti
+        end = data.rfind(b"\n") + 1
+        records = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+        self._log_offset += end
+
+        if records:
+            max_slot = max((r["slot"] for r in records if r["op"] == "upsert"), default=-1)
+            if self._vectors is not None and max_slot >= len(self._vectors):
+                self._map_vectors()
+            for record in records:
+                self._apply(record)
+
+    def _ensure_rows(self, rows: int) -> None:
+        if rows <= len(self._alive):
+            return
+        capacity = max(self.initial_capacity, len(self._alive))
+        while capacity < rows:
+            capacity *= 2
+
+        extra = capacity - len(self._alive)
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=bool)])
+        for key, codes in self._codes.items():
+            self._codes[key] = np.concatenate([codes, np.full(extra, -1, dtype=np.int32)])
+        self._ids.extend([None] * extra)
+        self._documents.extend([None] * extra)
+        self._metadatas.extend([None] * extra)
+
+    def _apply(self, record: dict) -> None:
+        """Terapkan satu record log ke index in-memory"""
+        self._bitmaps.clear()
+
+        if record["op"] == "delete":
+            slot = self._slots.pop(record["id"], None)
+            if slot is not None:
+                self._clear_slot(slot)
+            return
+
+        slot = record["slot"]
+        self._ensure_rows(slot + 1)
+
+        # Id lama di slot lain (upsert dengan isi baru) → slot lama mati
+        previous = self._slots.get(record["id"])
+        if previous is not None and previous != slot:
+            self._clear_slot(previous)
+
+        self._ids[slot] = record["id"]
+        self._documents[slot] = record.get("document")
+        self._metadatas[slot] = record.get("metadata") or {}
+        self._slots[record["id"]] = slot
+        self._alive[slot] = True
+        self._size = max(self._size, slot + 1)
+        self._faiss_pending.add(slot)
+
+        for key, codes in self._codes.items():
+            codes[slot] = -1
+        for key, value in self._metadatas[slot].items():
+            if isinstance(value, (str, int, float, bool)):
+                if key not in self._codes:
+                    self._codes[key] = np.full(len(self._alive), -1, dtype=np.int32)
+                    self._vocab[key] = {}
+                vocab = self._vocab[key]
+                self._codes[key][slot] = vocab.setdefault(value, len(vocab))
+
+    def _clear_slot(self, slot: int) -> None:
+        self._alive[slot] = False
+        self._ids[slot] = None
+        self._documents[slot] = None
+        self._metadatas[slot] = None
+        for codes in self._codes.values():
+            codes[slot] = -1
+        self._faiss_pending.add(slot)
+
+    def _append_log(self, records: List[dict]) -> None:
+        with open(self._file("records"), "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # ------------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[None, :]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.clip(norms, 1e-12, None)
+
+    def upsert(self, ids, embeddings, documents, metadatas) -> None:
+        if not ids:
+            return
+        matrix = self._normalize(embeddings)
+
+        with self._write_lock():
+            self._sync()
+
+            dims = self._manifest.get("dimensions")
+            if not dims:
+                self._manifest["dimensions"] = dims = matrix.shape[1]
+                self._write_manifest(self._manifest)
+                self._manifest_mtime = os.stat(os.path.join(self.path, "manifest.json")).st_mtime
+                self._map_vectors()
+            if matrix.shape[1] != dims:
+                raise ValueError(f"Dimensi vector {matrix.shape[1]} ≠ dimensi store {self.name} ({dims})")
+
+            # Selalu slot baru: record lama tetap valid sampai log baru ter-append
+            slots = list(range(self._size, self._size + len(ids)))
+            self._grow_vectors(slots[-1] + 1)
+            self._vectors[slots[0]:slots[-1] + 1] = matrix
+            self._vectors.flush()
+
+            self._append_log([
+                {"op": "upsert", "id": doc_id, "slot": slot, "document": document, "metadata": metadata}
+                for doc_id, slot, document, metadata in zip(ids, slots, documents, metadatas)
+            ])
+            self._tail_log()
+            self._maybe_compact()
+
+    def delete(self, ids: List[str]) -> None:
+        if not ids:
+            return
+        with self._write_lock():
+            self._sync()
+            existing = [doc_id for doc_id in ids if doc_id in self._slots]
+            if existing:
+                self._append_log([{"op": "delete", "id": doc_id} for doc_id in existing])
+                self._tail_log()
+                self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        dead = self._size - len(self._slots)
+        if dead > max(self.initial_capacity, self.compact_ratio * max(1, len(self._slots))):
+            self._compact()
+
+    def compact(self) -> None:
+        """Tulis ulang vector + log hanya dengan slot hidup"""
+        with self._write_lock():
+            self._sync()
+            self._compact()
+
+    def _compact(self) -> None:
+        generation = self._manifest["generation"] + 1
+        live = np.flatnonzero(self._alive[:self._size])
+        dims = self._manifest.get("dimensions")
+
+        if dims:
+            vectors_path = self._file("vectors", generation)
+            with open(vectors_path, "wb") as f:
+                for i in range(0, len(live), 4096):
+                    f.write(np.ascontiguousarray(self._vectors[live[i:i + 4096]]).tobytes())
+
+        with open(self._file("records", generation), "w", encoding="utf-8") as f:
+            for new_slot, slot in enumerate(live):
+                f.write(json.dumps({
+                    "op": "upsert",
+                    "id": self._ids[slot],
+                    "slot": new_slot,
+                    "document": self._documents[slot],
+                    "metadata": self._metadatas[slot]
+                }, ensure_ascii=False) + "\n")
+
+        old_files = [self._file("vectors"), self._file("records")]
+        self._write_manifest({**self._manifest, "generation": generation})
+        self._vectors = None
+        self._load()
+
+        for path in old_files:
+            if os.path.exists(path):
+                os.remove(path)
+        print(f"🧹 Vector store {self.name} di-compact: {len(live)} vector (generation {generation})")
+
+    # ------------------------------------------------------------------
+    # Filter
+    # ------------------------------------------------------------------
+    def _bitmap(self, key: str, value) -> np.ndarray:
+        cache_key = (key, value)
+        bitmap = self._bitmaps.get(cache_key)
+        if bitmap is None:
+            code = self._vocab.get(key, {}).get(value)
+            if code is None:
+                bitmap = np.zeros(self._size, dtype=bool)
+            else:
+                bitmap = self._codes[key][:self._size] == code
+            self._bitmaps[cache_key] = bitmap
+        return bitmap
+
+    def _compare(self, key: str, op: str, value) -> np.ndarray:
+        codes = self._codes.get(key)
+        if codes is None:
+            return np.zeros(self._size, dtype=bool)
+        codes = codes[:self._size]
+        vocab = self._vocab[key]
+
+        if op == "$eq":
+            return self._bitmap(key, value)
+        if op == "$ne":
+            return (codes >= 0) & ~self._bitmap(key, value)
+        if op in ("$in", "$nin"):
+            matched = np.isin(codes, [vocab[v] for v in value if v in vocab])
+            return matched if op == "$in" else (codes >= 0) & ~matched
+
+        comparators = {
+            "$gt": lambda a: a > value,
+            "$gte": lambda a: a >= value,
+            "$lt": lambda a: a < value,
+            "$lte": lambda a: a <= value,
+        }
+        if op not in comparators:
+            raise ValueError(f"Operator filter tidak didukung: {op}")
+
+        matching = []
+        for candidate, code in vocab.items():
+            try:
+                if comparators[op](candidate):
+                    matching.append(code)
+            except TypeError:
+                continue
+        return np.isin(codes, matching)
+
+    def _evaluate(self, where: dict) -> np.ndarray:
+        masks = []
+        for key, condition in where.items():
+            if key in ("$and", "$or"):
+                parts = [self._evaluate(clause) for clause in condition] or [np.ones(self._size, dtype=bool)]
+                reduce = np.logical_and if key == "$and" else np.logical_or
+                masks.append(reduce.reduce(parts))
+                continue
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for op, value in condition.items():
+                masks.append(self._compare(key, op, value))
+
+        if not masks:
+            return np.ones(self._size, dtype=bool)
+        return np.logical_and.reduce(masks)
+
+    def _mask(self, where: Optional[dict]) -> np.ndarray:
+        alive = self._alive[:self._size]
+        if not where:
+            return alive.copy()
+        return alive & self._evaluate(where)
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+    @property
+    def metadata(self) -> dict:
+        return {
+            "backend": "numpy",
+            "hnsw:space": self._manifest.get("distance", "cosine"),
+            "embedding:dimensions": self._manifest.get("dimensions"),
+            "generation": self._manifest.get("generation"),
+            "faiss": self._faiss_available(),
+        }
+
+    def count(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._slots)
+
+    def _result(self, slots: Iterable[int], include: Sequence[str]) -> Dict[str, list]:
+        slots = list(slots)
+        result = {"ids": [self._ids[slot] for slot in slots]}
+        if "documents" in include:
+            result["documents"] = [self._documents[slot] for slot in slots]
+        if "metadatas" in include:
+            result["metadatas"] = [self._metadatas[slot] for slot in slots]
+        if "embeddings" in include:
+            result["embeddings"] = [self._vectors[slot].tolist() for slot in slots]
+        return result
+
+    def get(self, ids=None, where=None, limit=None, offset=None, include=("documents", "metadatas")):
+        with self._lock:
+            self._sync()
+            if ids is not None:
+                slots = [self._slots[doc_id] for doc_id in ids if doc_id in self._slots]
+                if where:
+                    mask = self._mask(where)
+                    slots = [slot for slot in slots if mask[slot]]
+            else:
+                slots = np.flatnonzero(self._mask(where)).tolist()
+
+            start = offset or 0
+            end = start + limit if limit is not None else None
+            return self._result(slots[start:end], include)
+
+    def _faiss_available(self) -> bool:
+        if not self.use_faiss:
+            return False
+        try:
+            import faiss  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def _faiss_index(self):
+        """Index faiss untuk query tanpa filter (update inkremental)"""
+        import faiss
+
+        dims = self._manifest["dimensions"]
+        if self._faiss is None:
+            live = np.flatnonzero(self._alive[:self._size]).astype(np.int64)
+            vectors = np.ascontiguousarray(self._vectors[live], dtype=np.float32)
+
+            if self.nlist and len(live) >= self.nlist * 39:
+                quantizer = faiss.IndexFlatIP(dims)
+                index = faiss.IndexIVFFlat(quantizer, dims, self.nlist, faiss.METRIC_INNER_PRODUCT)
+                index.train(vectors)
+                index.nprobe = self.nprobe
+                self._faiss_quantizer = quantizer  # cegah quantizer di-GC
+            else:
+                index = faiss.IndexIDMap(faiss.IndexFlatIP(dims))
+            index.add_with_ids(vectors, live)
+            self._faiss = index
+        elif self._faiss_pending:
+            pending = np.array(sorted(self._faiss_pending), dtype=np.int64)
+            self._faiss.remove_ids(pending)
+            live = pending[self._alive[pending]]
+            if len(live):
+                self._faiss.add_with_ids(np.ascontiguousarray(self._vectors[live], dtype=np.float32), live)
+
+        self._faiss_pending.clear()
+        return self._faiss
+
+    def _search(self, vector, k: int, where: Optional[dict]) -> List[Tuple[int, float]]:
+        """Top-k (slot, cosine similarity)"""
+        if self._vectors is None or not self._slots:
+            return []
+        query = self._normalize(vector)[0]
+
+        if not where and self._faiss_available():
+            scores, slots = self._faiss_index().search(query[None, :], k)
+            return [(int(slot), float(score)) for score, slot in zip(scores[0], slots[0]) if slot >= 0]
+
+        mask = self._mask(where)
+        candidates = np.flatnonzero(mask)
+        if len(candidates) == 0:
+            return []
+
+        if len(candidates) < self._size // 4:
+            # Filter selektif: hitung hanya baris yang lolos bitmap
+            scores = self._vectors[candidates] @ query
+        else:
+            scores = np.asarray(self._vectors[:self._size] @ query)[candidates]
+
+        if len(scores) > k:
+            top = np.argpartition(-scores, k)[:k]
+            top = top[np.argsort(-scores[top])]
+        else:
+            top = np.argsort(-scores)
+        return [(int(candidates[i]), float(scores[i])) for i in top]
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[dict] = None
+    ) -> List[Tuple[Document, float]]:
+        with self._lock:
+            self._sync()
+            return [
+                (Document(page_content=self._documents[slot], metadata=dict(self._metadatas[slot])), 1.0 - score)
+                for slot, score in self._search(embedding, k, filter)
+            ]
+
+    def similarity_search_with_score(self, query, k=4, filter=None):
+        if self.embedding_function is None:
+            raise RuntimeError(f"Vector store {self.name} tidak punya embedding function")
+        return self.similarity_search_by_vector_with_score(
+            self.embedding_function.embed_query(query), k=k, filter=filter
+        )
@@ -0,0 +1,339 @@
+# ============================================================================
+# core/vectorstore_registry.py
+# ============================================================================
+"""
+Process-wide registry untuk embedding model & ChromaDB
+
+Semua router (embed, statistics, vectorstore) dan get_query_chain memakai
+instance yang sama:
+- Embedding model di-load sekali per proses (lazy, saat pertama dipakai)
+- Satu chromadb.PersistentClient per persist_directory
+- Satu Chroma vectorstore per nama collection
+- get_collection(): raw chromadb Collection (tool khusus Chroma, mis.
+  run_hnsw_tuning.py) tanpa load embedding model
+- get_vector_store(): VectorStore (core/vector_store.py) sesuai
+  vectordb.type ("chroma" atau "numpy"); dipakai chat (rag_factory),
+  ingestion, listing & statistik
+Inisialisasi thread-safe (double-checked locking).
+
+Active collection pointer (untuk migrasi model tanpa downtime):
+file JSON {collection, embeddings} di persist_directory menentukan
+collection + embedding config yang dipakai default. Flip dilakukan
+atomik (os.replace); setiap proses mendeteksi perubahan lewat mtime.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from core.config_loader import APP_CONFIG
+from utils.embeddings import EmbeddingManager
+
+load_dotenv()
+
+_lock = threading.RLock()
+_embedding_manager: Optional[EmbeddingManager] = None
+_chroma_client = None
+_vectorstores: Dict[str, object] = {}
+_vector_stores: Dict[str, object] = {}
+_active_state: Optional[dict] = None
+_active_mtime: Optional[float] = None
+
+
+def get_chroma_config() -> dict:
+    return APP_CONFIG["vectordb"]["chroma"]
+
+
+def get_vectordb_type() -> str:
+    return APP_CONFIG["vectordb"].get("type", "chroma")
+
+
+def _active_file() -> str:
+    chroma_cfg = get_chroma_config()
+    return chroma_cfg.get(
+        "active_collection_file",
+        os.path.join(chroma_cfg["persist_directory"], "active_collection.json")
+    )
+
+
+def get_active_state() -> dict:
+    """
+    Collection aktif + embedding config-nya
+
+    Returns:
+        {"collection": str, "embeddings": dict, "flipped_at": str|None,
+         "previous": {"collection", "embeddings"} (jika pernah flip),
+         "staging": str (jika ada versi KB yang sedang dibangun)}
+    """
+    global _active_state, _active_mtime, _embedding_manager
+
+    path = _active_file()
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        mtime = None
+
+    if _active_state is not None and mtime == _active_mtime:
+        return _active_state
+
+    with _lock:
+        if _active_state is not None and mtime == _active_mtime:
+            return _active_state
+
+        state = {
+            "collection": get_chroma_config()["collection_name"],
+            "embeddings": APP_CONFIG["embeddings"],
+            "flipped_at": None
+        }
+        if mtime is not None:
+            with open(path, "r", encoding="utf-8") as f:
+                state.update(json.load(f))
+
+        if _active_state is not None:
+            if state["collection"] != _active_state["collection"]:
+                print(f"🔀 Active collection: {_active_state['collection']} → {state['collection']}")
+            # Model di-load ulang hanya jika embedding config berubah
+            # (promote versi KB dengan model yang sama memakai model lama)
+            if state["embeddings"] != _active_state["embeddings"]:
+                _embedding_manager = None
+
+        _active_state = state
+        _active_mtime = mtime
+        return _active_state
+
+
+def get_active_collection_name() -> str:
+    return get_active_state()["collection"]
+
+
+def set_active_collection(collection_name: str, embedding_cfg: dict) -> dict:
+    """
+    Flip collection aktif secara atomik (tmp file + os.replace)
+    Query berikutnya di semua proses memakai collection & model baru
+    """
+    current = get_active_state()
+    state = {
+        "collection": collection_name,
+        "embeddings": embedding_cfg,
+        "flipped_at": datetime.now().isoformat(),
+        # Untuk rollback
+        "previous": {
+            "collection": current["collection"],
+            "embeddings": current["embeddings"]
+        }
+    }
+    _write_active_state(state)
+    return get_active_state()
+
+
+def _write_active_state(state: dict) -> None:
+    path = _active_file()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def get_ingest_collection_name() -> str:
+    """
+    Collection tujuan write embedding: versi staging (snapshot KB yang
+    sedang dibangun) jika ada, selain itu collection aktif
+    """
+    state = get_active_state()
+    return state.get("staging") or state["collection"]
+
+
+def set_staging_collection(collection_name: Optional[str]) -> dict:
+    """Set/hapus versi staging (flip aktif berikutnya menghapus staging)"""
+    state = {key: value for key, value in get_active_state().items() if key != "staging"}
+    if collection_name:
+        state["staging"] = collection_name
+    _write_active_state(state)
+    return get_active_state()
+
+
+# vectordb.chroma.hnsw key → metadata key Chroma
+HNSW_PARAMS = {
+    "M": "hnsw:M",
+    "construction_ef": "hnsw:construction_ef",
+    "search_ef": "hnsw:search_ef",
+    "num_threads": "hnsw:num_threads",
+    "batch_size": "hnsw:batch_size",
+    "sync_threshold": "hnsw:sync_threshold",
+    "resize_factor": "hnsw:resize_factor",
+}
+
+
+def hnsw_metadata(hnsw_cfg: Optional[dict] = None) -> dict:
+    """Parameter HNSW (vectordb.chroma.hnsw atau override) sebagai metadata Chroma"""
+    if hnsw_cfg is None:
+        hnsw_cfg = get_chroma_config().get("hnsw", {})
+    return {HNSW_PARAMS[key]: value for key, value in hnsw_cfg.items() if key in HNSW_PARAMS}
+
+
+def get_collection_metadata(dimensions: Optional[int] = None, hnsw_cfg: Optional[dict] = None) -> dict:
+    """
+    Metadata collection baru (Chroma tidak mengubah metadata collection
+    yang sudah ada): distance, parameter HNSW, dan embedding:dimensions
+    untuk deteksi mismatch
+    """
+    metadata = {"hnsw:space": get_chroma_config().get("distance_function", "cosine")}
+    metadata.update(hnsw_metadata(hnsw_cfg))
+    if dimensions:
+        metadata["embedding:dimensions"] = dimensions
+    return metadata
+
+
+def get_embedding_manager() -> EmbeddingManager:
+    """EmbeddingManager untuk collection aktif (dibuat sekali per flip)"""
+    global _embedding_manager
+    embedding_cfg = get_active_state()["embeddings"]
+    if _embedding_manager is None:
+        with _lock:
+            if _embedding_manager is None:
+                _embedding_manager = EmbeddingManager.from_config(embedding_cfg)
+    return _embedding_manager
+
+
+def get_embeddings():
+    """LangChain Embeddings bersama (sudah dibungkus embedding cache)"""
+    return get_embedding_manager().get_embeddings()
+
+
+def get_chroma_client():
+    """Satu PersistentClient untuk semua collection"""
+    global _chroma_client
+    if _chroma_client is None:
+        with _lock:
+            if _chroma_client is None:
+                import chromadb
+                _chroma_client = chromadb.PersistentClient(
+                    path=get_chroma_config()["persist_directory"]
+                )
+    return _chroma_client
+
+
+def get_collection(collection_name: Optional[str] = None):
+    """
+    Raw chromadb Collection (count/get/metadata) tanpa load embedding model
+    """
+    name = collection_name or get_active_collection_name()
+    return get_chroma_client().get_or_create_collection(
+        name=name,
+        metadata=get_collection_metadata()
+    )
+
+
+def get_vectorstore(
+    collection_name: Optional[str] = None,
+    embeddings=None,
+    dimensions: Optional[int] = None
+):
+    """
+    Chroma vectorstore bersama untuk collection tertentu
+
+    Args:
+        collection_name: Default collection aktif
+        embeddings: Embedding function lain (mis. model baru saat migrasi);
+            default embedding bersama. Instance di-cache per collection.
+        dimensions: Dimensi vector `embeddings` (default: dimensi model aktif)
+    """
+    name = collection_name or get_active_collection_name()
+
+    vectorstore = _vectorstores.get(name)
+    if vectorstore is None:
+        with _lock:
+            vectorstore = _vectorstores.get(name)
+            if vectorstore is None:
+                from langchain_chroma import Chroma
+                if embeddings is None:
+                    embeddings = get_embeddings()
+                    dimensions = get_embedding_manager().get_embedding_dimension()
+
+                vectorstore = Chroma(
+                    client=get_chroma_client(),
+                    collection_name=name,
+                    embedding_function=embeddings,
+                    collection_metadata=get_collection_metadata(dimensions)
+                )
+
+                stored_metadata = vectorstore._collection.metadata or {}
+                drift = {
+                    key: value for key, value in hnsw_metadata().items()
+                    if stored_metadata.get(key) != value
+                }
+                if drift:
+                    print(f"ℹ️ Collection {name} dibuat dengan HNSW berbeda dari config: {drift}")
+
+                stored = stored_metadata.get("embedding:dimensions")
+                if stored and dimensions and stored != dimensions:
+                    print(
+                        f"⚠️ Collection {name} berisi vector {stored} dims, model aktif {dimensions} dims. "
+                        f"Ganti dimensi lewat: python run_collection_migration.py"
+                    )
+                _vectorstores[name] = vectorstore
+    return vectorstore
+
+
+def get_vector_store(
+    collection_name: Optional[str] = None,
+    embeddings=None,
+    dimensions: Optional[int] = None
+):
+    """
+    VectorStore bersama untuk collection tertentu (backend dari vectordb.type)
+
+    Args: sama dengan get_vectorstore()
+    """
+    name = collection_name or get_active_collection_name()
+
+    store = _vector_stores.get(name)
+    if store is None:
+        with _lock:
+            store = _vector_stores.get(name)
+            if store is None:
+                from core.vector_store import ChromaVectorStore, NumpyVectorStore
+
+                backend = get_vectordb_type()
+                if backend == "chroma":
+                    store = ChromaVectorStore(get_vectorstore(name, embeddings, dimensions))
+                elif backend == "numpy":
+                    if embeddings is None:
+                        embeddings = get_embeddings()
+                        dimensions = get_embedding_manager().get_embedding_dimension()
+                    store = NumpyVectorStore.from_config(
+                        name,
+                        APP_CONFIG["vectordb"].get("numpy", {}),
+                        embedding_function=embeddings,
+                        dimensions=dimensions
+                    )
+                else:
+                    raise ValueError(f"vectordb.type tidak dikenal: {backend}")
+                _vector_stores[name] = store
+    return store
+
+
+def list_collection_names() -> List[str]:
+    """Nama semua collection/store di backend aktif (vectordb.type)"""
+    if get_vectordb_type() == "numpy":
+        root = APP_CONFIG["vectordb"].get("numpy", {}).get("persist_directory", "./vector_db")
+        if not os.path.isdir(root):
+            return []
+        return sorted(
+            name for name in os.listdir(root)
+            if os.path.exists(os.path.join(root, name, "manifest.json"))
+        )
+    # chromadb < 0.6 mengembalikan Collection, versi baru nama (str)
+    return sorted(getattr(c, "name", c) for c in get_chroma_client().list_collections())
+
+
+def drop_vectorstore(collection_name: str) -> None:
+    """Lepas instance cache (mis. setelah collection dihapus)"""
+    with _lock:
+        _vectorstores.pop(collection_name, None)
+        _vector_stores.pop(collection_name, None)
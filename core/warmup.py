@@ -0,0 +1,98 @@
+# ============================================================================
+# core/warmup.py
+# ============================================================================
+"""
+Warm startup untuk RAG stack
+
+Dipanggil dari lifespan api_main.py supaya request chat pertama setelah
+deploy tidak menunggu inisialisasi:
+1. get_query_chain(): embedding model, vector store, LLM, prompt
+2. Warm-up embed (model + tokenizer + thread pool ter-inisialisasi)
+3. Warm-up search: index vector (HNSW Chroma / mmap NumPy) di-load ke memory
+
+Status dibaca endpoint readiness (/ready): 503 sampai status "ready".
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from core.config_loader import APP_CONFIG
+
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_state: Dict = {
+    "status": "cold",  # cold → warming → ready | failed
+    "started_at": None,
+    "finished_at": None,
+    "steps": {},
+    "error": None,
+}
+
+
+def get_warmup_config() -> dict:
+    return APP_CONFIG.get("performance", {}).get("warmup", {})
+
+
+def _timed(name: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    _state["steps"][name] = round(time.perf_counter() - start, 3)
+    print(f"   🔥 {name}: {_state['steps'][name]:.2f}s")
+    return result
+
+
+def warm_up(query: Optional[str] = None) -> Dict:
+    """Inisialisasi + warm-up RAG stack (blocking)"""
+    from core.rag_factory import get_query_chain
+    from core.vectorstore_registry import get_embeddings, get_vector_store
+
+    query = query or get_warmup_config().get("query", "biaya pendaftaran")
+
+    _state.update({
+        "status": "warming",
+        "started_at": datetime.now().isoformat(),
+        "finished_at": None,
+        "steps": {},
+        "error": None,
+    })
+    print("🔥 Warm-up RAG stack...")
+
+    try:
+        _timed("query_chain", get_query_chain)
+        _timed("embed", lambda: get_embeddings().embed_query(query))
+        _timed("search", lambda: get_vector_store().similarity_search(query, k=1))
+        _state["status"] = "ready"
+        print(f"✅ Warm-up selesai dalam {sum(_state['steps'].values()):.2f}s")
+    except Exception as e:
+        _state["status"] = "failed"
+        _state["error"] = str(e)
+        print(f"❌ Warm-up gagal: {e}")
+    finally:
+        _state["finished_at"] = datetime.now().isoformat()
+
+    return get_warmup_status()
+
+
+def start_warm_up() -> None:
+    """Warm-up di background thread (server sudah menerima /ready → 503)"""
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=warm_up, name="rag-warmup", daemon=True)
+        _thread.start()
+
+
+def mark_ready() -> None:
+    """Warm-up dimatikan (performance.warmup.enabled: false)"""
+    _state["status"] = "ready"
+
+
+def is_ready() -> bool:
+    return _state["status"] == "ready"
+
+
+def get_warmup_status() -> Dict:
+    return {**_state, "steps": dict(_state["steps"])}
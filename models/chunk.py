@@ -13,8 +13,12 @@ class ChunkModel(Base):
 
     metadata_json = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    # Tambahkan status dengan default 'pending'
+    # Status: pending → embedding (di-claim worker) → embedded
     status = Column(String(50), nullable=False, server_default="pending")
+    # Lease: worker yang sedang meng-embed chunk ini & batas waktunya
+    # (lease kedaluwarsa = worker mati, chunk boleh di-claim ulang)
+    claimed_by = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     updated_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),      # default saat insert
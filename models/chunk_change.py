@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from utils.db import Base
+
+
+class ChunkChangeModel(Base):
+    """
+    Change feed (outbox) perubahan document_chunks
+    Ditulis dalam transaksi yang sama dengan perubahan chunk,
+    diproses ChunkSyncService untuk sinkronisasi ke ChromaDB
+    """
+    __tablename__ = "chunk_change_feed"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Tanpa FK: event delete tetap ada setelah chunk dihapus
+    chunk_id = Column(Integer, nullable=False, index=True)
+    operation = Column(String(20), nullable=False)  # upsert | delete
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True), nullable=True, index=True)
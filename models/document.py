@@ -28,6 +28,8 @@ class Document(Base):
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=False)  # in bytes
     mime_type = Column(String(100), nullable=False)
+    # sha256 isi file: upload identik di-skip (incremental ingestion)
+    content_sha256 = Column(String(64), nullable=True, index=True)
     
     # Document Metadata
     total_pages = Column(Integer, nullable=True)
@@ -82,6 +84,11 @@ class DocumentPage(Base):
     # Page metrics
     ocr_confidence = Column(Float, nullable=True)
     
+    # Incremental ingestion: hash text + tabel halaman dan hasil AI rewrite;
+    # halaman dengan hash sama tidak ditulis ulang saat dokumen diperbarui
+    content_sha256 = Column(String(64), nullable=True)
+    knowledge_text = Column(Text, nullable=True)
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     def __repr__(self):
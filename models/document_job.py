@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, JSON, DateTime
+from sqlalchemy.sql import func
+from utils.db import Base
+
+
+class DocumentJobModel(Base):
+    """
+    Antrian proses dokumen (PDF → knowledge base) di background
+    Di-claim worker dengan lease (DocumentJobRepository.claim), sehingga
+    beberapa thread/proses bisa memproses dokumen berbeda bersamaan
+    """
+    __tablename__ = "document_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, nullable=False, index=True)
+
+    # Status: queued → running → completed | failed | cancelled
+    status = Column(String(20), nullable=False, server_default="queued", index=True)
+    # Tahap berjalan: queued, extract, rewrite, save, done
+    stage = Column(String(20), nullable=False, server_default="queued")
+    progress = Column(Float, nullable=False, server_default="0")  # 0-1 seluruh job
+    message = Column(String(500), nullable=True)
+    error_message = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, server_default="false")
+
+    # Lease: diperpanjang setiap laporan progress (lewat batas = worker mati)
+    claimed_by = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, server_default="0")
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
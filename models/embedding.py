@@ -1,11 +1,17 @@
-from sqlalchemy import Column, Integer, ForeignKey, JSON, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
 from sqlalchemy.sql import func
 from utils.db import Base
+from core.config_loader import APP_CONFIG
+from utils.vector_codec import vector_column_type
+
+# Mode penyimpanan vector: json (legacy), bytea (float32), pgvector
+# Jalankan run_vector_migration.py sebelum mengganti mode di config.yaml
+VECTOR_STORAGE = APP_CONFIG["database"].get("vector_storage", "json")
 
 class EmbeddingModel(Base):
     __tablename__ = "document_embeddings"
 
     id = Column(Integer, primary_key=True, index=True)
     chunk_id = Column(Integer, ForeignKey("document_chunks.id"), nullable=False)
-    vector = Column(JSON, nullable=False)  # simpan embedding sebagai JSON/array
+    vector = Column(vector_column_type(VECTOR_STORAGE), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
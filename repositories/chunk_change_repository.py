@@ -0,0 +1,57 @@
+# app/repositories/chunk_change_repository.py
+from datetime import datetime, timezone
+from typing import Iterable, List
+
+from sqlalchemy.orm import Session
+
+from models.chunk_change import ChunkChangeModel
+
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+# Hanya metadata berubah (content sama): vector lama dipakai, tanpa embed ulang
+OP_METADATA = "metadata"
+
+
+class ChunkChangeRepository:
+    """
+    Repository untuk chunk_change_feed (outbox perubahan chunk → ChromaDB)
+    record() tidak commit: dipanggil di transaksi perubahan chunk
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record(self, chunk_ids: Iterable[int], operation: str) -> None:
+        self.db.add_all([
+            ChunkChangeModel(chunk_id=chunk_id, operation=operation)
+            for chunk_id in chunk_ids
+        ])
+
+    def claim_pending(self, limit: int = 500) -> List[ChunkChangeModel]:
+        """
+        Ambil event yang belum diproses (urut id), di-lock sampai commit
+        (processor lain melewati row yang sama: SKIP LOCKED)
+        """
+        return (
+            self.db.query(ChunkChangeModel)
+            .filter(ChunkChangeModel.processed_at.is_(None))
+            .order_by(ChunkChangeModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def mark_processed(self, event_ids: List[int]) -> None:
+        if not event_ids:
+            return
+        self.db.query(ChunkChangeModel).filter(
+            ChunkChangeModel.id.in_(event_ids)
+        ).update(
+            {ChunkChangeModel.processed_at: datetime.now(timezone.utc)},
+            synchronize_session=False
+        )
+
+    def count_pending(self) -> int:
+        return self.db.query(ChunkChangeModel).filter(
+            ChunkChangeModel.processed_at.is_(None)
+        ).count()
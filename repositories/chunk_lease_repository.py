@@ -0,0 +1,153 @@
+# app/repositories/chunk_lease_repository.py
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from models.chunk import ChunkModel
+
+STATUS_PENDING = "pending"
+STATUS_EMBEDDING = "embedding"
+STATUS_EMBEDDED = "embedded"
+
+
+def default_worker_id() -> str:
+    """Identitas worker: host:pid"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ChunkLeaseRepository:
+    """
+    Claim/lease chunk untuk embedding paralel (multi-proses / multi-node)
+
+    Alur status: pending → embedding (claimed_by + lease_expires_at) → embedded
+    - claim(): SELECT ... FOR UPDATE SKIP LOCKED lalu set status 'embedding'
+      dengan token unik per claim, sehingga dua worker tidak pernah
+      mendapat chunk yang sama
+    - Lease yang kedaluwarsa (worker crash) bisa di-claim ulang
+    - complete()/release() hanya menyentuh row yang masih dipegang token
+    """
+
+    def __init__(self, db: Session, worker_id: Optional[str] = None, lease_seconds: int = 300):
+        self.db = db
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+
+    def _claimable(self, now: datetime):
+        return or_(
+            ChunkModel.status == STATUS_PENDING,
+            and_(
+                ChunkModel.status == STATUS_EMBEDDING,
+                or_(ChunkModel.lease_expires_at.is_(None), ChunkModel.lease_expires_at < now)
+            )
+        )
+
+    def new_token(self) -> str:
+        return f"{self.worker_id}:{uuid.uuid4().hex[:8]}"[:100]
+
+    def claim(
+        self,
+        limit: int,
+        after_id: int = 0,
+        token: Optional[str] = None,
+        chunk_ids: Optional[List[int]] = None
+    ) -> List[ChunkModel]:
+        """
+        Claim maksimal `limit` chunk (urut id, id > after_id) dan commit
+        chunk_ids: batasi claim ke chunk tertentu (mis. dari change feed)
+
+        Returns:
+            Chunk yang berhasil di-claim (claimed_by == token)
+        """
+        token = token or self.new_token()
+        now = datetime.now(timezone.utc)
+
+        # PostgreSQL: row yang sedang di-lock worker lain dilewati (SKIP LOCKED)
+        query = self.db.query(ChunkModel.id).filter(self._claimable(now), ChunkModel.id > after_id)
+        if chunk_ids is not None:
+            query = query.filter(ChunkModel.id.in_(chunk_ids))
+
+        ids = [
+            row[0] for row in (
+                query
+                .order_by(ChunkModel.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+        ]
+
+        if not ids:
+            self.db.commit()
+            return []
+
+        # Kondisi claimable diulang di UPDATE (compare-and-set) supaya tetap
+        # aman pada dialect tanpa FOR UPDATE (mis. SQLite)
+        self.db.query(ChunkModel).filter(
+            ChunkModel.id.in_(ids),
+            self._claimable(now)
+        ).update({
+            ChunkModel.status: STATUS_EMBEDDING,
+            ChunkModel.claimed_by: token,
+            ChunkModel.lease_expires_at: now + timedelta(seconds=self.lease_seconds)
+        }, synchronize_session=False)
+        self.db.commit()
+
+        return (
+            self.db.query(ChunkModel)
+            .filter(ChunkModel.id.in_(ids), ChunkModel.claimed_by == token)
+            .order_by(ChunkModel.id)
+            .all()
+        )
+
+    def complete(self, chunk_ids: List[int], token: str) -> List[int]:
+        """
+        Tandai chunk 'embedded' jika lease masih dipegang token
+        (commit dilakukan oleh caller bersama penulisan vector audit)
+
+        Returns:
+            Id chunk yang masih dimiliki token
+        """
+        owned = [
+            row[0] for row in (
+                self.db.query(ChunkModel.id)
+                .filter(ChunkModel.id.in_(chunk_ids), ChunkModel.claimed_by == token)
+                .with_for_update()
+                .all()
+            )
+        ]
+        if owned:
+            self.db.query(ChunkModel).filter(ChunkModel.id.in_(owned)).update({
+                ChunkModel.status: STATUS_EMBEDDED,
+                ChunkModel.claimed_by: None,
+                ChunkModel.lease_expires_at: None
+            }, synchronize_session=False)
+        return owned
+
+    def release(self, chunk_ids: List[int], token: str) -> int:
+        """Kembalikan chunk ke 'pending' (mis. embedding gagal) dan commit"""
+        released = self.db.query(ChunkModel).filter(
+            ChunkModel.id.in_(chunk_ids),
+            ChunkModel.claimed_by == token
+        ).update({
+            ChunkModel.status: STATUS_PENDING,
+            ChunkModel.claimed_by: None,
+            ChunkModel.lease_expires_at: None
+        }, synchronize_session=False)
+        self.db.commit()
+        return released
+
+    def renew(self, chunk_ids: List[int], token: str) -> int:
+        """Perpanjang lease untuk batch yang masih diproses"""
+        renewed = self.db.query(ChunkModel).filter(
+            ChunkModel.id.in_(chunk_ids),
+            ChunkModel.claimed_by == token
+        ).update({
+            ChunkModel.lease_expires_at: datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)
+        }, synchronize_session=False)
+        self.db.commit()
+        return renewed
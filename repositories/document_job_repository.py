@@ -0,0 +1,216 @@
+# app/repositories/document_job_repository.py
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from models.document_job import DocumentJobModel
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+class DocumentJobRepository:
+    """
+    Repository untuk document_jobs
+
+    Alur: enqueue() → claim() (SKIP LOCKED + lease) → progress() → finish()
+    - Job 'running' dengan lease kedaluwarsa (worker crash) bisa di-claim ulang
+    - progress()/finish() hanya menyentuh job yang masih dipegang token
+    """
+
+    def __init__(self, db: Session, lease_seconds: int = 600):
+        self.db = db
+        self.lease_seconds = lease_seconds
+
+    def _lease(self, now: datetime) -> datetime:
+        return now + timedelta(seconds=self.lease_seconds)
+
+    def get(self, job_id: int) -> Optional[DocumentJobModel]:
+        return self.db.query(DocumentJobModel).filter(DocumentJobModel.id == job_id).first()
+
+    def get_active(self, document_id: int) -> Optional[DocumentJobModel]:
+        return (
+            self.db.query(DocumentJobModel)
+            .filter(
+                DocumentJobModel.document_id == document_id,
+                DocumentJobModel.status.in_(ACTIVE_STATUSES)
+            )
+            .first()
+        )
+
+    def get_latest(self, document_id: int) -> Optional[DocumentJobModel]:
+        return (
+            self.db.query(DocumentJobModel)
+            .filter(DocumentJobModel.document_id == document_id)
+            .order_by(DocumentJobModel.id.desc())
+            .first()
+        )
+
+    def list(self, status: Optional[str] = None, skip: int = 0, limit: int = 50) -> List[DocumentJobModel]:
+        query = self.db.query(DocumentJobModel)
+        if status:
+            query = query.filter(DocumentJobModel.status == status)
+        return query.order_by(DocumentJobModel.id.desc()).offset(skip).limit(limit).all()
+
+    def count_by_status(self) -> dict:
+        return {
+            status: self.db.query(DocumentJobModel).filter(DocumentJobModel.status == status).count()
+            for status in (JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+        }
+
+    def enqueue(self, document_id: int) -> DocumentJobModel:
+        """Job baru (commit); satu dokumen hanya punya satu job aktif"""
+        job = self.get_active(document_id)
+        if job:
+            return job
+
+        job = DocumentJobModel(
+            document_id=document_id,
+            status=JOB_QUEUED,
+            stage=JOB_QUEUED,
+            progress=0.0,
+            cancel_requested=False,
+            attempts=0
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def claim(self, token: str) -> Optional[DocumentJobModel]:
+        """Claim job tertua yang siap diproses dan commit (None jika kosong)"""
+        now = datetime.now(timezone.utc)
+        claimable = or_(
+            DocumentJobModel.status == JOB_QUEUED,
+            and_(
+                DocumentJobModel.status == JOB_RUNNING,
+                or_(DocumentJobModel.lease_expires_at.is_(None), DocumentJobModel.lease_expires_at < now)
+            )
+        )
+
+        # PostgreSQL: job yang sedang di-lock worker lain dilewati (SKIP LOCKED)
+        row = (
+            self.db.query(DocumentJobModel.id)
+            .filter(claimable)
+            .order_by(DocumentJobModel.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if row is None:
+            self.db.commit()
+            return None
+
+        # Compare-and-set seperti ChunkLeaseRepository.claim
+        claimed = self.db.query(DocumentJobModel).filter(
+            DocumentJobModel.id == row[0],
+            claimable
+        ).update({
+            DocumentJobModel.status: JOB_RUNNING,
+            DocumentJobModel.claimed_by: token,
+            DocumentJobModel.lease_expires_at: self._lease(now),
+            DocumentJobModel.started_at: now,
+            DocumentJobModel.attempts: DocumentJobModel.attempts + 1
+        }, synchronize_session=False)
+        self.db.commit()
+
+        return self.get(row[0]) if claimed else None
+
+    def progress(self, job_id: int, token: str, stage: str, progress: float, message: Optional[str] = None) -> bool:
+        """
+        Simpan progress + perpanjang lease (commit)
+
+        Returns:
+            True jika job harus berhenti (cancel diminta / lease diambil worker lain)
+        """
+        now = datetime.now(timezone.utc)
+        updated = self.db.query(DocumentJobModel).filter(
+            DocumentJobModel.id == job_id,
+            DocumentJobModel.claimed_by == token
+        ).update({
+            DocumentJobModel.stage: stage,
+            DocumentJobModel.progress: progress,
+            DocumentJobModel.message: message,
+            DocumentJobModel.lease_expires_at: self._lease(now)
+        }, synchronize_session=False)
+        self.db.commit()
+
+        if not updated:
+            return True
+        cancel_requested = (
+            self.db.query(DocumentJobModel.cancel_requested)
+            .filter(DocumentJobModel.id == job_id)
+            .scalar()
+        )
+        return bool(cancel_requested)
+
+    def renew(self, job_id: int, token: str) -> bool:
+        """Perpanjang lease (heartbeat) dan commit; False jika job sudah bukan milik token"""
+        renewed = self.db.query(DocumentJobModel).filter(
+            DocumentJobModel.id == job_id,
+            DocumentJobModel.claimed_by == token
+        ).update({
+            DocumentJobModel.lease_expires_at: self._lease(datetime.now(timezone.utc))
+        }, synchronize_session=False)
+        self.db.commit()
+        return bool(renewed)
+
+    def finish(
+        self,
+        job_id: int,
+        token: str,
+        status: str,
+        error_message: Optional[str] = None,
+        result: Optional[dict] = None
+    ) -> bool:
+        """Tandai job selesai (completed / failed / cancelled) dan commit"""
+        values = {
+            DocumentJobModel.status: status,
+            DocumentJobModel.claimed_by: None,
+            DocumentJobModel.lease_expires_at: None,
+            DocumentJobModel.error_message: error_message,
+            DocumentJobModel.result: result,
+            DocumentJobModel.finished_at: datetime.now(timezone.utc)
+        }
+        if status == JOB_COMPLETED:
+            values[DocumentJobModel.stage] = "done"
+            values[DocumentJobModel.progress] = 1.0
+
+        updated = self.db.query(DocumentJobModel).filter(
+            DocumentJobModel.id == job_id,
+            DocumentJobModel.claimed_by == token
+        ).update(values, synchronize_session=False)
+        self.db.commit()
+        return bool(updated)
+
+    def request_cancel(self, job_id: int) -> Optional[DocumentJobModel]:
+        """
+        Job 'queued' langsung dibatalkan; job 'running' diberi tanda
+        cancel_requested dan berhenti di laporan progress berikutnya
+        """
+        # Compare-and-set: tidak bentrok dengan claim() yang berjalan bersamaan
+        cancelled = self.db.query(DocumentJobModel).filter(
+            DocumentJobModel.id == job_id,
+            DocumentJobModel.status == JOB_QUEUED
+        ).update({
+            DocumentJobModel.status: JOB_CANCELLED,
+            DocumentJobModel.finished_at: datetime.now(timezone.utc)
+        }, synchronize_session=False)
+        if not cancelled:
+            self.db.query(DocumentJobModel).filter(
+                DocumentJobModel.id == job_id,
+                DocumentJobModel.status == JOB_RUNNING
+            ).update({DocumentJobModel.cancel_requested: True}, synchronize_session=False)
+        self.db.commit()
+
+        job = self.get(job_id)
+        if job is not None:
+            self.db.refresh(job)
+        return job
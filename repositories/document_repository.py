@@ -2,7 +2,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, asc
 from typing import List, Optional
-from models.document import Document, DocumentStatus
+from models.document import Document, DocumentPage, DocumentStatus
 from datetime import datetime
 
 class DocumentRepository:
@@ -35,6 +35,58 @@ class DocumentRepository:
         """
         return self.db.query(Document).filter(Document.filename == filename).first()
     
+    def get_by_sha256(self, content_sha256: str) -> Optional[Document]:
+        """
+        Document dengan isi file identik (yang gagal diproses diabaikan)
+        """
+        return (
+            self.db.query(Document)
+            .filter(
+                Document.content_sha256 == content_sha256,
+                Document.status != DocumentStatus.FAILED
+            )
+            .order_by(desc(Document.created_at))
+            .first()
+        )
+    
+    def get_page_hashes(self, document_id: int) -> dict:
+        """
+        {page_number: (content_sha256, knowledge_text)} hasil proses sebelumnya
+        """
+        pages = (
+            self.db.query(DocumentPage)
+            .filter(
+                DocumentPage.document_id == document_id,
+                DocumentPage.content_sha256.isnot(None)
+            )
+            .all()
+        )
+        return {page.page_number: (page.content_sha256, page.knowledge_text) for page in pages}
+    
+    def save_pages(self, document_id: int, pages: List[dict]) -> None:
+        """
+        Upsert per halaman (page_number); halaman di luar dokumen baru dihapus
+        """
+        existing = {
+            page.page_number: page
+            for page in self.db.query(DocumentPage).filter(DocumentPage.document_id == document_id).all()
+        }
+        
+        for data in pages:
+            page = existing.pop(data["page_number"], None)
+            if page is None:
+                page = DocumentPage(document_id=document_id, page_number=data["page_number"])
+                self.db.add(page)
+            page.text = data["text"]
+            page.tables = data["tables"]
+            page.content_sha256 = data["content_sha256"]
+            page.knowledge_text = data["knowledge_text"]
+        
+        for page in existing.values():
+            self.db.delete(page)
+        
+        self.db.commit()
+    
     def get_all(
         self, 
         skip: int = 0, 
@@ -147,6 +199,9 @@ class DocumentRepository:
         if not document:
             return False
         
+        self.db.query(DocumentPage).filter(
+            DocumentPage.document_id == document_id
+        ).delete(synchronize_session=False)
         self.db.delete(document)
         self.db.commit()
         return True
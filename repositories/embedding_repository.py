@@ -0,0 +1,89 @@
+# app/repositories/embedding_repository.py
+import io
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from models.embedding import EmbeddingModel, VECTOR_STORAGE
+from utils.vector_codec import copy_literal, resolve_vector_storage, as_list
+
+
+class EmbeddingRepository:
+    """
+    Repository untuk document_embeddings (audit/backup vector di PostgreSQL)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.storage = resolve_vector_storage(VECTOR_STORAGE)
+
+    def bulk_insert(self, rows: Sequence[Tuple[int, Sequence[float]]]) -> int:
+        """
+        Insert banyak embedding sekaligus
+
+        PostgreSQL: COPY ... FROM STDIN dalam transaksi session
+        (commit tetap dilakukan oleh caller lewat db.commit())
+        Dialect lain: executemany via bulk_insert_mappings
+
+        Args:
+            rows: List of (chunk_id, vector)
+
+        Returns:
+            Jumlah row yang ditulis
+        """
+        if not rows:
+            return 0
+
+        connection = self.db.connection()
+
+        if connection.dialect.name != "postgresql":
+            self.db.bulk_insert_mappings(
+                EmbeddingModel,
+                [{"chunk_id": chunk_id, "vector": vector} for chunk_id, vector in rows]
+            )
+            return len(rows)
+
+        buffer = io.StringIO()
+        for chunk_id, vector in rows:
+            buffer.write(f"{chunk_id}\t{copy_literal(vector, self.storage)}\n")
+        buffer.seek(0)
+
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {EmbeddingModel.__tablename__} (chunk_id, vector) FROM STDIN",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+        return len(rows)
+
+    def delete_by_chunk_ids(self, chunk_ids: List[int]) -> int:
+        """Hapus embedding untuk chunk tertentu"""
+        return self.db.query(EmbeddingModel).filter(
+            EmbeddingModel.chunk_id.in_(chunk_ids)
+        ).delete(synchronize_session=False)
+
+    def get_matrix(self, chunk_ids: Optional[List[int]] = None) -> Tuple[List[int], np.ndarray]:
+        """
+        Ambil vector sebagai satu NumPy matrix (n, dimensions)
+
+        Mode bytea di-stack langsung dari buffer float32;
+        mode lain di-convert per row.
+        """
+        query = self.db.query(EmbeddingModel.chunk_id, EmbeddingModel.vector)
+        if chunk_ids is not None:
+            query = query.filter(EmbeddingModel.chunk_id.in_(chunk_ids))
+        rows = query.order_by(EmbeddingModel.chunk_id).all()
+
+        ids = [row[0] for row in rows]
+        if not rows:
+            return ids, np.empty((0, 0), dtype=np.float32)
+
+        if self.storage == "bytea":
+            # Float32Vector sudah mengembalikan ndarray (zero-copy per row)
+            return ids, np.vstack([row[1] for row in rows])
+
+        return ids, np.asarray([as_list(row[1]) for row in rows], dtype=np.float32)
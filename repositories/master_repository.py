@@ -1,10 +1,45 @@
+import json
 from typing import List
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from models.chunk import ChunkModel
+from models.embedding import EmbeddingModel
+from repositories.chunk_change_repository import ChunkChangeRepository, OP_DELETE, OP_METADATA, OP_UPSERT
+
+# Key posisi dari EnhancedChunker.chunk_with_metadata: berubah untuk semua
+# chunk setelah chunk yang ditambah/dihapus, bukan perubahan isi
+POSITIONAL_KEYS = ("chunk_index", "total_chunks", "chunk_id")
+
+
+def chunk_match_key(content: str, metadata: dict) -> tuple:
+    stable = {k: v for k, v in (metadata or {}).items() if k not in POSITIONAL_KEYS}
+    return content, json.dumps(stable, sort_keys=True, default=str)
+
+
 class MasterRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.changes = ChunkChangeRepository(db)
+
+    def _apply_chunk_changes(self, chunk: ChunkModel, content: str = None, metadata: dict = None) -> bool:
+        """
+        Update content/metadata; jika berubah, chunk kembali 'pending'
+        (vector lama basi) dan event upsert dicatat di change feed
+        """
+        changed = False
+        if content is not None and content != chunk.content:
+            chunk.content = content
+            changed = True
+        if metadata is not None and metadata != chunk.metadata_json:
+            chunk.metadata_json = metadata
+            changed = True
+
+        if changed:
+            chunk.status = "pending"
+            chunk.claimed_by = None
+            chunk.lease_expires_at = None
+            self.changes.record([chunk.id], OP_UPSERT)
+        return changed
 
     def get_jenjang(self) -> List[str]:
         result = self.db.execute(
@@ -48,10 +83,7 @@ class MasterRepository:
         if not chunk:
             return None
 
-        if content is not None:
-            chunk.content = content
-        if metadata is not None:
-            chunk.metadata_json = metadata
+        self._apply_chunk_changes(chunk, content=content, metadata=metadata)
         if filename is not None:
             chunk.filename = filename
 
@@ -64,7 +96,12 @@ class MasterRepository:
         chunk = self.get_chunk(chunk_id)
         if not chunk:
             return False
+        # Vector audit ikut dihapus (FK), vector Chroma lewat change feed
+        self.db.query(EmbeddingModel).filter(
+            EmbeddingModel.chunk_id == chunk_id
+        ).delete(synchronize_session=False)
         self.db.delete(chunk)
+        self.changes.record([chunk_id], OP_DELETE)
         self.db.commit()
         return True    
     
@@ -75,6 +112,59 @@ class MasterRepository:
             .all()
         )
         
+    def sync_chunks_for_filename(self, filename: str, chunks: list) -> dict:
+        """
+        Ganti chunk satu file dengan hasil chunking ulang (incremental)
+
+        chunks = [{"content": "...", "metadata": {...}}]
+        Chunk lama dicocokkan dengan content + metadata tanpa key posisi
+        (chunk_index, total_chunks, chunk_id): yang cocok dipertahankan
+        (vector tidak di-embed ulang, key posisi diperbarui lewat event
+        metadata), chunk baru ditambah, sisanya dihapus. Semua dalam satu
+        transaksi.
+        """
+        existing = {}
+        for chunk in self.get_chunks_by_filename(filename):
+            existing.setdefault(chunk_match_key(chunk.content, chunk.metadata_json), []).append(chunk)
+
+        kept, added, moved = [], [], []
+        try:
+            for item in chunks:
+                matches = existing.get(chunk_match_key(item["content"], item["metadata"]))
+                if not matches:
+                    chunk = ChunkModel(content=item["content"], metadata_json=item["metadata"], filename=filename)
+                    self.db.add(chunk)
+                    added.append(chunk)
+                    continue
+
+                chunk = matches.pop(0)
+                kept.append(chunk)
+                if chunk.metadata_json != item["metadata"]:
+                    chunk.metadata_json = item["metadata"]
+                    moved.append(chunk.id)
+
+            removed = [chunk.id for matches in existing.values() for chunk in matches]
+            if removed:
+                # Vector audit ikut dihapus (FK), vector Chroma lewat change feed
+                self.db.query(EmbeddingModel).filter(
+                    EmbeddingModel.chunk_id.in_(removed)
+                ).delete(synchronize_session=False)
+                self.db.query(ChunkModel).filter(
+                    ChunkModel.id.in_(removed)
+                ).delete(synchronize_session=False)
+                self.changes.record(removed, OP_DELETE)
+            self.changes.record(moved, OP_METADATA)
+
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        for chunk in added:
+            self.db.refresh(chunk)
+
+        return {"kept": kept, "added": added, "removed": removed}
+
     def bulk_update_chunks_by_filename(
         self,
         filename: str,
@@ -100,11 +190,11 @@ class MasterRepository:
             if not chunk:
                 continue
 
-            if item.get("content") is not None:
-                chunk.content = item["content"]
-
-            if item.get("metadata") is not None:
-                chunk.metadata_json = item["metadata"]
+            self._apply_chunk_changes(
+                chunk,
+                content=item.get("content"),
+                metadata=item.get("metadata")
+            )
 
             updated_count += 1
 
@@ -0,0 +1,36 @@
+"""
+Tambah kolom lease ke document_chunks (claim/lease embedding paralel)
+dan tabel chunk_change_feed (sinkronisasi edit/delete chunk ke Chroma)
+
+Contoh:
+    python run_chunk_lease_migration.py
+
+Idempotent: aman dijalankan berulang kali.
+"""
+
+from sqlalchemy import text
+
+from models.chunk_change import ChunkChangeModel
+from utils.db import engine
+
+TABLE = "document_chunks"
+
+STATEMENTS = [
+    f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS claimed_by VARCHAR(100)",
+    f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ",
+    # Claim query: status pending/embedding urut id
+    f"CREATE INDEX IF NOT EXISTS ix_{TABLE}_status_id ON {TABLE} (status, id)",
+]
+
+
+def main():
+    with engine.begin() as conn:
+        for statement in STATEMENTS:
+            print(f"▶️ {statement}")
+            conn.execute(text(statement))
+    ChunkChangeModel.__table__.create(bind=engine, checkfirst=True)
+    print(f"✅ {TABLE} siap untuk claim/lease embedding")
+
+
+if __name__ == "__main__":
+    main()
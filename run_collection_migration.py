@@ -0,0 +1,59 @@
+"""
+Migrasi embedding model tanpa downtime (shadow collection + flip)
+
+Contoh:
+    python run_collection_migration.py --model openai
+    python run_collection_migration.py --model onnx --rate-limit 50
+    python run_collection_migration.py --model openai --dimensions 512
+    python run_collection_migration.py --rollback
+
+Chatbot tetap dilayani collection lama sampai shadow collection
+terverifikasi, lalu pointer collection aktif di-flip atomik.
+Setelah selesai, set `embeddings.model` (dan dimensions) di config/config.yaml
+ke model baru.
+"""
+
+import argparse
+
+from core.config_loader import APP_CONFIG
+from services.collection_migration import CollectionMigration, rollback_active_collection
+
+
+def main():
+    embedding_cfg = APP_CONFIG["embeddings"]
+    migration_cfg = embedding_cfg.get("migration", {})
+
+    parser = argparse.ArgumentParser(description="Migrasi embedding model via shadow collection")
+    parser.add_argument("--model", choices=["openai", "huggingface", "onnx"])
+    parser.add_argument("--rate-limit", type=float, default=migration_cfg.get("rate_limit", 20))
+    parser.add_argument("--batch-size", type=int, default=migration_cfg.get("batch_size", 32))
+    parser.add_argument("--dimensions", type=int, help="Override embeddings.<model>.dimensions (OpenAI text-embedding-3-*)")
+    parser.add_argument("--shadow-name", help="Nama shadow collection (default: otomatis)")
+    parser.add_argument("--rollback", action="store_true", help="Kembali ke collection sebelum flip")
+    args = parser.parse_args()
+
+    if args.rollback:
+        state = rollback_active_collection()
+        print(f"↩️ Collection aktif: {state['collection']}")
+        return
+
+    if not args.model:
+        parser.error("--model wajib diisi (kecuali --rollback)")
+
+    target_cfg = {**embedding_cfg, "model": args.model}
+    if args.dimensions:
+        target_cfg[args.model] = {**embedding_cfg.get(args.model, {}), "dimensions": args.dimensions}
+
+    migration = CollectionMigration(
+        target_embedding_cfg=target_cfg,
+        batch_size=args.batch_size,
+        rate_limit=args.rate_limit,
+        shadow_name=args.shadow_name
+    )
+    status = migration.run()
+    if status["phase"] != "done":
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
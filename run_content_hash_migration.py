@@ -0,0 +1,35 @@
+"""
+Tambah kolom content hash untuk incremental ingestion (documents +
+document_pages) dan buat tabel document_pages jika belum ada
+
+Contoh:
+    python run_content_hash_migration.py
+
+Idempotent: aman dijalankan berulang kali.
+"""
+
+from sqlalchemy import text
+
+from models.document import DocumentPage
+from utils.db import engine
+
+STATEMENTS = [
+    "ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_sha256 VARCHAR(64)",
+    "CREATE INDEX IF NOT EXISTS ix_documents_content_sha256 ON documents (content_sha256)",
+    "ALTER TABLE document_pages ADD COLUMN IF NOT EXISTS content_sha256 VARCHAR(64)",
+    "ALTER TABLE document_pages ADD COLUMN IF NOT EXISTS knowledge_text TEXT",
+    "CREATE INDEX IF NOT EXISTS ix_document_pages_document_page ON document_pages (document_id, page_number)",
+]
+
+
+def main():
+    DocumentPage.__table__.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        for statement in STATEMENTS:
+            print(f"▶️ {statement}")
+            conn.execute(text(statement))
+    print("✅ documents / document_pages siap untuk incremental ingestion")
+
+
+if __name__ == "__main__":
+    main()
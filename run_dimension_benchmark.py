@@ -0,0 +1,172 @@
+"""
+Benchmark dimensi embedding OpenAI (native truncation text-embedding-3-*)
+
+Contoh:
+    python run_dimension_benchmark.py
+    python run_dimension_benchmark.py --dims 256 512 1024 1536 --sample 2000 --k 5
+    python run_dimension_benchmark.py --queries data/eval_questions.txt
+
+Langkah:
+1. Ambil sample dokumen dari collection aktif
+2. Re-index sample ke collection sementara per dimensi
+3. Jalankan query yang sama di setiap collection
+4. Laporkan recall@k terhadap baseline dimensi penuh, ukuran index,
+   dan latency search (p50/p95)
+
+Query default: kalimat pembuka dokumen sample (jika --queries tidak diisi).
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+import chromadb
+
+from core.config_loader import APP_CONFIG
+from core.vectorstore_registry import get_collection, get_collection_metadata
+from utils.embeddings import EmbeddingManager, EmbeddingModel, OPENAI_MAX_DIMENSIONS
+
+
+def dir_size_mb(path: str) -> float:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total / 1024 / 1024
+
+
+def load_sample(sample_size: int, seed: int) -> Dict[str, list]:
+    collection = get_collection()
+    data = collection.get(include=["documents", "metadatas"])
+    indices = list(range(len(data["ids"])))
+    random.Random(seed).shuffle(indices)
+    indices = indices[:sample_size]
+    return {
+        "ids": [data["ids"][i] for i in indices],
+        "documents": [data["documents"][i] for i in indices],
+        "metadatas": [data["metadatas"][i] for i in indices],
+    }
+
+
+def load_queries(path: str, sample: Dict[str, list], n_queries: int, seed: int) -> List[str]:
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+
+    docs = list(sample["documents"])
+    random.Random(seed + 1).shuffle(docs)
+    # Kalimat pembuka dokumen sebagai pseudo-query
+    return [doc.split(".")[0][:200] for doc in docs[:n_queries] if doc.strip()]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_dimension(
+    model_name: str,
+    dimensions: int,
+    sample: Dict[str, list],
+    queries: List[str],
+    k: int,
+    workdir: str
+) -> Dict:
+    manager = EmbeddingManager(
+        model_type=EmbeddingModel.OPENAI,
+        config={"model_name": model_name, "dimensions": dimensions}
+    )
+
+    start = time.time()
+    vectors = manager.embed_documents(sample["documents"])
+    embed_seconds = time.time() - start
+
+    path = os.path.join(workdir, f"dim_{dimensions}")
+    client = chromadb.PersistentClient(path=path)
+    collection = client.create_collection(
+        name=f"bench_{dimensions}",
+        metadata=get_collection_metadata(dimensions)
+    )
+
+    batch = 500
+    for i in range(0, len(vectors), batch):
+        collection.add(
+            ids=sample["ids"][i:i + batch],
+            embeddings=vectors[i:i + batch],
+            documents=sample["documents"][i:i + batch],
+            metadatas=sample["metadatas"][i:i + batch]
+        )
+
+    query_vectors = manager.get_embeddings().embed_documents(queries)
+    latencies = []
+    results = []
+    for query_vector in query_vectors:
+        t0 = time.perf_counter()
+        res = collection.query(query_embeddings=[query_vector], n_results=k, include=[])
+        latencies.append((time.perf_counter() - t0) * 1000)
+        results.append(res["ids"][0])
+
+    return {
+        "dimensions": dimensions,
+        "results": results,
+        "index_mb": dir_size_mb(path),
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": percentile(latencies, 95),
+        "embed_seconds": embed_seconds,
+    }
+
+
+def recall_at_k(results: List[List[str]], baseline: List[List[str]], k: int) -> float:
+    scores = [
+        len(set(got[:k]) & set(expected[:k])) / max(1, min(k, len(expected)))
+        for got, expected in zip(results, baseline)
+    ]
+    return sum(scores) / max(1, len(scores))
+
+
+def main():
+    openai_cfg = APP_CONFIG["embeddings"]["openai"]
+    model_name = openai_cfg["model_name"]
+    full_dims = OPENAI_MAX_DIMENSIONS.get(model_name, openai_cfg.get("dimensions", 1536))
+
+    parser = argparse.ArgumentParser(description="Recall/latency/size per dimensi embedding")
+    parser.add_argument("--dims", type=int, nargs="+", default=[256, 512, full_dims])
+    parser.add_argument("--sample", type=int, default=1000, help="Jumlah dokumen sample")
+    parser.add_argument("--queries", help="File query (satu per baris)")
+    parser.add_argument("--n-queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    dims = sorted(set(args.dims) | {full_dims})
+
+    sample = load_sample(args.sample, args.seed)
+    queries = load_queries(args.queries, sample, args.n_queries, args.seed)
+    print(f"📊 {model_name}: {len(sample['ids'])} dokumen, {len(queries)} query, k={args.k}")
+
+    workdir = tempfile.mkdtemp(prefix="dim_bench_")
+    try:
+        reports = {d: run_dimension(model_name, d, sample, queries, args.k, workdir) for d in dims}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = reports[full_dims]["results"]
+
+    print(f"\n{'dims':>6} | {'recall@' + str(args.k):>9} | {'index MB':>9} | {'p50 ms':>7} | {'p95 ms':>7} | {'embed s':>7}")
+    print("-" * 62)
+    for d in dims:
+        r = reports[d]
+        print(
+            f"{d:>6} | {recall_at_k(r['results'], baseline, args.k):>9.3f} | {r['index_mb']:>9.1f} | "
+            f"{r['p50_ms']:>7.2f} | {r['p95_ms']:>7.2f} | {r['embed_seconds']:>7.1f}"
+        )
+    print(f"\nBaseline recall dihitung terhadap {full_dims} dims. "
+          f"Ganti dimensi: python run_collection_migration.py --model openai --dimensions <N>")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Buat tabel document_jobs (antrian proses dokumen di background)
+
+Contoh:
+    python run_document_job_migration.py
+
+Idempotent: aman dijalankan berulang kali.
+"""
+
+from sqlalchemy import text
+
+from models.document_job import DocumentJobModel
+from utils.db import engine
+
+TABLE = "document_jobs"
+
+STATEMENTS = [
+    # Claim query: job queued / lease kedaluwarsa urut id
+    f"CREATE INDEX IF NOT EXISTS ix_{TABLE}_status_id ON {TABLE} (status, id)",
+]
+
+
+def main():
+    DocumentJobModel.__table__.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        for statement in STATEMENTS:
+            print(f"▶️ {statement}")
+            conn.execute(text(statement))
+    print(f"✅ {TABLE} siap untuk antrian proses dokumen")
+
+
+if __name__ == "__main__":
+    main()
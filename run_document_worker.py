@@ -0,0 +1,38 @@
+"""
+Worker antrian proses dokumen (CLI)
+
+Contoh:
+    python run_document_worker.py
+    python run_document_worker.py --concurrency 4
+
+Memproses job dari document_jobs (POST /api/documents/{id}/process) di luar
+proses API, mis. di server terpisah; set document_processing.jobs.autostart
+ke false jika API tidak perlu ikut memproses. Beberapa worker boleh jalan
+bersamaan: job di-claim dengan lease, tidak ada dokumen yang diproses dua kali.
+"""
+
+import argparse
+import time
+
+from api.document_router import get_document_job_queue, jobs_cfg
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proses job dokumen di background")
+    parser.add_argument("--concurrency", type=int, default=jobs_cfg.get("concurrency", 2))
+    args = parser.parse_args()
+
+    queue = get_document_job_queue()
+    queue.concurrency = max(1, args.concurrency)
+    queue.start()
+
+    try:
+        while queue.is_running():
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n⏹️ Menunggu job yang sedang berjalan selesai...")
+        queue.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Background embedding worker (CLI)
+
+Contoh:
+    python run_embedding_worker.py --once
+    python run_embedding_worker.py --batch-size 128 --max-in-flight 4
+    python run_embedding_worker.py --reset-checkpoint
+
+Embed semua chunk berstatus 'pending' secara streaming (fetch → embed → write),
+menyimpan checkpoint setelah tiap batch, dan melaporkan throughput chunks/s.
+Aman di-restart: batch yang terputus diulang tanpa duplikat.
+"""
+
+import argparse
+
+from api.embeding import embedding_cfg, get_embedding_worker
+
+
+def main():
+    worker_cfg = embedding_cfg.get("worker", {})
+
+    parser = argparse.ArgumentParser(description="Embed chunk pending di background")
+    parser.add_argument("--batch-size", type=int, default=worker_cfg.get("batch_size", 64))
+    parser.add_argument("--max-in-flight", type=int, default=worker_cfg.get("max_in_flight", 2))
+    parser.add_argument("--once", action="store_true", help="Berhenti setelah chunk pending habis")
+    parser.add_argument("--reset-checkpoint", action="store_true", help="Mulai ulang dari chunk id terkecil")
+    args = parser.parse_args()
+
+    worker = get_embedding_worker()
+    worker.batch_size = max(1, args.batch_size)
+    worker.max_in_flight = max(1, args.max_in_flight)
+
+    if args.reset_checkpoint:
+        worker.checkpoint.reset()
+
+    try:
+        worker.run(once=args.once)
+    except KeyboardInterrupt:
+        print("\n⏹️ Dihentikan, progress tersimpan di checkpoint")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Sweep parameter HNSW Chroma pada collection aktif
+
+Contoh:
+    python run_hnsw_tuning.py
+    python run_hnsw_tuning.py --M 8 16 32 --construction-ef 100 200 --search-ef 10 50 100 200
+    python run_hnsw_tuning.py --filter-key jenjang --queries data/eval_questions.txt
+
+Langkah:
+1. Ambil semua vector + metadata dari collection aktif
+2. Ground truth top-k dengan brute-force cosine (NumPy), opsional dengan
+   filter metadata (mis. jenjang) supaya mirip query kecil ber-filter
+3. Untuk setiap kombinasi M × construction_ef × search_ef: build
+   collection sementara, ukur waktu build, ukuran index, recall@k,
+   dan latency p50/p95
+4. Cetak tabel + konfigurasi tercepat yang memenuhi --min-recall
+
+Hasil terbaik ditulis manual ke vectordb.chroma.hnsw di config.yaml.
+"""
+
+import argparse
+import itertools
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import chromadb
+import numpy as np
+
+from core.config_loader import APP_CONFIG
+from core.vectorstore_registry import get_collection, get_collection_metadata, get_embeddings
+
+
+def dir_size_mb(path: str) -> float:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total / 1024 / 1024
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def load_corpus() -> Dict:
+    data = get_collection().get(include=["embeddings", "documents", "metadatas"])
+    matrix = np.asarray(data["embeddings"], dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return {
+        "ids": list(data["ids"]),
+        "embeddings": data["embeddings"],
+        "documents": data["documents"],
+        "metadatas": data["metadatas"],
+        "normalized": matrix / np.clip(norms, 1e-12, None),
+    }
+
+
+def build_queries(corpus: Dict, path: Optional[str], n_queries: int, filter_key: Optional[str], seed: int) -> List[Dict]:
+    rng = random.Random(seed)
+    indices = rng.sample(range(len(corpus["ids"])), min(n_queries, len(corpus["ids"])))
+
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        # Kalimat pembuka dokumen sebagai pseudo-query
+        texts = [corpus["documents"][i].split(".")[0][:200] for i in indices]
+
+    vectors = get_embeddings().embed_documents(texts)
+
+    queries = []
+    for n, (text, vector) in enumerate(zip(texts, vectors)):
+        where = None
+        if filter_key:
+            meta = corpus["metadatas"][indices[n % len(indices)]] or {}
+            if meta.get(filter_key) is not None:
+                where = {filter_key: meta[filter_key]}
+        queries.append({"text": text, "vector": vector, "where": where})
+    return queries
+
+
+def ground_truth(corpus: Dict, queries: List[Dict], k: int) -> List[List[str]]:
+    """Top-k exact (cosine) dengan filter yang sama"""
+    truth = []
+    for query in queries:
+        q = np.asarray(query["vector"], dtype=np.float32)
+        q /= max(np.linalg.norm(q), 1e-12)
+        scores = corpus["normalized"] @ q
+
+        if query["where"]:
+            (key, value), = query["where"].items()
+            mask = np.array([(m or {}).get(key) == value for m in corpus["metadatas"]])
+            scores = np.where(mask, scores, -np.inf)
+
+        top = np.argsort(-scores)[:k]
+        truth.append([corpus["ids"][i] for i in top if np.isfinite(scores[i])])
+    return truth
+
+
+def run_config(corpus: Dict, queries: List[Dict], truth: List[List[str]], params: Dict, k: int, workdir: str) -> Dict:
+    path = os.path.join(workdir, "M{M}_cef{construction_ef}_sef{search_ef}".format(**params))
+    client = chromadb.PersistentClient(path=path)
+    collection = client.create_collection(
+        name="hnsw_tuning",
+        metadata=get_collection_metadata(len(corpus["embeddings"][0]), hnsw_cfg=params)
+    )
+
+    start = time.time()
+    batch = 1000
+    for i in range(0, len(corpus["ids"]), batch):
+        collection.add(
+            ids=corpus["ids"][i:i + batch],
+            embeddings=corpus["embeddings"][i:i + batch],
+            metadatas=corpus["metadatas"][i:i + batch]
+        )
+    build_seconds = time.time() - start
+
+    latencies = []
+    recalls = []
+    for query, expected in zip(queries, truth):
+        t0 = time.perf_counter()
+        res = collection.query(
+            query_embeddings=[query["vector"]],
+            n_results=k,
+            where=query["where"],
+            include=[]
+        )
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if expected:
+            recalls.append(len(set(res["ids"][0]) & set(expected)) / len(expected))
+
+    index_mb = dir_size_mb(path)
+    del collection, client
+    shutil.rmtree(path, ignore_errors=True)
+
+    return {
+        **params,
+        "recall": sum(recalls) / max(1, len(recalls)),
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": percentile(latencies, 95),
+        "build_s": build_seconds,
+        "index_mb": index_mb,
+    }
+
+
+def main():
+    hnsw_cfg = APP_CONFIG["vectordb"]["chroma"].get("hnsw", {})
+
+    parser = argparse.ArgumentParser(description="Sweep parameter HNSW (recall vs latency vs memory)")
+    parser.add_argument("--M", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--construction-ef", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--search-ef", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", help="File query (satu per baris)")
+    parser.add_argument("--n-queries", type=int, default=200)
+    parser.add_argument("--filter-key", help="Metadata key untuk query ber-filter (mis. jenjang)")
+    parser.add_argument("--min-recall", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    if not corpus["ids"]:
+        raise SystemExit("Collection aktif kosong")
+
+    queries = build_queries(corpus, args.queries, args.n_queries, args.filter_key, args.seed)
+    truth = ground_truth(corpus, queries, args.k)
+    print(f"📊 {len(corpus['ids'])} vectors, {len(queries)} query, k={args.k}, filter={args.filter_key or '-'}")
+
+    workdir = tempfile.mkdtemp(prefix="hnsw_tuning_")
+    results = []
+    try:
+        for M, cef, sef in itertools.product(args.M, args.construction_ef, args.search_ef):
+            params = {
+                "M": M,
+                "construction_ef": cef,
+                "search_ef": sef,
+                "num_threads": hnsw_cfg.get("num_threads", 4),
+                "batch_size": hnsw_cfg.get("batch_size", 100),
+                "sync_threshold": hnsw_cfg.get("sync_threshold", 1000),
+            }
+            result = run_config(corpus, queries, truth, params, args.k, workdir)
+            results.append(result)
+            print(f"   ✓ M={M} cef={cef} sef={sef}: recall={result['recall']:.3f} p95={result['p95_ms']:.2f}ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n{'M':>4} | {'c_ef':>5} | {'s_ef':>5} | {'recall@' + str(args.k):>9} | {'p50 ms':>7} | {'p95 ms':>7} | {'build s':>7} | {'index MB':>8}")
+    print("-" * 76)
+    for r in results:
+        print(
+            f"{r['M']:>4} | {r['construction_ef']:>5} | {r['search_ef']:>5} | {r['recall']:>9.3f} | "
+            f"{r['p50_ms']:>7.2f} | {r['p95_ms']:>7.2f} | {r['build_s']:>7.1f} | {r['index_mb']:>8.1f}"
+        )
+
+    eligible = [r for r in results if r["recall"] >= args.min_recall]
+    if eligible:
+        best = min(eligible, key=lambda r: (r["p95_ms"], r["index_mb"]))
+        print(f"\n✅ Tercepat dengan recall ≥ {args.min_recall}: "
+              f"M={best['M']} construction_ef={best['construction_ef']} search_ef={best['search_ef']}")
+    else:
+        print(f"\n⚠️ Tidak ada konfigurasi dengan recall ≥ {args.min_recall}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Arsipkan chunk tahun ajaran lampau dari collection aktif
+
+Contoh:
+    python run_kb_archive.py --dry-run
+    python run_kb_archive.py --keep-years 2
+
+Chunk dengan metadata tahun < tahun ajaran berjalan - keep_years + 1
+dipindah ke <collection_name>__archive_<tahun> (tanpa embed ulang).
+Retriever membuka arsip hanya jika query menyebut tahun tersebut.
+Jalankan setelah tahun ajaran berganti (mis. cron bulanan).
+"""
+
+import argparse
+import json
+
+from services.kb_archive_service import KnowledgeBaseArchive, current_academic_year
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arsip knowledge base per tahun ajaran")
+    parser.add_argument("--keep-years", type=int, default=None,
+                        help="Tahun ajaran yang tetap aktif (default: retrieval.archive.keep_years)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Laporkan tanpa memindah")
+    args = parser.parse_args()
+
+    archive = KnowledgeBaseArchive(batch_size=args.batch_size, keep_years=args.keep_years)
+    print(f"📅 Tahun ajaran berjalan: {current_academic_year()}, arsip < {archive.cutoff_year()}")
+
+    report = archive.run(dry_run=args.dry_run)
+
+    print(json.dumps(report, indent=2))
+    total = sum(report["archived"].values())
+    print(f"{'🔍' if args.dry_run else '✅'} {total} chunk {'akan diarsip' if args.dry_run else 'diarsip'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Export sentence-transformer ke ONNX lalu quantize ke int8 (dynamic)
+
+Contoh:
+    python run_onnx_export.py
+    python run_onnx_export.py --model sentence-transformers/all-MiniLM-L6-v2 \\
+        --output ./models_onnx/all-MiniLM-L6-v2-int8
+
+Hanya dibutuhkan sekali saat build (butuh `optimum[onnxruntime]`);
+runtime backend `embeddings.model: onnx` cukup onnxruntime + tokenizers.
+"""
+
+import argparse
+import os
+import shutil
+import time
+
+from core.config_loader import APP_CONFIG
+
+
+def export(model_name: str, output_dir: str) -> None:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoTokenizer
+
+    tmp_dir = f"{output_dir}.fp32"
+    start = time.time()
+
+    print(f"📦 Export {model_name} → ONNX (fp32)")
+    model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+    model.save_pretrained(tmp_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(tmp_dir)
+
+    os.makedirs(output_dir, exist_ok=True)
+    print("🔧 Quantize dynamic int8 (weights QInt8)")
+    quantize_dynamic(
+        model_input=os.path.join(tmp_dir, "model.onnx"),
+        model_output=os.path.join(output_dir, "model_quantized.onnx"),
+        weight_type=QuantType.QInt8
+    )
+    shutil.copy(os.path.join(tmp_dir, "tokenizer.json"), output_dir)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    size_mb = os.path.getsize(os.path.join(output_dir, "model_quantized.onnx")) / 1024 / 1024
+    print(f"✅ Selesai dalam {time.time() - start:.1f}s: {output_dir} ({size_mb:.1f} MB)")
+
+
+def main():
+    onnx_cfg = APP_CONFIG["embeddings"].get("onnx", {})
+
+    parser = argparse.ArgumentParser(description="Export embedding model ke ONNX int8")
+    parser.add_argument("--model", default=onnx_cfg.get("model_name", "sentence-transformers/all-MiniLM-L6-v2"))
+    parser.add_argument("--output", default=onnx_cfg.get("model_path", "./models_onnx/all-MiniLM-L6-v2-int8"))
+    args = parser.parse_args()
+
+    export(args.model, args.output)
+
+
+if __name__ == "__main__":
+    main()
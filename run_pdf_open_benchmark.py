@@ -0,0 +1,83 @@
+"""
+Benchmark open PDF per halaman vs satu handle per run (services/pdf_document.py)
+
+Contoh:
+    python run_pdf_open_benchmark.py
+    python run_pdf_open_benchmark.py --pdf data/pdfs/SK.pdf --repeat 5
+
+Yang diukur = pola akses extractor (PDFExtractor, EnhancedPDFExtractor,
+Ollama/LangChain) untuk tabel + image per halaman:
+- per_page_open: pdfplumber.open() + fitz.open() di setiap halaman (pola lama)
+- shared_handle: PDFDocument dibuka sekali, iterasi per halaman
+Tanpa OCR / LLM supaya yang terlihat hanya biaya parsing file.
+"""
+
+import argparse
+import statistics
+import time
+
+import fitz  # PyMuPDF
+import pdfplumber
+
+from services.pdf_document import PDFDocument
+
+
+def per_page_open(pdf_path: str) -> int:
+    with fitz.open(pdf_path) as doc:
+        total_pages = len(doc)
+
+    found = 0
+    for page_num in range(total_pages):
+        with pdfplumber.open(pdf_path) as pdf:
+            found += len(pdf.pages[page_num].extract_tables())
+        doc = fitz.open(pdf_path)
+        found += len(doc[page_num].get_images())
+        doc.close()
+    return found
+
+
+def shared_handle(pdf_path: str) -> int:
+    found = 0
+    with PDFDocument(pdf_path) as document:
+        for page_num in range(len(document)):
+            found += len(document.plumber_page(page_num).extract_tables())
+            found += len(document.fitz[page_num].get_images())
+            document.release_page(page_num)
+    return found
+
+
+def measure(fn, pdf_path: str, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = fn(pdf_path)
+        timings.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(timings), "min_s": min(timings), "found": found}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark open PDF per halaman vs handle bersama")
+    parser.add_argument("--pdf", default="CS-v2.pdf")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with fitz.open(args.pdf) as doc:
+        total_pages = len(doc)
+    print(f"📄 {args.pdf}: {total_pages} halaman, repeat={args.repeat}")
+
+    results = {
+        "per_page_open": measure(per_page_open, args.pdf, args.repeat),
+        "shared_handle": measure(shared_handle, args.pdf, args.repeat),
+    }
+    assert results["per_page_open"]["found"] == results["shared_handle"]["found"], "Hasil ekstraksi berbeda"
+
+    print(f"\n{'mode':<16}{'median (s)':>12}{'min (s)':>10}{'tabel+image':>14}")
+    for mode, result in results.items():
+        print(f"{mode:<16}{result['median_s']:>12.3f}{result['min_s']:>10.3f}{result['found']:>14}")
+
+    speedup = results["per_page_open"]["median_s"] / max(results["shared_handle"]["median_s"], 1e-9)
+    print(f"\n⚡ Speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Migrasi kolom document_embeddings.vector ke format penyimpanan lain
+
+Contoh:
+    python run_vector_migration.py --target bytea
+    python run_vector_migration.py --target pgvector --batch-size 2000
+
+Langkah:
+1. Tambah kolom sementara vector_new dengan tipe target
+2. Konversi row per batch (keyset by id, bisa di-resume jika terhenti)
+3. Verifikasi semua row terkonversi
+4. Swap kolom (drop lama, rename baru) dalam satu transaksi
+
+Setelah selesai, set `database.vector_storage` di config.yaml ke target.
+
+pgvector memakai kolom `vector` tanpa dimensi (model dengan dimensi lain
+bisa ditulis tanpa migrasi kolom). Kolom vector(n) dari versi sebelumnya
+dilepas batas dimensinya dengan: --target pgvector
+"""
+
+import argparse
+import json
+import time
+
+from sqlalchemy import text
+
+from utils.db import engine
+from utils.vector_codec import (
+    VECTOR_STORAGE_MODES,
+    decode_float32,
+    encode_float32,
+    to_pgvector_text
+)
+
+TABLE = "document_embeddings"
+
+
+def current_storage(conn) -> str:
+    """Deteksi tipe kolom vector saat ini"""
+    row = conn.execute(text(
+        "SELECT data_type, udt_name FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = 'vector'"
+    ), {"table": TABLE}).fetchone()
+
+    if row is None:
+        raise RuntimeError(f"Kolom {TABLE}.vector tidak ditemukan")
+
+    data_type, udt_name = row
+    if data_type in ("json", "jsonb"):
+        return "json"
+    if data_type == "bytea":
+        return "bytea"
+    if udt_name == "vector":
+        return "pgvector"
+    raise RuntimeError(f"Tipe kolom tidak dikenali: {data_type}/{udt_name}")
+
+
+def column_ddl(target: str) -> str:
+    if target == "bytea":
+        return "BYTEA"
+    if target == "pgvector":
+        return "vector"
+    return "JSON"
+
+
+def read_vector(value) -> list:
+    """Decode nilai kolom lama (json list, bytea, atau text pgvector)"""
+    if isinstance(value, (bytes, memoryview)):
+        return decode_float32(bytes(value)).tolist()
+    if isinstance(value, str):
+        return json.loads(value)
+    return list(value)
+
+
+def write_param(vector: list, target: str):
+    if target == "bytea":
+        return encode_float32(vector)
+    if target == "pgvector":
+        return to_pgvector_text(vector)
+    return json.dumps(vector)
+
+
+def migrate(target: str, batch_size: int = 1000) -> None:
+    with engine.begin() as conn:
+        source = current_storage(conn)
+        print(f"📦 {TABLE}.vector: {source} → {target}")
+
+        if source == target == "pgvector":
+            # vector(n) → vector: tanpa rewrite data, hanya batas dimensi dilepas
+            conn.execute(text(f"ALTER TABLE {TABLE} ALTER COLUMN vector TYPE vector"))
+            print("✅ Sudah pgvector; batas dimensi kolom dilepas (vector)")
+            return
+
+        if source == target:
+            print("✅ Sudah dalam format target, tidak ada yang dimigrasi")
+            return
+
+        if target == "pgvector":
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+
+        conn.execute(text(
+            f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS vector_new {column_ddl(target)}"
+        ))
+
+    cast = {"bytea": ":vector", "pgvector": "CAST(:vector AS vector)", "json": "CAST(:vector AS json)"}[target]
+    update_sql = text(f"UPDATE {TABLE} SET vector_new = {cast} WHERE id = :id")
+
+    converted = 0
+    last_id = 0
+    start = time.time()
+
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(text(
+                f"SELECT id, vector FROM {TABLE} "
+                f"WHERE id > :last_id AND vector_new IS NULL ORDER BY id LIMIT :limit"
+            ), {"last_id": last_id, "limit": batch_size}).fetchall()
+
+            if not rows:
+                break
+
+            conn.execute(update_sql, [
+                {"id": row_id, "vector": write_param(read_vector(value), target)}
+                for row_id, value in rows
+            ])
+
+        last_id = rows[-1][0]
+        converted += len(rows)
+        print(f"   ✓ {converted} rows ({converted / (time.time() - start):.0f} rows/s)")
+
+    with engine.begin() as conn:
+        remaining = conn.execute(text(
+            f"SELECT COUNT(*) FROM {TABLE} WHERE vector_new IS NULL AND vector IS NOT NULL"
+        )).scalar()
+
+        if remaining:
+            raise RuntimeError(f"{remaining} rows belum terkonversi, swap dibatalkan")
+
+        conn.execute(text(f"ALTER TABLE {TABLE} DROP COLUMN vector"))
+        conn.execute(text(f"ALTER TABLE {TABLE} RENAME COLUMN vector_new TO vector"))
+        conn.execute(text(f"ALTER TABLE {TABLE} ALTER COLUMN vector SET NOT NULL"))
+
+    print(f"✅ Migrasi selesai: {converted} rows dalam {time.time() - start:.1f}s")
+    print(f"   Set `database.vector_storage: \"{target}\"` di config/config.yaml")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrasi format penyimpanan vector embedding")
+    parser.add_argument("--target", choices=VECTOR_STORAGE_MODES, required=True)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    migrate(args.target, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Reconcile document_chunks (PostgreSQL) ↔ ChromaDB
+
+Contoh:
+    python run_vector_reconciler.py --dry-run
+    python run_vector_reconciler.py --batch-size 1000
+
+Langkah:
+1. Pastikan tabel chunk_change_feed ada, proses event yang tertinggal
+2. Chunk 'embedded' yang hilang / content hash atau metadata berbeda
+   di Chroma → kembali 'pending' lalu di-embed ulang
+3. Vector Chroma tanpa chunk di PostgreSQL (orphan) → dihapus
+
+--dry-run hanya melaporkan selisih tanpa mengubah apa pun.
+"""
+
+import argparse
+import json
+
+from api.embeding import get_embedding_service
+from models.chunk_change import ChunkChangeModel
+from services.chunk_sync_service import ChunkSyncService
+from services.vector_reconciler import VectorReconciler
+from utils.db import SessionLocal, engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile PostgreSQL ↔ ChromaDB")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Laporkan selisih tanpa memperbaiki")
+    args = parser.parse_args()
+
+    ChunkChangeModel.__table__.create(bind=engine, checkfirst=True)
+
+    service = get_embedding_service()
+    db = SessionLocal()
+    try:
+        if not args.dry_run:
+            synced = ChunkSyncService(db, service).drain_changes(args.batch_size)
+            print(f"🔄 Change feed: {synced}")
+
+        report = VectorReconciler(db, service, batch_size=max(1, args.batch_size)).run(dry_run=args.dry_run)
+    finally:
+        db.close()
+
+    print(json.dumps(report, indent=2))
+    print(f"{'🔍' if args.dry_run else '✅'} missing={report['missing']} "
+          f"stale={report['stale']} orphans={report['orphans']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -77,5 +77,27 @@ class DocumentProcessResponse(BaseModel):
     tables_count: Optional[int]
     images_count: Optional[int]
     
+class DocumentJobResponse(BaseModel):
+    id: int
+    document_id: int
+    status: str  # queued, running, completed, failed, cancelled
+    stage: str  # queued, extract, rewrite, save, done
+    progress: float  # 0-1
+    message: Optional[str]
+    error_message: Optional[str]
+    result: Optional[Dict[str, Any]]
+    cancel_requested: bool
+    attempts: int
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+class DocumentJobQueueStatus(BaseModel):
+    running: bool
+    worker_id: str
+    concurrency: int
+    active_jobs: Dict[int, int]  # job_id → document_id
+    jobs: Dict[str, int]
+
 class DocumentRawTextUpdateRequest(BaseModel):
     raw_text: str = Field(..., description="Updated raw text content")    
\ No newline at end of file
@@ -0,0 +1,152 @@
+# app/services/chunk_sync_service.py
+"""
+Sinkronisasi document_chunks (PostgreSQL) → ChromaDB
+
+- process_changes(): konsumsi chunk_change_feed yang ditulis MasterRepository
+  (update/delete/bulk update). Delete → hapus vector Chroma + audit;
+  upsert → re-embed hanya chunk yang berubah; metadata → metadata vector
+  diperbarui dengan vector yang sudah tersimpan (tanpa embed). Salinan di arsip tahun
+  lampau (kb_archive_service) ikut dihapus; chunk yang di-edit masuk
+  collection aktif lagi sampai archive job berikutnya.
+- reembed(): claim (lease) lalu embed chunk tertentu; chunk yang sedang
+  dipegang worker lain dilewati (worker itu yang menyelesaikan).
+"""
+
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from models.chunk import ChunkModel
+from repositories.chunk_change_repository import ChunkChangeRepository, OP_DELETE, OP_METADATA, OP_UPSERT
+from repositories.chunk_lease_repository import ChunkLeaseRepository, STATUS_EMBEDDED, STATUS_PENDING
+from repositories.embedding_repository import EmbeddingRepository
+from services.embedding_service import EmbeddingService, sanitize_metadata
+from services.kb_archive_service import KnowledgeBaseArchive
+
+
+class ChunkSyncService:
+
+    def __init__(self, db: Session, embedding_service: EmbeddingService, lease_seconds: int = 300):
+        self.db = db
+        self.embedding_service = embedding_service
+        self.lease_seconds = lease_seconds
+
+    def delete_vectors(self, chunk_ids: List[int]) -> None:
+        """Hapus vector Chroma + audit PostgreSQL (caller commit)"""
+        if not chunk_ids:
+            return
+        self.embedding_service.vectorstore.delete(ids=[str(cid) for cid in chunk_ids])
+        EmbeddingRepository(self.db).delete_by_chunk_ids(chunk_ids)
+
+    def refresh_metadata(self, chunk_ids: List[int]) -> List[int]:
+        """
+        Tulis ulang metadata vector chunk 'embedded' memakai vector yang
+        sudah ada di vector store (caller commit)
+
+        Returns:
+            Id chunk yang vector-nya tidak ditemukan (perlu di-embed ulang)
+        """
+        chunks = (
+            self.db.query(ChunkModel)
+            .filter(ChunkModel.id.in_(chunk_ids), ChunkModel.status == STATUS_EMBEDDED)
+            .all()
+        )
+        if not chunks:
+            return []
+
+        stored = self.embedding_service.vectorstore.get(
+            ids=[str(chunk.id) for chunk in chunks],
+            include=["embeddings"]
+        )
+        vectors = dict(zip(stored["ids"], stored["embeddings"]))
+
+        found = [chunk for chunk in chunks if str(chunk.id) in vectors]
+        if found:
+            metadatas = []
+            for chunk in found:
+                metadata = sanitize_metadata(chunk.metadata_json or {})
+                metadata["chunk_id"] = chunk.id  # sama dengan EmbeddingService.write_batch
+                metadatas.append(metadata)
+            self.embedding_service.upsert_vectors(
+                [str(chunk.id) for chunk in found],
+                [list(vectors[str(chunk.id)]) for chunk in found],
+                [chunk.content for chunk in found],
+                metadatas
+            )
+
+        missing = [chunk.id for chunk in chunks if str(chunk.id) not in vectors]
+        if missing:
+            self.db.query(ChunkModel).filter(ChunkModel.id.in_(missing)).update(
+                {ChunkModel.status: STATUS_PENDING}, synchronize_session=False
+            )
+        return missing
+
+    def reembed(self, chunk_ids: List[int], batch_size: int = 64) -> int:
+        """Re-embed chunk tertentu lewat claim/lease"""
+        embedded = 0
+        leases = ChunkLeaseRepository(self.db, lease_seconds=self.lease_seconds)
+
+        for i in range(0, len(chunk_ids), batch_size):
+            token = leases.new_token()
+            chunks = leases.claim(batch_size, token=token, chunk_ids=chunk_ids[i:i + batch_size])
+            if not chunks:
+                continue
+            try:
+                embedded += self.embedding_service.embed_chunks(self.db, chunks, claim_token=token)
+            except Exception as e:
+                self.db.rollback()
+                leases.release([chunk.id for chunk in chunks], token)
+                # Tetap 'pending': diambil embedding worker berikutnya
+                print(f"⚠️ Re-embed {len(chunks)} chunk gagal: {e}")
+
+        return embedded
+
+    def process_changes(self, limit: int = 500) -> Dict[str, int]:
+        """
+        Proses satu batch change feed
+
+        Returns:
+            {"events", "deleted", "reembedded"}
+        """
+        changes = ChunkChangeRepository(self.db)
+        events = changes.claim_pending(limit)
+        if not events:
+            self.db.commit()
+            return {"events": 0, "deleted": 0, "reembedded": 0}
+
+        # Event terakhir per chunk yang menentukan (upsert lalu delete = delete);
+        # metadata tidak menurunkan upsert yang belum diproses
+        latest: Dict[int, str] = {}
+        for event in events:
+            if event.operation == OP_METADATA and latest.get(event.chunk_id) == OP_UPSERT:
+                continue
+            latest[event.chunk_id] = event.operation
+
+        deletes = [cid for cid, op in latest.items() if op == OP_DELETE]
+        upserts = [cid for cid, op in latest.items() if op == OP_UPSERT]
+        metadata_only = [cid for cid, op in latest.items() if op == OP_METADATA]
+
+        # Delete idempotent: jika crash sebelum commit, event diproses ulang
+        self.delete_vectors(deletes)
+        # Metadata idempotent; vector yang hilang → embed ulang
+        upserts += self.refresh_metadata(metadata_only) if metadata_only else []
+        # Salinan arsip basi untuk delete maupun edit
+        KnowledgeBaseArchive().delete_archived([str(cid) for cid in deletes + upserts])
+        changes.mark_processed([event.id for event in events])
+        self.db.commit()
+
+        # Chunk yang di-update sudah 'pending' (MasterRepository), jadi jika
+        # re-embed di sini gagal, embedding worker tetap mengambilnya
+        reembedded = self.reembed(sorted(upserts)) if upserts else 0
+
+        return {"events": len(events), "deleted": len(deletes), "reembedded": reembedded}
+
+    def drain_changes(self, limit: int = 500) -> Dict[str, int]:
+        """Proses change feed sampai kosong"""
+        total = {"events": 0, "deleted": 0, "reembedded": 0}
+        while True:
+            result = self.process_changes(limit)
+            for key in total:
+                total[key] += result[key]
+            if result["events"] < limit:
+                return total
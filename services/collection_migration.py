@@ -0,0 +1,266 @@
+# app/services/collection_migration.py
+"""
+Zero-downtime Embedding Model Migration
+
+Ganti embedding model (mis. MiniLM → text-embedding-3-small) tanpa
+chatbot melayani hasil rusak:
+
+1. build     : copy semua dokumen dari collection aktif ke shadow collection,
+               di-embed dengan model baru, dengan rate limit (chunks/s)
+2. catch-up  : bandingkan id source vs shadow, embed yang belum ada
+               (chunk baru selama build) & hapus yang sudah dihapus di source
+3. verify    : jumlah & id source == shadow
+4. flip      : pointer collection aktif diganti atomik (registry)
+5. post-flip : satu catch-up terakhir untuk write yang masuk sebelum flip
+
+Selama 1–3 semua query & write tetap ke collection lama.
+Collection lama tidak dihapus (bisa rollback).
+"""
+
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from core.vectorstore_registry import (
+    get_active_state,
+    get_vector_store,
+    set_active_collection
+)
+from services.embedding_service import EmbeddingService
+from utils.embeddings import EmbeddingManager
+
+
+class MigrationCancelled(Exception):
+    pass
+
+
+class CollectionMigration:
+    """
+    Migrasi collection aktif ke embedding config baru via shadow collection
+
+    Args:
+        target_embedding_cfg: Section `embeddings` baru (embeddings.model = target)
+        batch_size: Dokumen per embed call
+        rate_limit: Maksimal chunks/s (0 = tanpa throttle)
+        max_catchup_passes: Pengulangan catch-up sebelum verify gagal
+    """
+
+    def __init__(
+        self,
+        target_embedding_cfg: dict,
+        batch_size: int = 32,
+        rate_limit: float = 20.0,
+        shadow_name: Optional[str] = None,
+        max_catchup_passes: int = 3
+    ):
+        self.target_cfg = target_embedding_cfg
+        self.batch_size = max(1, batch_size)
+        self.rate_limit = rate_limit
+        self.shadow_name = shadow_name
+        self.max_catchup_passes = max_catchup_passes
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.state: Dict = {
+            "phase": "idle",
+            "source_collection": None,
+            "shadow_collection": None,
+            "target_model": target_embedding_cfg["model"],
+            "total": 0,
+            "migrated": 0,
+            "started_at": None,
+            "finished_at": None,
+            "error": None
+        }
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _make_shadow_name(self, source: str) -> str:
+        model_cfg = self.target_cfg.get(self.target_cfg["model"], {})
+        slug = re.sub(r"[^a-zA-Z0-9]+", "-", model_cfg.get("model_name", self.target_cfg["model"])).strip("-")
+        if model_cfg.get("dimensions"):
+            slug = f"{slug}-{model_cfg['dimensions']}"
+        # Nama collection Chroma: 3-63 karakter
+        return f"{source}__{slug}_{datetime.now():%Y%m%d%H%M}"[:63]
+
+    def _throttle(self, started: float) -> None:
+        if self.rate_limit <= 0:
+            return
+        expected = self.state["migrated"] / self.rate_limit
+        elapsed = time.time() - started
+        if expected > elapsed:
+            self._stop_event.wait(expected - elapsed)
+
+    def _check_cancel(self) -> None:
+        if self._stop_event.is_set():
+            raise MigrationCancelled()
+
+    def _copy(self, source, service: EmbeddingService, ids: Optional[List[str]] = None, started: float = 0.0) -> int:
+        """Embed ulang dokumen source (semua atau id tertentu) ke shadow"""
+        copied = 0
+        offset = 0
+
+        while True:
+            self._check_cancel()
+
+            if ids is None:
+                page = source.get(limit=self.batch_size, offset=offset, include=["documents", "metadatas"])
+                offset += self.batch_size
+            else:
+                batch_ids = ids[copied:copied + self.batch_size]
+                if not batch_ids:
+                    break
+                page = source.get(ids=batch_ids, include=["documents", "metadatas"])
+
+            if not page["ids"]:
+                if ids is None:
+                    break
+                # Semua id di batch ini sudah dihapus dari source
+                copied += len(batch_ids)
+                continue
+
+            vectors = service.embed_texts(page["documents"])
+            service.upsert_vectors(page["ids"], vectors, page["documents"], page["metadatas"])
+
+            copied += len(page["ids"]) if ids is None else len(batch_ids)
+            self.state["migrated"] += len(page["ids"])
+            self._throttle(started)
+
+        return copied
+
+    @staticmethod
+    def _ids(collection) -> Set[str]:
+        return set(collection.get(include=[])["ids"])
+
+    def _catch_up(
+        self,
+        source,
+        shadow,
+        service: EmbeddingService,
+        started: float,
+        delete_extra: bool = True,
+        passes: Optional[int] = None
+    ) -> bool:
+        """
+        Sinkronkan selisih id; True jika source == shadow
+
+        Args:
+            delete_extra: Hapus id shadow yang tidak ada di source
+                (False setelah flip: write baru hanya masuk ke shadow)
+        """
+        for _ in range(passes or self.max_catchup_passes):
+            source_ids = self._ids(source)
+            shadow_ids = self._ids(shadow)
+
+            missing = sorted(source_ids - shadow_ids)
+            extra = sorted(shadow_ids - source_ids) if delete_extra else []
+            if not missing and not extra:
+                return True
+
+            print(f"   🔁 Catch-up: {len(missing)} baru, {len(extra)} dihapus")
+            if extra:
+                shadow.delete(ids=extra)
+            if missing:
+                self._copy(source, service, ids=missing, started=started)
+
+        return self._ids(source) == self._ids(shadow)
+
+    # ------------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------------
+    def run(self) -> Dict:
+        """Jalankan migrasi (blocking)"""
+        active = get_active_state()
+        source_name = active["collection"]
+        shadow_name = self.shadow_name or self._make_shadow_name(source_name)
+        started = time.time()
+
+        self.state.update({
+            "phase": "build",
+            "source_collection": source_name,
+            "shadow_collection": shadow_name,
+            "started_at": datetime.now().isoformat()
+        })
+
+        try:
+            print(f"🚚 Migrasi {source_name} → {shadow_name} ({self.target_cfg['model']})")
+            manager = EmbeddingManager.from_config(self.target_cfg)
+            shadow = get_vector_store(
+                shadow_name,
+                embeddings=manager.get_embeddings(),
+                dimensions=manager.get_embedding_dimension()
+            )
+            service = EmbeddingService(manager.get_embeddings(), shadow)
+
+            source = get_vector_store(source_name)
+            self.state["total"] = source.count()
+
+            # 1️⃣ Build (query tetap dilayani collection lama)
+            self._copy(source, service, started=started)
+
+            # 2️⃣ + 3️⃣ Catch-up & verify
+            self.state["phase"] = "verify"
+            if not self._catch_up(source, shadow, service, started):
+                raise RuntimeError(
+                    f"Verifikasi gagal: source={source.count()} shadow={shadow.count()}"
+                )
+
+            # 4️⃣ Flip atomik
+            self._check_cancel()
+            set_active_collection(shadow_name, self.target_cfg)
+            self.state["phase"] = "flipped"
+            print(f"🔀 Collection aktif sekarang: {shadow_name}")
+
+            # 5️⃣ Write yang sempat masuk ke collection lama sebelum flip
+            self._catch_up(source, shadow, service, started, delete_extra=False, passes=1)
+
+            self.state["phase"] = "done"
+            print(f"✅ Migrasi selesai: {shadow.count()} dokumen dalam {time.time() - started:.1f}s")
+
+        except MigrationCancelled:
+            if self.state["phase"] == "flipped":
+                print("⏹️ Post-flip catch-up dibatalkan (flip sudah terjadi)")
+            else:
+                self.state["phase"] = "cancelled"
+                print("⏹️ Migrasi dibatalkan, collection aktif tidak berubah")
+        except Exception as e:
+            self.state["phase"] = "failed"
+            self.state["error"] = str(e)
+            print(f"❌ Migrasi gagal: {e}")
+        finally:
+            self.state["finished_at"] = datetime.now().isoformat()
+
+        return self.get_status()
+
+    def start(self) -> bool:
+        """Jalankan di background thread (False jika sudah berjalan)"""
+        if self.is_running():
+            return False
+        self._thread = threading.Thread(target=self.run, name="collection-migration", daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self, timeout: Optional[float] = None) -> None:
+        """Batalkan sebelum flip (setelah flip hanya post-flip catch-up yang berhenti)"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_status(self) -> Dict:
+        status = dict(self.state)
+        status["running"] = self.is_running()
+        return status
+
+
+def rollback_active_collection() -> dict:
+    """Kembalikan pointer ke collection sebelum flip terakhir"""
+    previous = get_active_state().get("previous")
+    if not previous:
+        raise ValueError("Tidak ada collection sebelumnya untuk rollback")
+    return set_active_collection(previous["collection"], previous["embeddings"])
@@ -0,0 +1,329 @@
+# app/services/document_job_queue.py
+"""
+Antrian proses dokumen (PDF → knowledge base) di background
+
+POST /api/documents/{id}/process hanya enqueue job (document_jobs) lalu
+langsung kembali; worker thread mengambil job dengan lease
+(DocumentJobRepository.claim, SKIP LOCKED) dan menjalankan
+DocumentService.process_document.
+
+- concurrency: jumlah dokumen yang diproses bersamaan per proses API;
+  beberapa proses/node boleh berjalan sekaligus (claim tidak bentrok)
+- Progress per tahap (extract → rewrite → save) ditulis ke job
+- Lease diperpanjang thread heartbeat setiap lease_seconds / 3 selama job
+  berjalan (juga saat extract / satu call LLM panjang tanpa laporan
+  progress); worker yang mati → job di-claim ulang setelah lease lewat
+  (maksimal max_attempts kali)
+- Cancel: job 'queued' langsung batal; job 'running' berhenti di laporan
+  progress berikutnya (antar bagian rewrite) dan dokumen kembali PENDING
+
+Status dokumen: PENDING (queued) → PROCESSING → COMPLETED | FAILED,
+cancel → PENDING, enqueue dokumen FAILED → PENDING (retry).
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from models.document import DocumentStatus
+from models.document_job import DocumentJobModel
+from repositories.chunk_lease_repository import default_worker_id
+from repositories.document_job_repository import (
+    JOB_CANCELLED,
+    JOB_COMPLETED,
+    JOB_FAILED,
+    DocumentJobRepository
+)
+from repositories.document_repository import DocumentRepository
+from services.document_service import DocumentService, ProcessingCancelled
+from utils.db import SessionLocal
+
+# Rentang progress job per tahap (fraction tahap → progress keseluruhan)
+STAGE_RANGES = {
+    "extract": (0.0, 0.2),
+    "rewrite": (0.2, 0.9),
+    "save": (0.9, 1.0),
+}
+
+
+def job_to_dict(job: DocumentJobModel) -> Dict:
+    return {
+        "id": job.id,
+        "document_id": job.document_id,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": round(job.progress or 0.0, 3),
+        "message": job.message,
+        "error_message": job.error_message,
+        "result": job.result,
+        "cancel_requested": job.cancel_requested,
+        "attempts": job.attempts,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class DocumentJobQueue:
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        concurrency: int = 2,
+        poll_interval: float = 2.0,
+        lease_seconds: int = 600,
+        max_attempts: int = 3,
+        progress_interval: float = 1.0,
+        worker_id: Optional[str] = None
+    ):
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.progress_interval = progress_interval
+        self.worker_id = worker_id or default_worker_id()
+
+        self._stop_event = threading.Event()
+        self._wakeup = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._active: Dict[int, int] = {}  # job_id → document_id (proses ini)
+        self._lock = threading.Lock()
+
+    def _repository(self, db: Session) -> DocumentJobRepository:
+        return DocumentJobRepository(db, lease_seconds=self.lease_seconds)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def enqueue(self, document_id: int) -> Dict:
+        """
+        Masukkan dokumen ke antrian (job aktif yang sudah ada dikembalikan)
+
+        Raises:
+            ValueError: dokumen tidak ada / sudah COMPLETED
+        """
+        db = self.session_factory()
+        try:
+            jobs = self._repository(db)
+            active = jobs.get_active(document_id)
+            if active:
+                return job_to_dict(active)
+
+            documents = DocumentRepository(db)
+            document = documents.get_by_id(document_id)
+            if not document:
+                raise ValueError(f"Document {document_id} not found")
+            if document.status == DocumentStatus.FAILED:
+                documents.update(document_id, {"status": DocumentStatus.PENDING, "error_message": None})
+            elif document.status != DocumentStatus.PENDING:
+                raise ValueError(f"Document {document_id} is already {document.status}")
+
+            job = jobs.enqueue(document_id)
+            self._wakeup.set()
+            return job_to_dict(job)
+        finally:
+            db.close()
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        db = self.session_factory()
+        try:
+            job = self._repository(db).get(job_id)
+            return job_to_dict(job) if job else None
+        finally:
+            db.close()
+
+    def get_latest_job(self, document_id: int) -> Optional[Dict]:
+        db = self.session_factory()
+        try:
+            job = self._repository(db).get_latest(document_id)
+            return job_to_dict(job) if job else None
+        finally:
+            db.close()
+
+    def list_jobs(self, status: Optional[str] = None, skip: int = 0, limit: int = 50) -> List[Dict]:
+        db = self.session_factory()
+        try:
+            return [job_to_dict(job) for job in self._repository(db).list(status, skip, limit)]
+        finally:
+            db.close()
+
+    def cancel(self, job_id: int) -> Optional[Dict]:
+        db = self.session_factory()
+        try:
+            job = self._repository(db).request_cancel(job_id)
+            return job_to_dict(job) if job else None
+        finally:
+            db.close()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _progress_callback(self, job_id: int, token: str) -> Callable[[str, float], None]:
+        """
+        Callback untuk DocumentService.process_document: tulis progress
+        (dibatasi progress_interval kecuali ganti tahap) dan cek cancel
+        """
+        state = {"stage": None, "written_at": 0.0}
+
+        def report(stage: str, fraction: float) -> None:
+            now = time.monotonic()
+            if stage == state["stage"] and fraction < 1.0 and now - state["written_at"] < self.progress_interval:
+                return
+            state["stage"], state["written_at"] = stage, now
+
+            low, high = STAGE_RANGES.get(stage, (0.0, 1.0))
+            overall = low + (high - low) * min(max(fraction, 0.0), 1.0)
+            # Session sendiri: callback bisa dipanggil dari thread event loop rewrite
+            db = self.session_factory()
+            try:
+                stop = self._repository(db).progress(
+                    job_id, token, stage, overall, f"{stage} {fraction:.0%}"
+                )
+            finally:
+                db.close()
+            if stop:
+                raise ProcessingCancelled(f"Job {job_id} cancelled")
+
+        return report
+
+    def _heartbeat(self, job_id: int, token: str, done: threading.Event) -> None:
+        """Perpanjang lease job sampai `done` di-set"""
+        interval = max(1.0, self.lease_seconds / 3)
+        while not done.wait(interval):
+            db = self.session_factory()
+            try:
+                if not self._repository(db).renew(job_id, token):
+                    print(f"⚠️ Job {job_id}: lease sudah tidak dipegang worker ini")
+                    return
+            except Exception as e:
+                db.rollback()
+                print(f"⚠️ Job {job_id}: perpanjang lease gagal: {e}")
+            finally:
+                db.close()
+
+    def _run_job(self, job: DocumentJobModel, token: str) -> None:
+        job_id, document_id = job.id, job.document_id
+        done = threading.Event()
+        threading.Thread(
+            target=self._heartbeat,
+            args=(job_id, token, done),
+            name=f"document-job-heartbeat-{job_id}",
+            daemon=True
+        ).start()
+
+        db = self.session_factory()
+        jobs = self._repository(db)
+        try:
+            if job.attempts > self.max_attempts:
+                jobs.finish(job_id, token, JOB_FAILED, error_message=f"Gagal setelah {self.max_attempts} percobaan")
+                DocumentRepository(db).update_status(document_id, DocumentStatus.FAILED, "Processing job exceeded max attempts")
+                return
+
+            documents = DocumentRepository(db)
+            document = documents.get_by_id(document_id)
+            if document is None:
+                jobs.finish(job_id, token, JOB_FAILED, error_message=f"Document {document_id} not found")
+                return
+            # Lease sebelumnya kedaluwarsa (worker mati di tengah proses)
+            if job.attempts > 1 and document.status == DocumentStatus.PROCESSING:
+                documents.update_status(document_id, DocumentStatus.PENDING)
+
+            with self._lock:
+                self._active[job_id] = document_id
+            print(f"📥 Job {job_id}: document {document_id} (percobaan {job.attempts})")
+
+            result = DocumentService(db).process_document(
+                document_id,
+                progress=self._progress_callback(job_id, token)
+            )
+            result.pop("raw_text_preview", None)
+            jobs.finish(job_id, token, JOB_COMPLETED, result=result)
+            print(f"✅ Job {job_id} selesai")
+
+        except ProcessingCancelled:
+            db.rollback()
+            jobs.finish(job_id, token, JOB_CANCELLED)
+            print(f"⏹️ Job {job_id} dibatalkan")
+
+        except Exception as e:
+            # Status dokumen FAILED sudah di-set process_document
+            db.rollback()
+            jobs.finish(job_id, token, JOB_FAILED, error_message=str(e))
+            print(f"❌ Job {job_id} gagal: {e}")
+
+        finally:
+            done.set()
+            with self._lock:
+                self._active.pop(job_id, None)
+            db.close()
+
+    def _loop(self, index: int) -> None:
+        worker_token = f"{self.worker_id}:{index}"[:100]
+        while not self._stop_event.is_set():
+            job = None
+            db = self.session_factory()
+            try:
+                job = self._repository(db).claim(worker_token)
+                if job is not None:
+                    db.expunge(job)
+            except Exception as e:
+                db.rollback()
+                print(f"⚠️ Claim document job gagal: {e}")
+            finally:
+                db.close()
+
+            if job is not None:
+                self._run_job(job, worker_token)
+                continue
+
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    # ------------------------------------------------------------------
+    # In-app control
+    # ------------------------------------------------------------------
+    def start(self) -> bool:
+        """Jalankan `concurrency` worker thread (False jika sudah jalan)"""
+        if self.is_running():
+            return False
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(target=self._loop, args=(i,), name=f"document-job-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in self._threads:
+            thread.start()
+        print(f"🚀 Document job queue mulai ({self.concurrency} worker)")
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Berhenti mengambil job baru; job yang sedang berjalan diselesaikan
+        (atau di-claim ulang proses lain setelah lease lewat jika timeout)
+        """
+        self._stop_event.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def get_status(self) -> Dict:
+        db = self.session_factory()
+        try:
+            counts = self._repository(db).count_by_status()
+        finally:
+            db.close()
+        with self._lock:
+            active = dict(self._active)
+        return {
+            "running": self.is_running(),
+            "worker_id": self.worker_id,
+            "concurrency": self.concurrency,
+            "active_jobs": active,
+            "jobs": counts,
+        }
@@ -2,13 +2,15 @@
 import os
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from fastapi import UploadFile
 from sqlalchemy.orm import Session
 from datetime import datetime
 
+from core.config_loader import APP_CONFIG
 from models.document import DocumentStatus,ExtractionMethod
 from repositories.document_repository import DocumentRepository
+from utils.upload_stream import DEFAULT_CHUNK_SIZE, stream_upload
 # from services.pdf_extractor import PDFExtractor
 # from services.pdf_extractor_enhanced import EnhancedPDFExtractor  # ✅ GANTI INI
 
@@ -17,6 +19,12 @@ from repositories.document_repository import DocumentRepository
 # ✅ Import LangChain Extractor
 # from services.pdf_extractor_langchain import LangChainPDFExtractor
 from services.pdf_to_knowledge import PDFToKnowledgeConverter  # ✅ NEW
+
+
+class ProcessingCancelled(Exception):
+    """Dilempar callback progress saat job dibatalkan (dokumen kembali PENDING)"""
+
+
 class DocumentService:
     """
     Business logic untuk document processing
@@ -52,11 +60,24 @@ class DocumentService:
          # ✅ Initialize simple converter
         openai_key = os.getenv("OPENAI_API_KEY")
         openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        processing_cfg = APP_CONFIG.get("document_processing", {})
+        extraction_cfg = processing_cfg.get("extraction", {})
+        rewrite_cfg = processing_cfg.get("rewrite", {})
         
         self.converter = PDFToKnowledgeConverter(
             openai_api_key=openai_key,
-            model=openai_model
+            model=openai_model,
+            parallel_extraction=extraction_cfg.get("parallel", False),
+            max_workers=extraction_cfg.get("max_workers"),
+            min_pages_parallel=extraction_cfg.get("min_pages_parallel", 8),
+            start_method=extraction_cfg.get("start_method", "spawn"),
+            rewrite_mode=rewrite_cfg.get("mode", "single"),
+            max_part_chars=rewrite_cfg.get("max_part_chars", 6000),
+            rewrite_concurrency=rewrite_cfg.get("concurrency", 4),
+            merge_pass=rewrite_cfg.get("merge_pass", True)
         )
+        # Simpan hash + hasil rewrite per halaman; proses ulang hanya halaman berubah
+        self.incremental = processing_cfg.get("incremental", False)
         # self.extractor = OllamaPDFExtractor(
         #     use_ollama=True,
         #     ollama_base_url=ollama_url,
@@ -66,51 +87,112 @@ class DocumentService:
         # )
         
         
+        upload_cfg = processing_cfg.get("upload", {})
+        self.max_file_size = upload_cfg.get("max_file_size")
+        self.upload_chunk_size = upload_cfg.get("chunk_size", DEFAULT_CHUNK_SIZE)
+        
         self.upload_dir = Path(upload_dir)
         self.upload_dir.mkdir(parents=True, exist_ok=True)
     
-    async def upload_document(self, file: UploadFile) -> dict:
+    async def upload_document(self, file: UploadFile, replace_document_id: Optional[int] = None) -> dict:
         """
         Upload dan save file, create document record
+        
+        Args:
+            replace_document_id: Versi baru dari document ini; record lama
+                di-update (hash per halaman proses sebelumnya dipakai ulang).
+                Tanpa ini upload selalu menjadi document baru, walaupun nama
+                file sama (mis. "brosur.pdf" dari cabang berbeda).
         """
         # Validate file type
         if not file.filename.endswith('.pdf'):
             raise ValueError("Only PDF files are allowed")
         
-        # Generate unique filename
-        file_ext = Path(file.filename).suffix
-        unique_filename = f"{uuid.uuid4()}{file_ext}"
-        file_path = self.upload_dir / unique_filename
+        previous = None
+        if replace_document_id is not None:
+            previous = self.repository.get_by_id(replace_document_id)
+            if not previous:
+                raise ValueError(f"Document {replace_document_id} not found")
+            if previous.status == DocumentStatus.PROCESSING:
+                raise ValueError(f"Document {replace_document_id} is still processing")
         
-        # Save file
-        file_size = 0
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-            file_size = len(content)
+        # Stream ke file sementara: sha256 + batas ukuran dicek selagi byte masuk
+        upload = await stream_upload(
+            file,
+            self.upload_dir,
+            max_bytes=self.max_file_size,
+            chunk_size=self.upload_chunk_size
+        )
+        
+        try:
+            # File identik sudah pernah di-upload: tidak perlu OCR / rewrite / embed ulang
+            existing = self.repository.get_by_sha256(upload.sha256)
+            if existing:
+                upload.discard()
+                print(f"♻️ {file.filename} identik dengan document {existing.id}, upload di-skip")
+                return self._upload_result(existing, duplicate=True)
+            
+            # Generate unique filename
+            file_ext = Path(file.filename).suffix
+            unique_filename = f"{uuid.uuid4()}{file_ext}"
+            file_path = upload.commit(self.upload_dir / unique_filename)
+        except Exception:
+            upload.discard()
+            raise
         
-        # Create document record
         document_data = {
             "filename": unique_filename,
             "original_filename": file.filename,
             "file_path": str(file_path),
-            "file_size": file_size,
+            "file_size": upload.size,
             "mime_type": file.content_type or "application/pdf",
+            "content_sha256": upload.sha256,
             "status": DocumentStatus.PENDING
         }
         
+        # Versi baru dokumen yang sama: update record lama supaya hash per
+        # halaman dari proses sebelumnya bisa dipakai ulang
+        if previous:
+            old_path = previous.file_path
+            document_data["error_message"] = None
+            document = self.repository.update(previous.id, document_data)
+            self._remove_file(old_path)
+            print(f"🔄 {file.filename} berubah, document {document.id} akan diproses ulang")
+            return self._upload_result(document, updated=True)
+        
+        # Create document record
         document = self.repository.create(document_data)
         
+        return self._upload_result(document)
+    
+    @staticmethod
+    def _upload_result(document, duplicate: bool = False, updated: bool = False) -> dict:
         return {
             "document_id": document.id,
             "filename": document.filename,
             "original_filename": document.original_filename,
-            "status": document.status
+            "status": document.status,
+            "duplicate": duplicate,
+            "updated": updated
         }
     
-    def process_document(self, document_id: int) -> dict:
+    @staticmethod
+    def _remove_file(file_path: str) -> None:
+        try:
+            if file_path and os.path.exists(file_path):
+                os.remove(file_path)
+        except Exception as e:
+            print(f"Error deleting file: {e}")
+    
+    def process_document(self,
+                         document_id: int,
+                         progress: Optional[Callable[[str, float], None]] = None) -> dict:
         """
         Process document: PDF → AI Knowledge Base
+        
+        Args:
+            progress: callback(stage, fraction) per tahap (extract, rewrite,
+                save); melempar ProcessingCancelled untuk berhenti
         """
         # Get document
         document = self.repository.get_by_id(document_id)
@@ -127,12 +209,21 @@ class DocumentService:
             print(f"🚀 Processing document {document_id}...")
             
             # ✅ Convert PDF to Knowledge Base
+            cached_pages = self.repository.get_page_hashes(document_id) if self.incremental else None
             result = self.converter.process(
                 pdf_path=document.file_path,
-                doc_title=document.original_filename
+                doc_title=document.original_filename,
+                cached_pages=cached_pages,
+                previous_knowledge=document.raw_text if self.incremental else None,
+                progress=progress
             )
             
             print("✅ Conversion completed!")
+            if progress:
+                progress("save", 0.0)
+            
+            if result.pages:
+                self.repository.save_pages(document_id, result.pages)
             
             # Update document with results
             updated_doc = self.repository.update_extraction_results(
@@ -148,7 +239,8 @@ class DocumentService:
                     "has_tables": result.has_tables,
                     "ai_model": result.ai_model,
                     "original_length": result.original_length,
-                    "knowledge_length": result.knowledge_length
+                    "knowledge_length": result.knowledge_length,
+                    "reused_pages": sum(1 for page in result.pages if page["reused"])
                 },
                 ocr_confidence=None,
                 extraction_duration=result.processing_duration
@@ -165,6 +257,11 @@ class DocumentService:
                 "ai_model": result.ai_model
             }
         
+        except ProcessingCancelled:
+            # Dibatalkan: bisa di-enqueue ulang
+            self.repository.update_status(document_id, DocumentStatus.PENDING)
+            raise
+        
         except Exception as e:
             # Update to failed
             self.repository.update_status(
@@ -248,11 +345,7 @@ class DocumentService:
             return False
         
         # Delete file
-        try:
-            if os.path.exists(document.file_path):
-                os.remove(document.file_path)
-        except Exception as e:
-            print(f"Error deleting file: {e}")
+        self._remove_file(document.file_path)
         
         # Delete from database
         return self.repository.delete(document_id)
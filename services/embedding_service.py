@@ -0,0 +1,174 @@
+# app/services/embedding_service.py
+from typing import List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from models.chunk import ChunkModel
+from repositories.chunk_lease_repository import ChunkLeaseRepository
+from repositories.embedding_repository import EmbeddingRepository
+
+
+class StaleEmbeddingError(RuntimeError):
+    """Collection aktif berganti (flip migrasi) antara embed dan write"""
+
+
+def sanitize_metadata(metadata: dict) -> dict:
+    """Sanitize metadata untuk ChromaDB (hanya str, int, float, bool)"""
+    safe = {}
+    for k, v in metadata.items():
+        if isinstance(v, (str, int, float, bool)) or v is None:
+            safe[k] = v
+        elif isinstance(v, list):
+            safe[k] = ", ".join(map(str, v))
+        else:
+            safe[k] = str(v)
+    return safe
+
+
+class EmbeddingService:
+    """
+    Business logic untuk embed chunk → PostgreSQL (audit) + ChromaDB (search)
+
+    Urutan tulis dibuat aman terhadap crash di tengah batch:
+    1. Upsert ke Chroma (idempotent per chunk id)
+    2. Tulis vector audit + status 'embedded' di PostgreSQL dalam satu commit
+    Jika proses mati di antara 1 dan 2, chunk tetap 'pending'/'embedding'
+    (lease habis) dan upsert berikutnya menimpa id yang sama (tidak ada duplikat).
+    """
+
+    def __init__(self, embeddings=None, vectorstore=None):
+        """
+        Args:
+            embeddings/vectorstore: Instance tetap (vectorstore: VectorStore,
+                core/vector_store.py); jika None diambil dari registry
+                setiap dipakai: collection aktif setelah flip, atau versi
+                staging KB jika sedang dibangun (kb_snapshot_service)
+        """
+        self._embeddings = embeddings
+        self._vectorstore = vectorstore
+
+    @property
+    def embeddings(self):
+        if self._embeddings is not None:
+            return self._embeddings
+        from core.vectorstore_registry import get_embeddings
+        return get_embeddings()
+
+    @property
+    def vectorstore(self):
+        if self._vectorstore is not None:
+            return self._vectorstore
+        from core.vectorstore_registry import get_ingest_collection_name, get_vector_store
+        return get_vector_store(get_ingest_collection_name())
+
+    @property
+    def collection_name(self) -> str:
+        """Nama collection tujuan saat ini"""
+        return self.vectorstore.name
+
+    def embed_texts(self, contents: List[str]) -> List[List[float]]:
+        """Generate embeddings batch"""
+        return self.embeddings.embed_documents(contents)
+
+    def upsert_vectors(
+        self,
+        ids: List[str],
+        vectors: List[List[float]],
+        contents: List[str],
+        metadatas: List[dict]
+    ) -> None:
+        """Tulis vector yang sudah dihitung ke vector store (tanpa embed ulang)"""
+        self.vectorstore.upsert(ids, vectors, contents, metadatas)
+
+    def write_batch(
+        self,
+        db: Session,
+        chunks: Sequence[ChunkModel],
+        vectors: List[List[float]],
+        claim_token: Optional[str] = None,
+        collection_name: Optional[str] = None
+    ) -> int:
+        """
+        Simpan hasil embedding satu batch ke Chroma lalu PostgreSQL
+
+        Args:
+            claim_token: Token dari ChunkLeaseRepository.claim(); jika diisi,
+                hanya chunk yang lease-nya masih dipegang token yang
+                ditandai 'embedded' dan ditulis ke audit PostgreSQL
+            collection_name: Collection aktif saat vector di-embed; jika
+                sudah berganti (model baru), batch ditolak supaya tidak
+                mencampur vector dua model dalam satu collection
+
+        Returns:
+            Jumlah chunk yang ditulis
+        """
+        if not chunks:
+            return 0
+
+        if collection_name is not None and self.collection_name != collection_name:
+            raise StaleEmbeddingError(
+                f"Collection aktif berubah {collection_name} → {self.collection_name}, batch di-embed ulang"
+            )
+
+        chunk_ids = [chunk.id for chunk in chunks]
+        metadatas = []
+        for chunk in chunks:
+            safe_metadata = sanitize_metadata(chunk.metadata_json or {})
+            safe_metadata["chunk_id"] = chunk.id  # Track chunk_id di metadata
+            metadatas.append(safe_metadata)
+
+        # 1️⃣ Chroma dulu (idempotent)
+        self.upsert_vectors(
+            [str(cid) for cid in chunk_ids],
+            vectors,
+            [chunk.content for chunk in chunks],
+            metadatas
+        )
+
+        # 2️⃣ PostgreSQL: update status + ganti vector audit lama (jika re-run)
+        if claim_token is not None:
+            owned = set(ChunkLeaseRepository(db).complete(chunk_ids, claim_token))
+        else:
+            owned = set(chunk_ids)
+            for chunk in chunks:
+                chunk.status = "embedded"
+
+        rows = [(cid, vector) for cid, vector in zip(chunk_ids, vectors) if cid in owned]
+
+        repo = EmbeddingRepository(db)
+        repo.delete_by_chunk_ids([cid for cid, _ in rows])
+        repo.bulk_insert(rows)
+
+        db.commit()
+        return len(rows)
+
+    def embed_chunks(
+        self,
+        db: Session,
+        chunks: Sequence[ChunkModel],
+        claim_token: Optional[str] = None
+    ) -> int:
+        """Embed + tulis satu batch chunk secara sinkron"""
+        if not chunks:
+            return 0
+        collection_name = self.collection_name
+        vectors = self.embed_texts([chunk.content for chunk in chunks])
+        return self.write_batch(db, chunks, vectors, claim_token, collection_name)
+
+    def embed_pending(self, db: Session, limit: int, lease_seconds: int = 300) -> int:
+        """
+        Claim chunk pending lalu embed; aman dipanggil paralel
+        (request/worker lain tidak akan mendapat chunk yang sama)
+        """
+        leases = ChunkLeaseRepository(db, lease_seconds=lease_seconds)
+        token = leases.new_token()
+        chunks = leases.claim(limit, token=token)
+        if not chunks:
+            return 0
+
+        try:
+            return self.embed_chunks(db, chunks, claim_token=token)
+        except Exception:
+            db.rollback()
+            leases.release([chunk.id for chunk in chunks], token)
+            raise
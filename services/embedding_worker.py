@@ -0,0 +1,306 @@
+# app/services/embedding_worker.py
+"""
+Streaming Embedding Worker
+Embed semua chunk 'pending' di background dengan pipeline:
+
+    fetch (keyset by id) → embed (thread pool, bounded) → write (urut)
+
+- Batch berikutnya di-fetch & di-embed selagi batch sebelumnya ditulis
+- Maksimal `max_in_flight` batch sedang di-embed bersamaan (backpressure)
+- Checkpoint (id chunk terakhir yang sudah ditulis) disimpan ke file JSON
+  sehingga restart melanjutkan dari posisi terakhir
+- Penulisan idempotent (lihat EmbeddingService.write_batch): crash di
+  tengah batch tidak menghasilkan duplikat di Chroma maupun PostgreSQL
+- Chunk di-claim dengan lease (ChunkLeaseRepository), sehingga beberapa
+  worker/proses/node bisa berjalan paralel tanpa kerja ganda
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from models.chunk import ChunkModel
+from repositories.chunk_lease_repository import ChunkLeaseRepository
+from services.chunk_sync_service import ChunkSyncService
+from services.embedding_service import EmbeddingService
+from utils.db import SessionLocal
+
+
+class EmbeddingCheckpoint:
+    """Checkpoint posisi worker di file JSON (ditulis atomik)"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return int(json.load(f).get("last_chunk_id", 0))
+        except (ValueError, OSError):
+            print(f"⚠️ Checkpoint rusak, mulai dari awal: {self.path}")
+            return 0
+
+    def save(self, last_chunk_id: int, processed: int) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "last_chunk_id": last_chunk_id,
+                "processed": processed,
+                "updated_at": datetime.now().isoformat()
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def reset(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class EmbeddingWorker:
+    """
+    Background worker untuk embed chunk pending secara streaming
+
+    Bisa dijalankan dari CLI (run_embedding_worker.py) atau
+    sebagai thread di dalam aplikasi (start/stop/get_status).
+    """
+
+    def __init__(
+        self,
+        service: EmbeddingService,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 64,
+        max_in_flight: int = 2,
+        checkpoint_path: str = "./data/embedding_worker_checkpoint.json",
+        poll_interval: float = 10.0,
+        lease_seconds: int = 300,
+        worker_id: Optional[str] = None
+    ):
+        self.service = service
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.max_in_flight = max(1, max_in_flight)
+        self.checkpoint = EmbeddingCheckpoint(checkpoint_path)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    # ------------------------------------------------------------------
+    # Pipeline
+    # ------------------------------------------------------------------
+    def _reset_stats(self) -> None:
+        self.stats = {
+            "processed": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "last_chunk_id": 0,
+            "started_at": None,
+            "finished_at": None,
+            "last_error": None
+        }
+
+    def _claim_batch(self, leases: ChunkLeaseRepository, after_id: int) -> Tuple[List[ChunkModel], str]:
+        """
+        Keyset pagination (tanpa OFFSET) + claim lease:
+        chunk yang sedang di-claim worker lain dilewati
+        """
+        token = leases.new_token()
+        chunks = leases.claim(self.batch_size, after_id=after_id, token=token)
+        # Detach: commit batch lain tidak meng-expire atribut chunk yang
+        # masih in-flight (menghindari reload per row saat write)
+        for chunk in chunks:
+            leases.db.expunge(chunk)
+        return chunks, token
+
+    def _write(
+        self,
+        db: Session,
+        chunks: List[ChunkModel],
+        vectors: List[List[float]],
+        token: str,
+        collection_name: str
+    ) -> None:
+        written = self.service.write_batch(
+            db, chunks, vectors,
+            claim_token=token,
+            collection_name=collection_name
+        )
+        last_id = chunks[-1].id
+
+        with self._stats_lock:
+            self.stats["processed"] += written
+            self.stats["batches"] += 1
+            self.stats["last_chunk_id"] = last_id
+            processed = self.stats["processed"]
+
+        self.checkpoint.save(last_id, processed)
+        print(f"   ✓ {processed} chunks ({self.throughput():.1f} chunks/s), checkpoint id={last_id}")
+
+    def _drain_oldest(
+        self,
+        db: Session,
+        leases: ChunkLeaseRepository,
+        in_flight: Deque[Tuple[List[ChunkModel], str, str, object]]
+    ) -> None:
+        """Tunggu batch tertua selesai di-embed lalu tulis (urutan id terjaga)"""
+        chunks, token, collection_name, future = in_flight.popleft()
+        try:
+            vectors = future.result()
+            self._write(db, chunks, vectors, token, collection_name)
+        except Exception as e:
+            db.rollback()
+            with self._stats_lock:
+                self.stats["failed_batches"] += 1
+                self.stats["last_error"] = str(e)
+            # Lepas claim → chunk kembali 'pending', diambil lagi di pass berikutnya
+            leases.release([chunk.id for chunk in chunks], token)
+            print(f"❌ Batch id {chunks[0].id}-{chunks[-1].id} gagal: {e}")
+
+    def run_pass(self, start_after: Optional[int] = None) -> int:
+        """
+        Satu pass streaming dari checkpoint sampai tidak ada chunk pending
+
+        Returns:
+            Jumlah chunk yang berhasil di-embed pada pass ini
+        """
+        after_id = self.checkpoint.load() if start_after is None else start_after
+        processed_before = self.stats["processed"]
+        in_flight: Deque[Tuple[List[ChunkModel], str, str, object]] = deque()
+
+        db = self.session_factory()
+        leases = ChunkLeaseRepository(db, worker_id=self.worker_id, lease_seconds=self.lease_seconds)
+        try:
+            # Edit/delete chunk dari API (change feed) diproses lebih dulu
+            try:
+                synced = ChunkSyncService(db, self.service, self.lease_seconds).drain_changes()
+                if synced["events"]:
+                    print(f"🔄 Change feed: {synced['events']} event, {synced['deleted']} dihapus, "
+                          f"{synced['reembedded']} di-embed ulang")
+            except Exception as e:
+                db.rollback()
+                print(f"⚠️ Change feed gagal diproses: {e}")
+
+            with ThreadPoolExecutor(
+                max_workers=self.max_in_flight,
+                thread_name_prefix="embed"
+            ) as executor:
+                while not self._stop_event.is_set():
+                    chunks, token = self._claim_batch(leases, after_id)
+                    if not chunks:
+                        break
+
+                    after_id = chunks[-1].id
+                    contents = [chunk.content for chunk in chunks]
+                    collection_name = self.service.collection_name
+                    in_flight.append((
+                        chunks,
+                        token,
+                        collection_name,
+                        executor.submit(self.service.embed_texts, contents)
+                    ))
+
+                    if len(in_flight) >= self.max_in_flight:
+                        self._drain_oldest(db, leases, in_flight)
+
+                while in_flight:
+                    self._drain_oldest(db, leases, in_flight)
+        finally:
+            db.close()
+
+        if not self._stop_event.is_set():
+            # Pass selesai sampai ujung: chunk yang di-reset ke 'pending'
+            # dengan id lebih kecil akan diambil pada pass berikutnya
+            self.checkpoint.reset()
+
+        return self.stats["processed"] - processed_before
+
+    def run(self, once: bool = False) -> Dict:
+        """
+        Jalankan worker (blocking)
+
+        Args:
+            once: True = berhenti setelah semua chunk pending habis,
+                  False = terus polling setiap poll_interval detik
+        """
+        self._stop_event.clear()
+        with self._stats_lock:
+            self._reset_stats()
+            self.stats["started_at"] = time.time()
+
+        print(f"🚀 Embedding worker mulai (batch={self.batch_size}, in_flight={self.max_in_flight})")
+
+        while not self._stop_event.is_set():
+            try:
+                self.run_pass()
+            except Exception as e:
+                with self._stats_lock:
+                    self.stats["last_error"] = str(e)
+                print(f"❌ Embedding worker error: {e}")
+
+            if once:
+                break
+            self._stop_event.wait(self.poll_interval)
+
+        with self._stats_lock:
+            self.stats["finished_at"] = time.time()
+
+        print(f"✅ Embedding worker selesai: {self.stats['processed']} chunks "
+              f"({self.throughput():.1f} chunks/s)")
+        return self.get_status()
+
+    # ------------------------------------------------------------------
+    # In-app control
+    # ------------------------------------------------------------------
+    def start(self, once: bool = False) -> bool:
+        """Jalankan worker di background thread (False jika sudah jalan)"""
+        if self.is_running():
+            return False
+        self._thread = threading.Thread(
+            target=self.run,
+            kwargs={"once": once},
+            name="embedding-worker",
+            daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Minta worker berhenti setelah batch yang sedang berjalan ditulis"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def throughput(self) -> float:
+        started_at = self.stats["started_at"]
+        if not started_at:
+            return 0.0
+        elapsed = (self.stats["finished_at"] or time.time()) - started_at
+        return self.stats["processed"] / elapsed if elapsed > 0 else 0.0
+
+    def get_status(self) -> Dict:
+        with self._stats_lock:
+            status = dict(self.stats)
+        status["running"] = self.is_running()
+        status["chunks_per_second"] = round(self.throughput(), 2)
+        status["batch_size"] = self.batch_size
+        status["max_in_flight"] = self.max_in_flight
+        return status
@@ -0,0 +1,179 @@
+# app/services/kb_archive_service.py
+"""
+Arsip knowledge base per tahun ajaran
+
+- run(): chunk dengan metadata tahun ajaran lampau (lebih lama dari
+  retrieval.archive.keep_years) dipindah dari collection aktif ke
+  <base>__archive_<tahun> (vector ikut di-copy, tanpa embed ulang),
+  lalu dihapus dari collection aktif. Chunk tanpa tahun tetap aktif.
+- stores_for_tahun(): retriever hanya membuka arsip jika query menyebut
+  tahun lama; query biasa cukup ke collection aktif (lebih kecil, hasil
+  tidak tercampur informasi tahun lalu).
+- find_archived() / delete_archived(): dipakai reconciler dan change
+  feed supaya chunk yang diarsip tidak dianggap hilang, dan edit/delete
+  chunk tidak meninggalkan salinan lama di arsip.
+
+Nama arsip memakai base name (bukan versi KB), jadi tetap berlaku setelah
+promote/rollback. Migrasi embedding model (run_collection_migration.py)
+hanya memindah collection aktif: arsip perlu dibuat ulang setelahnya.
+"""
+
+import re
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set
+
+from core.config_loader import APP_CONFIG
+from core.vectorstore_registry import (
+    get_active_state,
+    get_chroma_config,
+    get_vector_store,
+    list_collection_names
+)
+
+ARCHIVE_SEPARATOR = "__archive_"
+YEAR_PATTERN = re.compile(r"20\d{2}")
+
+
+def get_archive_config() -> dict:
+    return APP_CONFIG.get("retrieval", {}).get("archive", {})
+
+
+def academic_year_of(tahun) -> Optional[int]:
+    """Tahun awal tahun ajaran: "2024/2025", "2024-2025", "2024" → 2024"""
+    match = YEAR_PATTERN.search(str(tahun or ""))
+    return int(match.group()) if match else None
+
+
+def current_academic_year(today: Optional[date] = None) -> int:
+    """Tahun ajaran berjalan (override: retrieval.archive.current_year)"""
+    archive_cfg = get_archive_config()
+    if archive_cfg.get("current_year"):
+        return int(archive_cfg["current_year"])
+    today = today or date.today()
+    start_month = archive_cfg.get("academic_year_start_month", 7)
+    return today.year if today.month >= start_month else today.year - 1
+
+
+def get_retrieval_archive() -> Optional["KnowledgeBaseArchive"]:
+    """Arsip untuk retriever (None jika retrieval.archive.enabled: false)"""
+    return KnowledgeBaseArchive() if get_archive_config().get("enabled", False) else None
+
+
+class KnowledgeBaseArchive:
+
+    def __init__(self, batch_size: int = 500, keep_years: Optional[int] = None):
+        self.batch_size = max(1, batch_size)
+        self.keep_years = max(1, keep_years or get_archive_config().get("keep_years", 1))
+
+    @property
+    def base_name(self) -> str:
+        return get_chroma_config()["collection_name"]
+
+    def archive_name(self, year: int) -> str:
+        return f"{self.base_name}{ARCHIVE_SEPARATOR}{year}"
+
+    def cutoff_year(self) -> int:
+        """Tahun ajaran < cutoff masuk arsip"""
+        return current_academic_year() - self.keep_years + 1
+
+    def list_archives(self) -> Dict[int, str]:
+        prefix = f"{self.base_name}{ARCHIVE_SEPARATOR}"
+        return {
+            int(name[len(prefix):]): name
+            for name in list_collection_names()
+            if name.startswith(prefix) and name[len(prefix):].isdigit()
+        }
+
+    def plan(self) -> Dict[int, List[str]]:
+        """Id per tahun ajaran lampau di collection aktif"""
+        source = get_vector_store(get_active_state()["collection"])
+        cutoff = self.cutoff_year()
+        by_year: Dict[int, List[str]] = {}
+        offset = 0
+
+        while True:
+            page = source.get(limit=self.batch_size, offset=offset, include=["metadatas"])
+            if not page["ids"]:
+                break
+            offset += len(page["ids"])
+
+            for doc_id, metadata in zip(page["ids"], page["metadatas"]):
+                year = academic_year_of((metadata or {}).get("tahun"))
+                if year is not None and year < cutoff:
+                    by_year.setdefault(year, []).append(doc_id)
+        return by_year
+
+    def run(self, dry_run: bool = False) -> Dict:
+        """
+        Pindahkan chunk tahun lampau ke arsip
+
+        Copy dulu baru delete: jika terhenti di tengah, chunk ada di dua
+        tempat dan run berikutnya menyelesaikan (upsert idempotent).
+        """
+        state = get_active_state()
+        if state.get("staging"):
+            raise ValueError(f"Versi staging masih ada: {state['staging']} (promote atau discard dulu)")
+
+        by_year = self.plan()
+        report = {
+            "dry_run": dry_run,
+            "collection": state["collection"],
+            "cutoff_year": self.cutoff_year(),
+            "archived": {self.archive_name(year): len(ids) for year, ids in sorted(by_year.items())},
+        }
+        if dry_run:
+            return report
+
+        # Scan selesai sebelum delete supaya offset tidak bergeser
+        source = get_vector_store(state["collection"])
+        for year, ids in sorted(by_year.items()):
+            target = get_vector_store(self.archive_name(year))
+            for i in range(0, len(ids), self.batch_size):
+                batch = source.get(ids=ids[i:i + self.batch_size], include=["embeddings", "documents", "metadatas"])
+                if not batch["ids"]:
+                    continue
+                target.upsert(
+                    list(batch["ids"]),
+                    list(batch["embeddings"]),
+                    list(batch["documents"]),
+                    list(batch["metadatas"])
+                )
+                source.delete(list(batch["ids"]))
+            print(f"🗄️ {len(ids)} chunk tahun {year}/{year + 1} → {target.name}")
+        return report
+
+    def stores_for_tahun(self, tahun) -> List:
+        """
+        VectorStore arsip untuk tahun yang disebut query ([] jika tahun
+        berjalan / tidak ada arsipnya)
+
+        Tahun tunggal ambigu ("2023" bisa 2022/2023 atau 2023/2024):
+        kedua tahun ajaran dibuka.
+        """
+        years = {int(year) for year in YEAR_PATTERN.findall(str(tahun or ""))}
+        if len(years) == 1:
+            years.add(min(years) - 1)
+
+        cutoff = self.cutoff_year()
+        archives = self.list_archives()
+        return [
+            get_vector_store(archives[year])
+            for year in sorted(years, reverse=True)
+            if year < cutoff and year in archives
+        ]
+
+    def find_archived(self, ids: Iterable[str]) -> Set[str]:
+        ids = list(ids)
+        found: Set[str] = set()
+        for name in self.list_archives().values():
+            if not ids:
+                break
+            found.update(get_vector_store(name).get(ids=ids, include=[])["ids"])
+            ids = [doc_id for doc_id in ids if doc_id not in found]
+        return found
+
+    def delete_archived(self, ids: List[str]) -> None:
+        if not ids:
+            return
+        for name in self.list_archives().values():
+            get_vector_store(name).delete(ids)
@@ -0,0 +1,209 @@
+# app/services/kb_snapshot_service.py
+"""
+Versioned knowledge-base snapshots (blue/green)
+
+1. create_version(): collection versi baru <base>__v<timestamp>, opsional
+   di-copy dari versi aktif (vector ikut di-copy, tanpa embed ulang), lalu
+   dijadikan "staging" di pointer registry. Chunk yang sudah dihapus di
+   PostgreSQL tidak ikut di-copy (delete change feed selama copy bisa
+   lewat staging sebelum id-nya tersalin)
+2. Ingestion (embedding worker / API embed / change feed) menulis ke
+   staging; chatbot tetap membaca versi aktif yang tidak berubah
+3. promote(): flip pointer aktif ke staging secara atomik; query chain
+   yang sedang berjalan menukar retriever-nya (tanpa rebuild LLM / model)
+4. rollback(): kembali ke versi aktif sebelumnya
+
+Versi lama tidak dihapus otomatis (delete_version untuk membersihkan).
+"""
+
+import os
+import shutil
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from core.config_loader import APP_CONFIG
+from core.vectorstore_registry import (
+    drop_vectorstore,
+    get_active_state,
+    get_chroma_client,
+    get_chroma_config,
+    get_collection,
+    get_vector_store,
+    get_vectordb_type,
+    list_collection_names,
+    set_active_collection,
+    set_staging_collection
+)
+from models.chunk import ChunkModel
+from services.collection_migration import rollback_active_collection
+from services.kb_archive_service import ARCHIVE_SEPARATOR
+from utils.db import SessionLocal
+
+VERSION_SEPARATOR = "__v"
+
+
+class KnowledgeBaseSnapshots:
+
+    def __init__(self, batch_size: int = 500, session_factory: Callable[[], Session] = SessionLocal):
+        self.batch_size = max(1, batch_size)
+        self.session_factory = session_factory
+
+    @property
+    def base_name(self) -> str:
+        return get_chroma_config()["collection_name"]
+
+    def _count(self, name: str) -> int:
+        # Chroma: hitung tanpa load embedding model
+        if get_vectordb_type() == "chroma":
+            return get_collection(name).count()
+        return get_vector_store(name).count()
+
+    def _deleted_chunk_ids(self, ids: Iterable[str]) -> Set[str]:
+        """Id vector yang chunk-nya sudah tidak ada lagi di PostgreSQL"""
+        chunk_ids = {doc_id: int(doc_id) for doc_id in ids if str(doc_id).isdigit()}
+        if not chunk_ids:
+            return set()
+
+        db = self.session_factory()
+        try:
+            alive = {
+                row[0] for row in
+                db.query(ChunkModel.id).filter(ChunkModel.id.in_(set(chunk_ids.values())))
+            }
+        finally:
+            db.close()
+        return {doc_id for doc_id, cid in chunk_ids.items() if cid not in alive}
+
+    def list_versions(self) -> List[Dict]:
+        """Semua versi KB (collection dengan prefix base name)"""
+        state = get_active_state()
+        previous = (state.get("previous") or {}).get("collection")
+
+        versions = []
+        for name in list_collection_names():
+            if name != self.base_name and not name.startswith(f"{self.base_name}__"):
+                continue
+            # Arsip per tahun (kb_archive_service) bukan versi KB
+            if name.startswith(f"{self.base_name}{ARCHIVE_SEPARATOR}"):
+                continue
+            versions.append({
+                "name": name,
+                "count": self._count(name),
+                "active": name == state["collection"],
+                "staging": name == state.get("staging"),
+                "previous": name == previous,
+            })
+        return versions
+
+    def create_version(self, copy_from_active: bool = True) -> Dict:
+        """
+        Buat versi baru dan jadikan staging
+
+        Args:
+            copy_from_active: True = mulai dari isi versi aktif (ingestion
+                inkremental); False = versi kosong (ingestion penuh)
+        """
+        state = get_active_state()
+        if state.get("staging"):
+            raise ValueError(f"Versi staging masih ada: {state['staging']} (promote atau discard dulu)")
+
+        # Nama collection Chroma: 3-63 karakter
+        name = f"{self.base_name}{VERSION_SEPARATOR}{datetime.now():%Y%m%d%H%M%S}"[:63]
+        target = get_vector_store(name)
+
+        # Staging di-set sebelum copy: write baru selama copy langsung ke
+        # versi baru, dan copy tidak menimpa id yang sudah ditulis
+        set_staging_collection(name)
+
+        copied = skipped = 0
+        if copy_from_active:
+            source = get_vector_store(state["collection"])
+            offset = 0
+            while True:
+                page = source.get(
+                    limit=self.batch_size,
+                    offset=offset,
+                    include=["embeddings", "documents", "metadatas"]
+                )
+                if not page["ids"]:
+                    break
+                offset += len(page["ids"])
+
+                existing = set(target.get(ids=list(page["ids"]), include=[])["ids"])
+                deleted = self._deleted_chunk_ids(page["ids"])
+                skipped += len(deleted)
+                rows = [
+                    i for i, doc_id in enumerate(page["ids"])
+                    if doc_id not in existing and doc_id not in deleted
+                ]
+                if not rows:
+                    continue
+
+                written = [page["ids"][i] for i in rows]
+                target.upsert(
+                    written,
+                    [page["embeddings"][i] for i in rows],
+                    [page["documents"][i] for i in rows],
+                    [page["metadatas"][i] for i in rows]
+                )
+                # Chunk yang dihapus selama upsert: event delete-nya sudah
+                # lewat staging sebelum id ada di sana, jadi hapus di sini
+                stale = self._deleted_chunk_ids(written)
+                if stale:
+                    target.delete(ids=list(stale))
+                copied += len(rows) - len(stale)
+                skipped += len(stale)
+        print(
+            f"🧱 Versi KB {name} dibuat ({copied} vector dari {state['collection']}, "
+            f"{skipped} chunk terhapus dilewati), ingestion → staging"
+        )
+        return {"version": name, "copied": copied, "skipped_deleted": skipped}
+
+    def promote(self, version: Optional[str] = None) -> Dict:
+        """Flip versi aktif ke staging (atau versi tertentu) secara atomik"""
+        state = get_active_state()
+        version = version or state.get("staging")
+        if not version:
+            raise ValueError("Tidak ada versi staging untuk di-promote")
+        if version == state["collection"]:
+            raise ValueError(f"{version} sudah aktif")
+        if version not in list_collection_names():
+            raise ValueError(f"Versi tidak ditemukan: {version}")
+        if self._count(version) == 0:
+            raise ValueError(f"Versi {version} kosong, promote dibatalkan")
+
+        # Embedding config sama (versi dibuat dengan model aktif): flip
+        # hanya menukar retriever, tidak rebuild model / LLM
+        new_state = set_active_collection(version, state["embeddings"])
+        print(f"🔀 Versi KB aktif: {state['collection']} → {version}")
+        return new_state
+
+    def rollback(self) -> Dict:
+        return rollback_active_collection()
+
+    def discard_staging(self) -> Dict:
+        """Batalkan staging; ingestion kembali ke versi aktif"""
+        staging = get_active_state().get("staging")
+        if not staging:
+            raise ValueError("Tidak ada versi staging")
+        set_staging_collection(None)
+        return {"discarded": staging}
+
+    def delete_version(self, version: str) -> Dict:
+        """Hapus versi yang tidak aktif / staging / previous"""
+        state = get_active_state()
+        protected = {state["collection"], state.get("staging"), (state.get("previous") or {}).get("collection")}
+        if version in protected:
+            raise ValueError(f"{version} masih dipakai (aktif/staging/previous)")
+        if not version.startswith(f"{self.base_name}__") or version.startswith(f"{self.base_name}{ARCHIVE_SEPARATOR}"):
+            raise ValueError(f"Bukan versi KB: {version}")
+
+        if get_vectordb_type() == "numpy":
+            root = APP_CONFIG["vectordb"].get("numpy", {}).get("persist_directory", "./vector_db")
+            shutil.rmtree(os.path.join(root, version), ignore_errors=True)
+        else:
+            get_chroma_client().delete_collection(version)
+        drop_vectorstore(version)
+        return {"deleted": version}
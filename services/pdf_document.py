@@ -0,0 +1,69 @@
+# app/services/pdf_document.py
+"""
+Handle PDF bersama untuk satu extraction run
+
+Sebelumnya extractor memanggil pdfplumber.open() / fitz.open() di setiap
+halaman: tiap open mem-parse ulang xref + object tree seluruh file
+(O(pages²) untuk table extraction). PDFDocument membuka file sekali:
+- fitz: PyMuPDF Document (text, image, render)
+- plumber: pdfplumber PDF (tabel), dibuka saat pertama dipakai
+release_page() membuang cache object pdfplumber per halaman supaya
+memory tidak tumbuh sepanjang dokumen.
+
+Method extractor menerima path (kompatibel dengan pemanggil lama) atau
+PDFDocument lewat open_pdf().
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+import fitz  # PyMuPDF
+import pdfplumber
+
+
+class PDFDocument:
+
+    def __init__(self, pdf_path: str):
+        self.path = str(pdf_path)
+        self.fitz = fitz.open(self.path)
+        self._plumber = None
+
+    @property
+    def plumber(self):
+        if self._plumber is None:
+            self._plumber = pdfplumber.open(self.path)
+        return self._plumber
+
+    def __len__(self) -> int:
+        return len(self.fitz)
+
+    def plumber_page(self, page_num: int):
+        return self.plumber.pages[page_num]
+
+    def release_page(self, page_num: int) -> None:
+        """Flush cache pdfplumber halaman yang sudah selesai"""
+        if self._plumber is not None and page_num < len(self._plumber.pages):
+            self._plumber.pages[page_num].close()
+
+    def close(self) -> None:
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+        if not self.fitz.is_closed:
+            self.fitz.close()
+
+    def __enter__(self) -> "PDFDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@contextmanager
+def open_pdf(pdf: Union[str, PDFDocument]) -> Iterator[PDFDocument]:
+    """Pakai handle yang sudah terbuka, atau buka (dan tutup) dari path"""
+    if isinstance(pdf, PDFDocument):
+        yield pdf
+    else:
+        with PDFDocument(pdf) as document:
+            yield document
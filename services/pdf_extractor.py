@@ -4,14 +4,14 @@ import os
 import io
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import fitz  # PyMuPDF
 from PIL import Image
-import pdfplumber
 import easyocr
 import numpy as np
 from models.document import ExtractionMethod
+from services.pdf_document import PDFDocument, open_pdf
 
 @dataclass
 class ExtractionResult:
@@ -40,18 +40,18 @@ class PDFExtractor:
         # Initialize OCR
         self.reader = easyocr.Reader(['id', 'en'], gpu=False)
     
-    def detect_if_scanned(self, pdf_path: str, sample_pages: int = 3) -> bool:
+    def detect_if_scanned(self, pdf: Union[str, PDFDocument], sample_pages: int = 3) -> bool:
         """Deteksi apakah PDF hasil scan"""
-        doc = fitz.open(pdf_path)
-        total_pages = min(len(doc), sample_pages)
-        text_chars = 0
-        
-        for page_num in range(total_pages):
-            page = doc[page_num]
-            text = page.get_text()
-            text_chars += len(text.strip())
+        with open_pdf(pdf) as document:
+            doc = document.fitz
+            total_pages = min(len(doc), sample_pages)
+            text_chars = 0
+            
+            for page_num in range(total_pages):
+                page = doc[page_num]
+                text = page.get_text()
+                text_chars += len(text.strip())
         
-        doc.close()
         avg_chars = text_chars / total_pages
         return avg_chars < 100
     
@@ -87,13 +87,13 @@ class PDFExtractor:
         
         return full_text, avg_confidence
     
-    def extract_tables(self, pdf_path: str, page_num: int) -> List[Dict]:
+    def extract_tables(self, pdf: Union[str, PDFDocument], page_num: int) -> List[Dict]:
         """Ekstrak tables dari page"""
         tables_data = []
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                page = pdf.pages[page_num]
+            with open_pdf(pdf) as document:
+                page = document.plumber_page(page_num)
                 tables = page.extract_tables()
                 
                 for idx, table in enumerate(tables):
@@ -126,10 +126,13 @@ class PDFExtractor:
         
         return "\n".join(md_lines)
     
-    def extract_images(self, pdf_path: str, page_num: int, doc_id: int) -> List[Dict]:
+    def extract_images(self, pdf: Union[str, PDFDocument], page_num: int, doc_id: int) -> List[Dict]:
         """Ekstrak images dari page"""
+        with open_pdf(pdf) as document:
+            return self._extract_images(document.fitz, page_num, doc_id)
+    
+    def _extract_images(self, doc: fitz.Document, page_num: int, doc_id: int) -> List[Dict]:
         images_data = []
-        doc = fitz.open(pdf_path)
         page = doc[page_num]
         
         image_list = page.get_images()
@@ -163,7 +166,6 @@ class PDFExtractor:
             except Exception as e:
                 print(f"Image extraction error (page {page_num + 1}, img {img_index}): {str(e)}")
         
-        doc.close()
         return images_data
     
     def process_pdf(self, pdf_path: str, doc_id: int) -> ExtractionResult:
@@ -174,14 +176,15 @@ class PDFExtractor:
         
         print(f"\n🚀 Processing PDF (doc_id: {doc_id}): {Path(pdf_path).name}")
         
+        # Open PDF sekali untuk seluruh run (text, tabel, image)
+        document = PDFDocument(pdf_path)
+        doc = document.fitz
+        total_pages = len(doc)
+        
         # Detect if scanned
-        is_scanned = self.detect_if_scanned(pdf_path)
+        is_scanned = self.detect_if_scanned(document)
         print(f"   PDF Type: {'SCANNED' if is_scanned else 'NATIVE'}")
         
-        # Open PDF
-        doc = fitz.open(pdf_path)
-        total_pages = len(doc)
-        
         # Containers untuk hasil gabungan
         all_texts = []
         all_tables = []
@@ -208,16 +211,17 @@ class PDFExtractor:
             all_texts.append(text)
             
             # Extract tables
-            tables = self.extract_tables(pdf_path, page_num)
+            tables = self.extract_tables(document, page_num)
             all_tables.extend(tables)
             
             # Extract images
-            images = self.extract_images(pdf_path, page_num, doc_id)
+            images = self.extract_images(document, page_num, doc_id)
             all_images.extend(images)
             
+            document.release_page(page_num)
             print("✓")
         
-        doc.close()
+        document.close()
         
         # GABUNGKAN SEMUA TEXT JADI SATU RAW TEXT
         raw_text = "\n\n---PAGE BREAK---\n\n".join(all_texts)
@@ -4,14 +4,14 @@ import os
 import io
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import fitz  # PyMuPDF
 from PIL import Image
-import pdfplumber
 import easyocr
 import numpy as np
 from models.document import ExtractionMethod
+from services.pdf_document import PDFDocument, open_pdf
 import anthropic  # atau openai
 import base64
 
@@ -59,19 +59,19 @@ class EnhancedPDFExtractor:
             self.llm_client = None
             print("⚠️  LLM not initialized. Set anthropic_api_key for better table interpretation.")
     
-    def detect_if_scanned(self, pdf_path: str, sample_pages: int = 3) -> bool:
+    def detect_if_scanned(self, pdf: Union[str, PDFDocument], sample_pages: int = 3) -> bool:
         """Deteksi apakah PDF hasil scan"""
         try:
-            doc = fitz.open(pdf_path)
-            total_pages = min(len(doc), sample_pages)
-            text_chars = 0
-            
-            for page_num in range(total_pages):
-                page = doc[page_num]
-                text = page.get_text()
-                text_chars += len(text.strip())
+            with open_pdf(pdf) as document:
+                doc = document.fitz
+                total_pages = min(len(doc), sample_pages)
+                text_chars = 0
+                
+                for page_num in range(total_pages):
+                    page = doc[page_num]
+                    text = page.get_text()
+                    text_chars += len(text.strip())
             
-            doc.close()
             avg_chars = text_chars / total_pages
             return avg_chars < 100
         except Exception as e:
@@ -121,33 +121,37 @@ class EnhancedPDFExtractor:
             print(f"⚠️  OCR error: {e}")
             return "", 0.0
     
-    def extract_tables_enhanced(self, pdf_path: str, page_num: int) -> List[Dict]:
+    def extract_tables_enhanced(self, pdf: Union[str, PDFDocument], page_num: int) -> List[Dict]:
         """
         Enhanced table extraction dengan multiple methods
         """
+        with open_pdf(pdf) as document:
+            return self._extract_tables_enhanced(document, page_num)
+    
+    def _extract_tables_enhanced(self, document: PDFDocument, page_num: int) -> List[Dict]:
         tables_data = []
         
         # Method 1: pdfplumber
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                if page_num < len(pdf.pages):
-                    page = pdf.pages[page_num]
-                    tables = page.extract_tables()
-                    
-                    for idx, table in enumerate(tables):
-                        if table and len(table) > 0:
-                            # Clean table data
-                            cleaned_table = self._clean_table(table)
-                            
-                            tables_data.append({
-                                'page': page_num + 1,
-                                'table_index': idx,
-                                'method': 'pdfplumber',
-                                'data': cleaned_table,
-                                'markdown': self._table_to_markdown(cleaned_table),
-                                'row_count': len(cleaned_table),
-                                'col_count': len(cleaned_table[0]) if cleaned_table else 0
-                            })
+            pdf = document.plumber
+            if page_num < len(pdf.pages):
+                page = pdf.pages[page_num]
+                tables = page.extract_tables()
+                
+                for idx, table in enumerate(tables):
+                    if table and len(table) > 0:
+                        # Clean table data
+                        cleaned_table = self._clean_table(table)
+                        
+                        tables_data.append({
+                            'page': page_num + 1,
+                            'table_index': idx,
+                            'method': 'pdfplumber',
+                            'data': cleaned_table,
+                            'markdown': self._table_to_markdown(cleaned_table),
+                            'row_count': len(cleaned_table),
+                            'col_count': len(cleaned_table[0]) if cleaned_table else 0
+                        })
         except Exception as e:
             print(f"⚠️  pdfplumber table extraction error (page {page_num + 1}): {str(e)}")
         
@@ -155,11 +159,9 @@ class EnhancedPDFExtractor:
         if self.use_llm and self.llm_client and len(tables_data) > 0:
             try:
                 # Get page as image
-                doc = fitz.open(pdf_path)
-                page = doc[page_num]
+                page = document.fitz[page_num]
                 pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
                 img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                doc.close()
                 
                 # Convert to base64 for Claude
                 buffered = io.BytesIO()
@@ -312,12 +314,19 @@ Berikan interpretasi lengkap dalam bahasa Indonesia:"""
             print(f"⚠️  Image interpretation error: {e}")
             return ""
     
-    def extract_images(self, pdf_path: str, page_num: int, doc_id: int) -> List[Dict]:
+    def extract_images(self, pdf: Union[str, PDFDocument], page_num: int, doc_id: int) -> List[Dict]:
         """Ekstrak images dari page dengan LLM interpretation"""
+        try:
+            with open_pdf(pdf) as document:
+                return self._extract_images(document.fitz, page_num, doc_id)
+        except Exception as e:
+            print(f"⚠️  Error opening PDF for images: {e}")
+            return []
+    
+    def _extract_images(self, doc: fitz.Document, page_num: int, doc_id: int) -> List[Dict]:
         images_data = []
         
         try:
-            doc = fitz.open(pdf_path)
             page = doc[page_num]
             
             image_list = page.get_images()
@@ -358,10 +367,8 @@ Berikan interpretasi lengkap dalam bahasa Indonesia:"""
                     })
                 except Exception as e:
                     print(f"⚠️  Image extraction error (page {page_num + 1}, img {img_index}): {str(e)}")
-            
-            doc.close()
         except Exception as e:
-            print(f"⚠️  Error opening PDF for images: {e}")
+            print(f"⚠️  Error reading images (page {page_num + 1}): {e}")
         
         return images_data
     
@@ -410,13 +417,15 @@ Berikan interpretasi lengkap dalam bahasa Indonesia:"""
         
         print(f"\n🚀 Processing PDF (Enhanced Mode, doc_id: {doc_id}): {Path(pdf_path).name}")
         
+        # Open PDF sekali untuk seluruh run (text, tabel, image)
+        document = PDFDocument(pdf_path)
+        
         # Detect if scanned
-        is_scanned = self.detect_if_scanned(pdf_path)
+        is_scanned = self.detect_if_scanned(document)
         print(f"   PDF Type: {'SCANNED' if is_scanned else 'NATIVE'}")
         
         try:
-            # Open PDF
-            doc = fitz.open(pdf_path)
+            doc = document.fitz
             total_pages = len(doc)
             
             # Containers
@@ -443,21 +452,20 @@ Berikan interpretasi lengkap dalam bahasa Indonesia:"""
                     extraction_method = ExtractionMethod.NATIVE
                 
                 # Extract tables (enhanced)
-                tables = self.extract_tables_enhanced(pdf_path, page_num)
+                tables = self.extract_tables_enhanced(document, page_num)
                 all_tables.extend(tables)
                 
                 # Extract images (with LLM)
-                images = self.extract_images(pdf_path, page_num, doc_id)
+                images = self.extract_images(document, page_num, doc_id)
                 all_images.extend(images)
                 
                 # Construct enhanced text for this page
                 page_enhanced_text = self.construct_enhanced_text(text, tables, images)
                 all_texts.append(page_enhanced_text)
                 
+                document.release_page(page_num)
                 print("✓")
             
-            doc.close()
-            
             # GABUNGKAN SEMUA ENHANCED TEXT
             raw_text = "\n\n---PAGE BREAK---\n\n".join(all_texts)
             
@@ -493,4 +501,7 @@ Berikan interpretasi lengkap dalam bahasa Indonesia:"""
         
         except Exception as e:
             print(f"\n❌ Enhanced PDF processing failed: {e}")
-            raise e
\ No newline at end of file
+            raise e
+        
+        finally:
+            document.close()
\ No newline at end of file
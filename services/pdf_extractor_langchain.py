@@ -8,11 +8,10 @@ import os
 import io
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import fitz  # PyMuPDF
 from PIL import Image
-import pdfplumber
 import easyocr
 import numpy as np
 import base64
@@ -24,6 +23,7 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 
 from models.document import ExtractionMethod
+from services.pdf_document import PDFDocument, open_pdf
 
 @dataclass
 class ExtractionResult:
@@ -106,19 +106,19 @@ class LangChainPDFExtractor:
             self.openai_available = False
             self.llm = None
     
-    def detect_if_scanned(self, pdf_path: str, sample_pages: int = 3) -> bool:
+    def detect_if_scanned(self, pdf: Union[str, PDFDocument], sample_pages: int = 3) -> bool:
         """Deteksi apakah PDF hasil scan"""
         try:
-            doc = fitz.open(pdf_path)
-            total_pages = min(len(doc), sample_pages)
-            text_chars = 0
-            
-            for page_num in range(total_pages):
-                page = doc[page_num]
-                text = page.get_text()
-                text_chars += len(text.strip())
+            with open_pdf(pdf) as document:
+                doc = document.fitz
+                total_pages = min(len(doc), sample_pages)
+                text_chars = 0
+                
+                for page_num in range(total_pages):
+                    page = doc[page_num]
+                    text = page.get_text()
+                    text_chars += len(text.strip())
             
-            doc.close()
             avg_chars = text_chars / total_pages
             return avg_chars < 100
         except Exception as e:
@@ -178,14 +178,15 @@ class LangChainPDFExtractor:
             print(f"⚠️  OCR error: {e}")
             return "", 0.0
     
-    def extract_tables_enhanced(self, pdf_path: str, page_num: int) -> List[Dict]:
+    def extract_tables_enhanced(self, pdf: Union[str, PDFDocument], page_num: int) -> List[Dict]:
         """Enhanced table extraction"""
         tables_data = []
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                if page_num < len(pdf.pages):
-                    page = pdf.pages[page_num]
+            with open_pdf(pdf) as document:
+                plumber = document.plumber
+                if page_num < len(plumber.pages):
+                    page = plumber.pages[page_num]
                     tables = page.extract_tables()
                     
                     if tables and self.show_progress:
@@ -348,10 +349,13 @@ Berikan ringkasan lengkap dalam Bahasa Indonesia:"""
                 parts.append("\n")
         
         return "\n".join(parts)
-    def extract_images(self, pdf_path: str, page_num: int, doc_id: int) -> List[Dict]:
+    def extract_images(self, pdf: Union[str, PDFDocument], page_num: int, doc_id: int) -> List[Dict]:
         """Ekstrak images dari page"""
+        with open_pdf(pdf) as document:
+            return self._extract_images(document.fitz, page_num, doc_id)
+    
+    def _extract_images(self, doc: fitz.Document, page_num: int, doc_id: int) -> List[Dict]:
         images_data = []
-        doc = fitz.open(pdf_path)
         page = doc[page_num]
         
         image_list = page.get_images()
@@ -385,7 +389,6 @@ Berikan ringkasan lengkap dalam Bahasa Indonesia:"""
             except Exception as e:
                 print(f"Image extraction error (page {page_num + 1}, img {img_index}): {str(e)}")
         
-        doc.close()
         return images_data
     def process_pdf(self, pdf_path: str, doc_id: int) -> ExtractionResult:
         """
@@ -403,12 +406,15 @@ Berikan ringkasan lengkap dalam Bahasa Indonesia:"""
         print(f"🔧 OpenAI Status: {'✅ Available' if self.openai_available else '❌ Not Available'}")
         print(f"{'='*70}\n")
         
+        # Open PDF sekali untuk seluruh run (text, tabel, image)
+        document = PDFDocument(pdf_path)
+        
         # Detect if scanned
-        is_scanned = self.detect_if_scanned(pdf_path)
+        is_scanned = self.detect_if_scanned(document)
         print(f"📊 PDF Type: {'📸 SCANNED' if is_scanned else '📝 NATIVE'}")
         
         try:
-            doc = fitz.open(pdf_path)
+            doc = document.fitz
             total_pages = len(doc)
             print(f"📑 Total Pages: {total_pages}\n")
             
@@ -452,14 +458,16 @@ Berikan ringkasan lengkap dalam Bahasa Indonesia:"""
                 all_texts.append(text)
                 
                 # Extract tables
-                tables = self.extract_tables_enhanced(pdf_path, page_num)
+                tables = self.extract_tables_enhanced(document, page_num)
                 all_tables.extend(tables)
                 
                 #Skip images for speed (bisa di-enable jika perlu)
-                images = self.extract_images(pdf_path, page_num, doc_id)
+                images = self.extract_images(document, page_num, doc_id)
                 all_images.extend(images)
+                
+                document.release_page(page_num)
             
-            doc.close()
+            document.close()
             
             # ✅ GENERATE AI SUMMARY sebagai raw_text
             print("\n📦 Generating document summary with OpenAI...")
@@ -522,5 +530,6 @@ Berikan ringkasan lengkap dalam Bahasa Indonesia:"""
             )
         
         except Exception as e:
+            document.close()
             print(f"\n❌ PDF processing failed: {e}")
             raise e
\ No newline at end of file
@@ -1,10 +1,18 @@
 
 from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import math
+import multiprocessing
 import os
+import re
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+import threading
 import fitz  # PyMuPDF untuk extract text
 import pdfplumber  # untuk table
 from langchain_openai import ChatOpenAI
@@ -20,13 +28,166 @@ class KnowledgeResult:
     has_tables: bool
     processing_duration: float
     ai_model: str
+    # Mode incremental: per halaman {page_number, content_sha256, text,
+    # tables, knowledge_text, reused}
+    pages: List[Dict] = field(default_factory=list)
+
+def extract_page_range(pdf_path: str, start: int, end: int) -> List[Tuple[int, str, List[List]]]:
+    """
+    Extract text (PyMuPDF) + tabel (pdfplumber) untuk halaman [start, end)
+
+    Top-level supaya bisa dijalankan worker ProcessPoolExecutor; file dibuka
+    sekali per range. Returns: [(page_num, text, tables)]
+    """
+    pages = []
+    doc = fitz.open(pdf_path)
+    # PDF yang terbaca PyMuPDF tapi tidak oleh pdfplumber (terenkripsi /
+    # rusak): text tetap diambil, tanpa tabel
+    try:
+        pdf = pdfplumber.open(pdf_path)
+    except Exception as e:
+        print(f"⚠️  Table extraction error: {e}")
+        pdf = None
+    try:
+        for page_num in range(start, end):
+            text = doc[page_num].get_text()
+            page_tables = []
+            if pdf is not None:
+                try:
+                    page_tables = [table for table in pdf.pages[page_num].extract_tables() if table]
+                except Exception as e:
+                    print(f"⚠️  Table extraction error (page {page_num + 1}): {e}")
+            pages.append((page_num, text, page_tables))
+    finally:
+        if pdf is not None:
+            pdf.close()
+        doc.close()
+    return pages
+
+
+REWRITE_SYSTEM_PROMPT = """Anda adalah asisten AI yang ahli dalam mengubah dokumen PDF menjadi knowledge base yang terstruktur dan mudah dipahami.
+
+Tugas Anda: Tulis ulang dokumen ini menjadi knowledge base yang lengkap dan informatif dalam Bahasa Indonesia.
+
+PENTING:
+- Jangan membuat ringkasan, tapi tulis ulang SEMUA informasi penting dengan lengkap
+- Jelaskan SEMUA data, angka, kategori, dan detail dengan jelas
+- Jika ada tabel, jelaskan SEMUA baris dan kolom dengan detail
+- Gunakan bahasa yang natural dan mudah dipahami
+- Susun dalam paragraf yang mengalir (TIDAK pakai bullet points)
+- Fokus pada akurasi dan kelengkapan informasi"""
+
+# Awal section: BAB / Pasal / Bagian, penomoran "1." / "A." / "II.", atau judul huruf kapital
+SECTION_HEADING = re.compile(
+    r"^\s*(BAB\s+[IVXLC\d]+|Pasal\s+\d+|Bagian\s+\w+|(\d+|[A-Z]|[IVXLC]+)[.)]\s+\S|[A-Z][A-Z0-9 ,/&()-]{4,}$)"
+)
+
+# Batas mode single call (ai_rewrite_to_knowledge); lebih dari ini → map-reduce
+SINGLE_CALL_MAX_CHARS = 8000
+SINGLE_CALL_MAX_TABLES = 3
+
+
+# progress(stage, fraction 0-1): dipanggil per tahap / per bagian selesai.
+# Exception dari callback (mis. job dibatalkan) menghentikan proses.
+ProgressCallback = Callable[[str, float], None]
+
+
+def page_sha256(text: str, tables: List[List]) -> str:
+    """Hash isi halaman (text + tabel) untuk incremental ingestion"""
+    payload = json.dumps([text, tables], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def split_sections(text: str, max_chars: int) -> List[str]:
+    """
+    Potong text jadi bagian <= max_chars, dipotong di awal section
+    (SECTION_HEADING) jika bagian sudah setengah penuh, selain itu di
+    batas baris
+    """
+    parts, current, size = [], [], 0
+    for line in text.split("\n"):
+        line_len = len(line) + 1
+        at_heading = SECTION_HEADING.match(line) is not None
+        if current and (size + line_len > max_chars or (at_heading and size >= max_chars // 2)):
+            parts.append("\n".join(current).strip())
+            current, size = [], 0
+        current.append(line)
+        size += line_len
+    if current:
+        parts.append("\n".join(current).strip())
+    return [part for part in parts if part]
+
+
+def _run_async(coro):
+    """Jalankan coroutine dari kode sync (process_document berjalan di thread)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Dipanggil dari dalam event loop: jalankan di thread terpisah
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_key: Optional[Tuple[int, str]] = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool(workers: int, start_method: str = "spawn") -> ProcessPoolExecutor:
+    """
+    Process pool bersama (dibuat sekali per proses): biaya start worker
+    (spawn = import ulang modul) hanya dibayar di dokumen pertama
+    """
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is None or _pool_key != (workers, start_method):
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
+            _pool_key = (workers, start_method)
+        return _pool
+
+
+def shutdown_extraction_pool() -> None:
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool, _pool_key = None, None
+
 
 class PDFToKnowledgeConverter:
     """
     Converter sederhana: PDF → AI-generated Knowledge Base
     """
     
-    def __init__(self,openai_api_key: Optional[str] = None,model: str = "gpt-4o-mini"):
+    def __init__(self,
+                 openai_api_key: Optional[str] = None,
+                 model: str = "gpt-4o-mini",
+                 parallel_extraction: bool = False,
+                 max_workers: Optional[int] = None,
+                 min_pages_parallel: int = 8,
+                 start_method: str = "spawn",
+                 rewrite_mode: str = "single",
+                 max_part_chars: int = 6000,
+                 rewrite_concurrency: int = 4,
+                 merge_pass: bool = True):
+        """
+        Args:
+            parallel_extraction: Extract halaman paralel (ProcessPoolExecutor)
+            max_workers: Jumlah proses (default: jumlah CPU)
+            min_pages_parallel: PDF lebih pendek diproses sequential
+                (overhead kirim task ke proses lain lebih besar dari hasilnya)
+            start_method: multiprocessing start method; "spawn" aman
+                dipanggil dari proses API yang punya banyak thread
+            rewrite_mode: "single" (satu call, text dipotong 8000 karakter,
+                max 3 tabel) atau "map_reduce" (dokumen panjang ditulis
+                ulang per section secara paralel, tanpa ada yang dipotong)
+            max_part_chars: Ukuran maksimal satu section (map-reduce)
+            rewrite_concurrency: Maksimal call LLM bersamaan (map-reduce)
+            merge_pass: Tambah paragraf pembuka hasil LLM saat menggabung
+        """
         
         # Initialize OpenAI
         if not openai_api_key:
@@ -43,8 +204,20 @@ class PDFToKnowledgeConverter:
         )
         
         self.model = model
+        self.parallel_extraction = parallel_extraction
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_pages_parallel = max(1, min_pages_parallel)
+        self.start_method = start_method
+        self.rewrite_mode = rewrite_mode
+        self.max_part_chars = max(1000, max_part_chars)
+        self.rewrite_concurrency = max(1, rewrite_concurrency)
+        self.merge_pass = merge_pass
         print(f"✅ PDF to Knowledge Converter initialized")
         print(f"   AI Model: {model}")
+        if parallel_extraction:
+            print(f"   Parallel extraction: {self.max_workers} workers")
+        if rewrite_mode == "map_reduce":
+            print(f"   Rewrite: map-reduce ({self.rewrite_concurrency} concurrent)")
     
     def extract_pdf_content(self, pdf_path: str) -> tuple[str, List[Dict], int]:
         """
@@ -53,43 +226,68 @@ class PDFToKnowledgeConverter:
         """
         print(f"\n📄 Extracting content from: {Path(pdf_path).name}")
         
-        # Extract text dengan PyMuPDF
+        pages = self.extract_pages(pdf_path)
+        combined_text, tables = self._combine_pages(pages)
+        total_pages = len(pages)
+        
+        print(f"   ✓ Extracted {len(combined_text)} characters")
+        print(f"   ✓ Found {len(tables)} tables")
+        print(f"   ✓ Total pages: {total_pages}")
+        
+        return combined_text, tables, total_pages
+    
+    def extract_pages(self, pdf_path: str) -> List[Tuple[int, str, List[List]]]:
+        """Text + tabel per halaman (paralel jika parallel_extraction)"""
         doc = fitz.open(pdf_path)
         total_pages = len(doc)
+        doc.close()
         
+        workers = self._worker_count(total_pages)
+        if workers > 1:
+            return self._extract_parallel(pdf_path, total_pages, workers)
+        return extract_page_range(pdf_path, 0, total_pages)
+    
+    def _combine_pages(self, pages: List[Tuple[int, str, List[List]]]) -> Tuple[str, List[Dict]]:
+        # Gabung sesuai urutan halaman
         all_text = []
-        for page_num in range(total_pages):
-            page = doc[page_num]
-            text = page.get_text()
+        tables = []
+        for page_num, text, page_tables in pages:
             if text.strip():
                 all_text.append(text)
+            for table in page_tables:
+                tables.append({
+                    'page': page_num + 1,
+                    'data': table,
+                    'markdown': self._table_to_markdown(table)
+                })
         
-        doc.close()
-        
-        combined_text = "\n\n".join(all_text)
+        return "\n\n".join(all_text), tables
+    
+    def _worker_count(self, total_pages: int) -> int:
+        if not self.parallel_extraction or total_pages < self.min_pages_parallel:
+            return 1
+        return max(1, min(self.max_workers, total_pages // self.min_pages_parallel))
+    
+    def _extract_parallel(self, pdf_path: str, total_pages: int, workers: int) -> List[Tuple[int, str, List[List]]]:
+        """
+        Bagi halaman ke beberapa range (2 per worker supaya halaman berat /
+        banyak tabel tersebar), extract paralel, urutkan per halaman
+        """
+        range_size = math.ceil(total_pages / (workers * 2))
+        ranges = [(start, min(start + range_size, total_pages)) for start in range(0, total_pages, range_size)]
+        print(f"   ⚡ Parallel extraction: {len(ranges)} ranges, {workers} workers")
         
-        # Extract tables dengan pdfplumber
-        tables = []
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    page_tables = page.extract_tables()
-                    if page_tables:
-                        for idx, table in enumerate(page_tables):
-                            if table:
-                                tables.append({
-                                    'page': page_num + 1,
-                                    'data': table,
-                                    'markdown': self._table_to_markdown(table)
-                                })
+            pool = get_extraction_pool(self.max_workers, self.start_method)
+            futures = [pool.submit(extract_page_range, pdf_path, start, end) for start, end in ranges]
+            pages = [page for future in futures for page in future.result()]
         except Exception as e:
-            print(f"⚠️  Table extraction error: {e}")
+            # Mis. BrokenProcessPool (worker crash): pool dibuat ulang di dokumen berikutnya
+            print(f"⚠️  Parallel extraction failed, fallback sequential: {e}")
+            shutdown_extraction_pool()
+            return extract_page_range(pdf_path, 0, total_pages)
         
-        print(f"   ✓ Extracted {len(combined_text)} characters")
-        print(f"   ✓ Found {len(tables)} tables")
-        print(f"   ✓ Total pages: {total_pages}")
-        
-        return combined_text, tables, total_pages
+        return sorted(pages, key=lambda page: page[0])
     
     def _table_to_markdown(self, table: List[List]) -> str:
         """Convert table to markdown"""
@@ -115,40 +313,37 @@ class PDFToKnowledgeConverter:
     def ai_rewrite_to_knowledge(self, 
                                  text: str, 
                                  tables: List[Dict],
-                                 doc_title: str) -> str:
+                                 doc_title: str,
+                                 progress: Optional[ProgressCallback] = None) -> str:
         """
         Step 2: AI menulis ulang menjadi knowledge base yang terstruktur
         """
+        # Dokumen yang akan terpotong di mode single → map-reduce
+        if self.rewrite_mode == "map_reduce" and (
+            len(text) > SINGLE_CALL_MAX_CHARS or len(tables) > SINGLE_CALL_MAX_TABLES
+        ):
+            return self.ai_rewrite_map_reduce(text, tables, doc_title, progress)
+        
         print(f"\n🤖 AI is rewriting document into knowledge base...")
         
         # Prepare content untuk AI
         content = f"JUDUL DOKUMEN: {doc_title}\n\n"
         
         # Limit text kalau terlalu panjang
-        if len(text) > 8000:
-            content += f"ISI DOKUMEN (excerpt):\n{text[:8000]}...\n\n"
+        if len(text) > SINGLE_CALL_MAX_CHARS:
+            content += f"ISI DOKUMEN (excerpt):\n{text[:SINGLE_CALL_MAX_CHARS]}...\n\n"
         else:
             content += f"ISI DOKUMEN:\n{text}\n\n"
         
         # Add tables
         if tables:
             content += "TABEL:\n"
-            for idx, table in enumerate(tables[:3]):  # Max 3 tables
+            for idx, table in enumerate(tables[:SINGLE_CALL_MAX_TABLES]):
                 content += f"\nTabel {idx + 1} (Halaman {table['page']}):\n"
                 content += table.get('markdown', '')[:1000] + "\n"
         
         # System prompt
-        system_prompt = """Anda adalah asisten AI yang ahli dalam mengubah dokumen PDF menjadi knowledge base yang terstruktur dan mudah dipahami.
-
-Tugas Anda: Tulis ulang dokumen ini menjadi knowledge base yang lengkap dan informatif dalam Bahasa Indonesia.
-
-PENTING:
-- Jangan membuat ringkasan, tapi tulis ulang SEMUA informasi penting dengan lengkap
-- Jelaskan SEMUA data, angka, kategori, dan detail dengan jelas
-- Jika ada tabel, jelaskan SEMUA baris dan kolom dengan detail
-- Gunakan bahasa yang natural dan mudah dipahami
-- Susun dalam paragraf yang mengalir (TIDAK pakai bullet points)
-- Fokus pada akurasi dan kelengkapan informasi"""
+        system_prompt = REWRITE_SYSTEM_PROMPT
 
         # User prompt
         user_prompt = f"""{content}
@@ -185,6 +380,175 @@ Hasil knowledge base:"""
             # Fallback: return original with structure
             return self._fallback_structure(text, tables)
     
+    def ai_rewrite_map_reduce(self,
+                              text: str,
+                              tables: List[Dict],
+                              doc_title: str,
+                              progress: Optional[ProgressCallback] = None) -> str:
+        """
+        Step 2 (dokumen panjang): map-reduce
+        
+        Map: setiap section (split_sections) dan kelompok tabel ditulis ulang
+        terpisah, maksimal rewrite_concurrency call LLM bersamaan.
+        Reduce: gabung sesuai urutan + paragraf pembuka (merge_pass).
+        """
+        parts = [("ISI DOKUMEN", part) for part in split_sections(text, self.max_part_chars)]
+        parts += [("TABEL", part) for part in self._table_parts(tables)]
+        
+        print(f"\n🤖 AI is rewriting document (map-reduce): {len(parts)} parts, "
+              f"max {self.rewrite_concurrency} concurrent")
+        start = time.time()
+        
+        rewritten = _run_async(self._rewrite_parts(parts, doc_title, progress))
+        
+        # Bagian yang gagal memakai isi asli: tidak ada informasi yang hilang
+        knowledge_text = "\n\n".join(
+            result if result is not None else content
+            for result, (_, content) in zip(rewritten, parts)
+        )
+        if self.merge_pass:
+            intro = self._write_intro(knowledge_text, doc_title)
+            if intro:
+                knowledge_text = f"{intro}\n\n{knowledge_text}"
+        
+        print(f"   ✓ Map-reduce rewriting completed in {time.time() - start:.2f}s")
+        print(f"   ✓ Knowledge base length: {len(knowledge_text)} characters")
+        return knowledge_text
+    
+    def _table_parts(self, tables: List[Dict]) -> List[str]:
+        """Kelompokkan tabel (markdown) menjadi bagian <= max_part_chars"""
+        parts, current = [], ""
+        for idx, table in enumerate(tables):
+            block = f"Tabel {idx + 1} (Halaman {table['page']}):\n{table.get('markdown', '')}\n"
+            if current and len(current) + len(block) > self.max_part_chars:
+                parts.append(current)
+                current = ""
+            current += block
+        if current:
+            parts.append(current)
+        return parts
+    
+    async def _rewrite_parts(self,
+                             parts: List[Tuple[str, str]],
+                             doc_title: str,
+                             progress: Optional[ProgressCallback] = None) -> List[Optional[str]]:
+        """Rewrite paralel (bounded); None = call LLM gagal"""
+        semaphore = asyncio.Semaphore(self.rewrite_concurrency)
+        done = 0
+        
+        async def rewrite(index: int, label: str, content: str) -> Optional[str]:
+            user_prompt = f"""JUDUL DOKUMEN: {doc_title}
+BAGIAN {index + 1} DARI {len(parts)} ({label}):
+{content}
+
+Tulis ulang BAGIAN di atas menjadi knowledge base yang lengkap dalam Bahasa Indonesia.
+
+PEDOMAN:
+1. Jelaskan SEMUA informasi, angka, dan detail di bagian ini
+2. Jika ada tabel, jelaskan SEMUA baris dan kolom dengan lengkap
+3. Gunakan paragraf yang mengalir (hindari bullet points)
+4. Jangan menulis pembuka atau penutup dokumen (bagian lain ditulis terpisah)
+
+Hasil knowledge base:"""
+            nonlocal done
+            async with semaphore:
+                try:
+                    response = await self.llm.ainvoke([
+                        SystemMessage(content=REWRITE_SYSTEM_PROMPT),
+                        HumanMessage(content=user_prompt)
+                    ])
+                    print(f"   ✓ Part {index + 1}/{len(parts)} rewritten")
+                    result = response.content.strip()
+                except Exception as e:
+                    print(f"   ✗ Part {index + 1}/{len(parts)} failed, using original text: {e}")
+                    result = None
+            done += 1
+            if progress:
+                progress("rewrite", done / len(parts))
+            return result
+        
+        return await asyncio.gather(*(rewrite(i, label, content) for i, (label, content) in enumerate(parts)))
+    
+    def rewrite_pages(self,
+                      pages: List[Tuple[int, str, List[List]]],
+                      doc_title: str,
+                      cached_pages: Dict[int, Tuple[str, str]],
+                      progress: Optional[ProgressCallback] = None) -> List[Dict]:
+        """
+        Step 2 (incremental): rewrite per halaman
+        
+        Halaman yang hash-nya sama dengan cached_pages ({page_number:
+        (content_sha256, knowledge_text)}) dan sudah punya knowledge_text
+        per halaman memakai hasil lama tanpa call LLM; sisanya ditulis
+        ulang paralel (halaman panjang dipecah split_sections).
+        Halaman yang gagal memakai isi asli dengan content_sha256 None
+        supaya dicoba lagi di proses berikutnya.
+        """
+        results, parts, owners = [], [], []
+        for page_num, text, tables in pages:
+            sha = page_sha256(text, tables)
+            cached = cached_pages.get(page_num + 1)
+            reused = cached is not None and cached[0] == sha and cached[1] is not None
+            results.append(self._page_record((page_num, text, tables), sha, cached[1] if reused else "", reused))
+            if reused:
+                continue
+            
+            content = text.strip()
+            for table in tables:
+                content += f"\n\nTabel (Halaman {page_num + 1}):\n{self._table_to_markdown(table)}"
+            for part in split_sections(content, self.max_part_chars):
+                parts.append((f"HALAMAN {page_num + 1}", part))
+                owners.append(len(results) - 1)
+        
+        reused_count = sum(1 for page in results if page["reused"])
+        print(f"\n🤖 AI is rewriting {len(results) - reused_count}/{len(results)} changed pages "
+              f"({len(parts)} parts, max {self.rewrite_concurrency} concurrent)")
+        
+        rewritten = _run_async(self._rewrite_parts(parts, doc_title, progress)) if parts else []
+        
+        for owner, result, (_, content) in zip(owners, rewritten, parts):
+            page = results[owner]
+            if result is None:
+                page["content_sha256"] = None
+            page["knowledge_text"] = "\n\n".join(filter(None, [page["knowledge_text"], result or content]))
+        
+        return results
+    
+    @staticmethod
+    def _page_record(page: Tuple[int, str, List[List]],
+                     sha: Optional[str],
+                     knowledge_text: Optional[str],
+                     reused: bool = False) -> Dict:
+        page_num, text, tables = page
+        return {
+            "page_number": page_num + 1,
+            "content_sha256": sha,
+            "text": text,
+            "tables": tables,
+            "knowledge_text": knowledge_text,
+            "reused": reused,
+        }
+    
+    def _write_intro(self, knowledge_text: str, doc_title: str) -> str:
+        """Merge pass ringan: paragraf pembuka tujuan/konteks dokumen"""
+        prompt = f"""JUDUL DOKUMEN: {doc_title}
+
+AWAL KNOWLEDGE BASE:
+{knowledge_text[:3000]}
+
+Tulis SATU paragraf pembuka (maksimal 5 kalimat) yang menjelaskan tujuan dan konteks dokumen ini dalam Bahasa Indonesia. Jangan mengulang detail angka.
+
+Paragraf pembuka:"""
+        try:
+            response = self.llm.invoke([
+                SystemMessage(content=REWRITE_SYSTEM_PROMPT),
+                HumanMessage(content=prompt)
+            ])
+            return response.content.strip()
+        except Exception as e:
+            print(f"   ⚠️  Merge pass skipped: {e}")
+            return ""
+    
     def _fallback_structure(self, text: str, tables: List[Dict]) -> str:
         """Fallback jika AI gagal"""
         parts = [
@@ -199,9 +563,25 @@ Hasil knowledge base:"""
         
         return "\n".join(parts)
     
-    def process(self, pdf_path: str, doc_title: Optional[str] = None) -> KnowledgeResult:
+    def process(self,
+                pdf_path: str,
+                doc_title: Optional[str] = None,
+                cached_pages: Optional[Dict[int, Tuple[str, Optional[str]]]] = None,
+                previous_knowledge: Optional[str] = None,
+                progress: Optional[ProgressCallback] = None) -> KnowledgeResult:
         """
         Main function: PDF → Knowledge Base
+        
+        Args:
+            cached_pages: Hash halaman proses sebelumnya (incremental).
+                None = incremental mati: rewrite sesuai rewrite_mode.
+                Selain itu selalu mode per halaman (rewrite_pages): kosong =
+                belum pernah diproses, semua halaman ditulis ulang dan
+                knowledge per halaman disimpan di result.pages; berisi =
+                hanya halaman yang berubah ke LLM.
+            previous_knowledge: Knowledge text versi sebelumnya; dipakai
+                utuh jika tidak ada halaman yang berubah
+            progress: callback per tahap ("extract", "rewrite")
         """
         start_time = time.time()
         
@@ -215,11 +595,42 @@ Hasil knowledge base:"""
         print(f"🤖 AI Model: {self.model}")
         print(f"{'='*70}")
         
+        if progress:
+            progress("extract", 0.0)
+        
         # Step 1: Extract content
-        text, tables, total_pages = self.extract_pdf_content(pdf_path)
+        raw_pages = self.extract_pages(pdf_path)
+        text, tables = self._combine_pages(raw_pages)
+        total_pages = len(raw_pages)
+        print(f"   ✓ Extracted {len(text)} characters, {len(tables)} tables, {total_pages} pages")
+        if progress:
+            progress("rewrite", 0.0)
         
         # Step 2: AI rewrite
-        knowledge_text = self.ai_rewrite_to_knowledge(text, tables, doc_title)
+        pages = []
+        hashes = [page_sha256(page_text, page_tables) for _, page_text, page_tables in raw_pages]
+        unchanged = bool(cached_pages) and len(cached_pages) == total_pages and all(
+            cached_pages.get(page_num + 1, (None,))[0] == sha
+            for (page_num, _, _), sha in zip(raw_pages, hashes)
+        )
+        
+        if unchanged and previous_knowledge:
+            # Isi semua halaman sama (mis. hanya metadata PDF berubah): tanpa call LLM
+            print("\n♻️  No page changed, reusing previous knowledge base")
+            knowledge_text = previous_knowledge
+            pages = [
+                self._page_record(page, sha, cached_pages[page[0] + 1][1], reused=True)
+                for page, sha in zip(raw_pages, hashes)
+            ]
+        elif cached_pages is not None:
+            # Per halaman: hanya halaman yang berubah ditulis ulang; proses
+            # pertama menulis semua halaman sehingga revisi berikutnya
+            # sudah punya knowledge per halaman untuk dipakai ulang
+            pages = self.rewrite_pages(raw_pages, doc_title, cached_pages, progress)
+            knowledge_text = "\n\n".join(page["knowledge_text"] for page in pages if page["knowledge_text"])
+        else:
+            # Incremental mati: rewrite_mode biasa (single / map-reduce)
+            knowledge_text = self.ai_rewrite_to_knowledge(text, tables, doc_title, progress)
         
         duration = time.time() - start_time
         
@@ -231,6 +642,8 @@ Hasil knowledge base:"""
         print(f"📝 Original: {len(text):,} chars")
         print(f"✨ Knowledge Base: {len(knowledge_text):,} chars")
         print(f"📊 Tables: {len(tables)}")
+        if pages:
+            print(f"♻️  Reused pages: {sum(1 for page in pages if page['reused'])}/{len(pages)}")
         print(f"{'='*70}\n")
         
         return KnowledgeResult(
@@ -240,5 +653,6 @@ Hasil knowledge base:"""
             knowledge_length=len(knowledge_text),
             has_tables=len(tables) > 0,
             processing_duration=duration,
-            ai_model=self.model
+            ai_model=self.model,
+            pages=pages
         )
\ No newline at end of file
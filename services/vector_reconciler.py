@@ -0,0 +1,181 @@
+# app/services/vector_reconciler.py
+"""
+Reconciler PostgreSQL ↔ ChromaDB (jaring pengaman untuk change feed)
+
+Per batch (keyset by id, memory konstan):
+1. PG → Chroma: chunk 'embedded' yang tidak ada di Chroma, atau content
+   hash / metadata-nya berbeda → dikembalikan ke 'pending' + event upsert
+2. Chroma → PG: id vector yang chunk-nya sudah tidak ada (orphan) →
+   dihapus dari Chroma setelah scan selesai
+Chunk yang sudah dipindah ke arsip tahun lampau (kb_archive_service)
+tidak dihitung hilang.
+
+Perbaikan dieksekusi lewat ChunkSyncService (sama seperti edit dari API).
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from models.chunk import ChunkModel
+from repositories.chunk_change_repository import ChunkChangeRepository, OP_UPSERT
+from repositories.chunk_lease_repository import STATUS_EMBEDDED, STATUS_PENDING
+from services.chunk_sync_service import ChunkSyncService
+from services.embedding_service import EmbeddingService, sanitize_metadata
+from services.kb_archive_service import KnowledgeBaseArchive
+
+
+def content_hash(text: Optional[str]) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def comparable_metadata(metadata: Optional[dict]) -> dict:
+    """Metadata tanpa value None (Chroma tidak menyimpan key bernilai None)"""
+    return {key: value for key, value in (metadata or {}).items() if value is not None}
+
+
+class VectorReconciler:
+
+    def __init__(self, db: Session, embedding_service: EmbeddingService, batch_size: int = 500):
+        self.db = db
+        self.embedding_service = embedding_service
+        self.batch_size = batch_size
+
+    @property
+    def collection(self):
+        return self.embedding_service.vectorstore
+
+    def _expected_metadata(self, chunk: ChunkModel) -> dict:
+        # Sama dengan yang ditulis EmbeddingService.write_batch
+        metadata = sanitize_metadata(chunk.metadata_json or {})
+        metadata["chunk_id"] = chunk.id
+        return metadata
+
+    def _diff_batch(self, chunks: List[ChunkModel]) -> Dict[str, List[int]]:
+        stored = self.collection.get(
+            ids=[str(chunk.id) for chunk in chunks],
+            include=["documents", "metadatas"]
+        )
+        records = {
+            doc_id: (document, metadata)
+            for doc_id, document, metadata in zip(stored["ids"], stored["documents"], stored["metadatas"])
+        }
+
+        missing, stale = [], []
+        for chunk in chunks:
+            record = records.get(str(chunk.id))
+            if record is None:
+                missing.append(chunk.id)
+                continue
+            document, metadata = record
+            if content_hash(document) != content_hash(chunk.content) or (
+                comparable_metadata(metadata) != comparable_metadata(self._expected_metadata(chunk))
+            ):
+                stale.append(chunk.id)
+
+        if missing:
+            archived = KnowledgeBaseArchive(batch_size=self.batch_size).find_archived(str(cid) for cid in missing)
+            missing = [cid for cid in missing if str(cid) not in archived]
+
+        return {"missing": missing, "stale": stale}
+
+    def _requeue(self, chunk_ids: List[int]) -> None:
+        """Kembalikan ke 'pending' + catat event upsert (commit)"""
+        self.db.query(ChunkModel).filter(
+            ChunkModel.id.in_(chunk_ids),
+            ChunkModel.status == STATUS_EMBEDDED
+        ).update({
+            ChunkModel.status: STATUS_PENDING,
+            ChunkModel.claimed_by: None,
+            ChunkModel.lease_expires_at: None
+        }, synchronize_session=False)
+        ChunkChangeRepository(self.db).record(chunk_ids, OP_UPSERT)
+        self.db.commit()
+
+    def check_postgres(self, dry_run: bool = False) -> Dict[str, List[int]]:
+        """Scan chunk 'embedded' dan bandingkan dengan Chroma"""
+        report = {"missing": [], "stale": []}
+        last_id = 0
+
+        while True:
+            chunks = (
+                self.db.query(ChunkModel)
+                .filter(ChunkModel.status == STATUS_EMBEDDED, ChunkModel.id > last_id)
+                .order_by(ChunkModel.id)
+                .limit(self.batch_size)
+                .all()
+            )
+            if not chunks:
+                break
+            last_id = chunks[-1].id
+
+            diff = self._diff_batch(chunks)
+            report["missing"].extend(diff["missing"])
+            report["stale"].extend(diff["stale"])
+
+            to_fix = diff["missing"] + diff["stale"]
+            if to_fix and not dry_run:
+                self._requeue(to_fix)
+
+            # Lepas object batch ini dari session (memory konstan)
+            self.db.expunge_all()
+
+        return report
+
+    def find_orphans(self) -> List[str]:
+        """Id vector di Chroma yang chunk-nya sudah tidak ada di PostgreSQL"""
+        orphans = []
+        offset = 0
+
+        while True:
+            ids = self.collection.get(limit=self.batch_size, offset=offset, include=[])["ids"]
+            if not ids:
+                break
+            offset += len(ids)
+
+            # Id non-numerik bukan berasal dari document_chunks (mis. import manual)
+            numeric = {int(doc_id): doc_id for doc_id in ids if doc_id.isdigit()}
+            if numeric:
+                existing = {
+                    row[0] for row in
+                    self.db.query(ChunkModel.id).filter(ChunkModel.id.in_(list(numeric))).all()
+                }
+                orphans.extend(doc_id for cid, doc_id in numeric.items() if cid not in existing)
+
+            if len(ids) < self.batch_size:
+                break
+
+        return orphans
+
+    def run(self, dry_run: bool = False) -> Dict:
+        """
+        Jalankan reconcile penuh
+
+        Returns:
+            Ringkasan jumlah + contoh id per kategori
+        """
+        pg_report = self.check_postgres(dry_run)
+
+        # Orphan dihapus setelah scan supaya offset Chroma tidak bergeser
+        orphans = self.find_orphans()
+        if orphans and not dry_run:
+            for i in range(0, len(orphans), self.batch_size):
+                self.collection.delete(ids=orphans[i:i + self.batch_size])
+
+        synced = {"events": 0, "deleted": 0, "reembedded": 0}
+        if not dry_run:
+            synced = ChunkSyncService(self.db, self.embedding_service).drain_changes(self.batch_size)
+
+        return {
+            "dry_run": dry_run,
+            "missing": len(pg_report["missing"]),
+            "stale": len(pg_report["stale"]),
+            "orphans": len(orphans),
+            "synced": synced,
+            "samples": {
+                "missing": pg_report["missing"][:20],
+                "stale": pg_report["stale"][:20],
+                "orphans": orphans[:20],
+            }
+        }
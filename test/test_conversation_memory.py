@@ -0,0 +1,191 @@
+# test/test_conversation_memory.py
+
+# Add project root
+import sys
+import os
+import tempfile
+import time
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+import core.conversation_memory as conversation_memory
+from core.conversation_memory import ConversationMemory, get_conversation_context
+from core.conversation_store import SQLiteConversationStore
+from core.conversation_summarizer import RollingSummarizer
+
+
+class _FakeLLMResponse:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class _FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return _FakeLLMResponse(f"ringkasan #{len(self.prompts)}")
+
+
+def _sqlite_store(tmpdir: str) -> SQLiteConversationStore:
+    return SQLiteConversationStore(os.path.join(tmpdir, "conversations.db"))
+
+
+def test_write_behind_is_buffered_until_flush():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = _sqlite_store(tmpdir)
+        memory = ConversationMemory(store=store, flush_interval=60, batch_size=100)
+
+        memory.add_message("s1", "user", "Berapa biaya SD?")
+        memory.add_message("s1", "assistant", "Biaya SD ...")
+
+        # Belum di-flush ke store, tapi tetap terbaca dari cache lokal
+        assert store.load("s1", 10) == []
+        assert [m.role for m in memory.get_history("s1")] == ["user", "assistant"]
+
+        assert memory.flush() == 2
+        assert [r["content"] for r in store.load("s1", 10)] == ["Berapa biaya SD?", "Biaya SD ..."]
+        memory.close()
+
+
+def test_other_worker_sees_history_through_shared_store():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        worker_a = ConversationMemory(store=_sqlite_store(tmpdir), flush_interval=60)
+        worker_b = ConversationMemory(store=_sqlite_store(tmpdir), flush_interval=60)
+
+        worker_a.add_message("s1", "user", "Berapa biaya SD?")
+        worker_a.add_message("s1", "assistant", "Biaya SD ...")
+        worker_a.close()  # flush on shutdown
+
+        history = worker_b.get_history("s1")
+        assert [m.content for m in history] == ["Berapa biaya SD?", "Biaya SD ..."]
+        worker_b.close()
+
+
+def test_history_is_trimmed_and_cleared():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = _sqlite_store(tmpdir)
+        memory = ConversationMemory(max_history=3, store=store, flush_interval=60)
+
+        for i in range(5):
+            memory.add_message("s1", "user", f"pesan {i}")
+
+        assert [m.content for m in memory.get_history("s1")] == ["pesan 2", "pesan 3", "pesan 4"]
+
+        memory.clear_session("s1")
+        assert memory.get_history("s1") == []
+        assert store.load("s1", 10) == []
+        memory.close()
+
+
+def test_expired_sessions_are_evicted_lazily_and_from_heap():
+    memory = ConversationMemory(ttl_minutes=0.001, flush_interval=60)  # ~60ms
+
+    memory.add_message("s1", "user", "Halo")
+    memory.add_message("s2", "user", "Halo juga")
+    time.sleep(0.1)
+
+    # Lazy: akses session yang expired mengembalikan history kosong
+    assert memory.get_history("s1") == []
+
+    # Heap: hanya session yang expired yang disentuh
+    assert memory._expire_due() == 1
+    assert memory.get_stats()["total_sessions"] == 0
+    memory.close()
+
+
+def test_touched_session_outlives_stale_heap_entry():
+    memory = ConversationMemory(ttl_minutes=0.002, flush_interval=60)  # ~120ms
+
+    memory.add_message("s1", "user", "Halo")
+    time.sleep(0.08)
+    memory.add_message("s1", "assistant", "Ada yang bisa dibantu?")
+    time.sleep(0.08)
+
+    # Deadline pertama sudah lewat, tapi session baru saja aktif lagi
+    assert memory._expire_due() == 0
+    assert len(memory.get_history("s1")) == 2
+    memory.close()
+
+
+def test_rolling_summary_folds_older_turns():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = _sqlite_store(tmpdir)
+        memory = ConversationMemory(max_history=50, store=store, flush_interval=60, summary_mode=True)
+        llm = _FakeLLM()
+        summarizer = RollingSummarizer(memory, llm, token_threshold=50, keep_recent_messages=2)
+
+        for i in range(6):
+            memory.add_message("s1", "user" if i % 2 == 0 else "assistant", f"pesan {i} " + "x" * 40)
+
+        summarizer.schedule("s1").result(timeout=5)
+
+        # Hanya 2 message terakhir yang tersisa verbatim
+        assert [m.content.split()[1] for m in memory.get_history("s1")] == ["4", "5"]
+        assert memory.get_summary("s1") == "ringkasan #1"
+        assert "pesan 0" in llm.prompts[0]
+
+        # Summary tersimpan di store, terbaca oleh worker lain
+        other = ConversationMemory(store=_sqlite_store(tmpdir), flush_interval=60, summary_mode=True)
+        assert other.get_summary("s1") == "ringkasan #1"
+        assert len(other.get_history("s1")) == 2
+
+        summarizer.shutdown()
+        other.close()
+        memory.close()
+
+
+def test_summary_mode_keeps_unsummarized_turns_beyond_max_history():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = _sqlite_store(tmpdir)
+        memory = ConversationMemory(max_history=3, store=store, flush_interval=60, summary_mode=True)
+        llm = _FakeLLM()
+        summarizer = RollingSummarizer(memory, llm, token_threshold=50, keep_recent_messages=2)
+
+        for i in range(6):
+            memory.add_message("s1", "user" if i % 2 == 0 else "assistant", f"pesan {i} " + "x" * 40)
+
+        # max_history tidak memotong turn yang belum diringkas
+        assert len(memory.get_history("s1")) == 6
+        other = ConversationMemory(max_history=3, store=_sqlite_store(tmpdir), flush_interval=60, summary_mode=True)
+        memory.flush()
+        assert len(other.get_history("s1")) == 6
+
+        summarizer.summarize("s1")
+        assert "pesan 0" in llm.prompts[0]
+        assert [m.content.split()[1] for m in memory.get_history("s1")] == ["4", "5"]
+
+        summarizer.shutdown()
+        other.close()
+        memory.close()
+
+
+def test_summary_mode_context_includes_every_unsummarized_message():
+    previous = conversation_memory._conversation_memory
+    for summary_mode, expected in ((True, 8), (False, 6)):
+        memory = ConversationMemory(max_history=50, flush_interval=60, summary_mode=summary_mode)
+        conversation_memory._conversation_memory = memory
+        try:
+            # 8 message pendek: di bawah token_threshold, belum diringkas
+            for i in range(8):
+                memory.add_message("s1", "user" if i % 2 == 0 else "assistant", f"pesan {i}")
+
+            context = get_conversation_context("s1", max_turns=3)
+            assert sum(f"pesan {i}" in context for i in range(8)) == expected
+            assert ("pesan 0" in context) == summary_mode
+        finally:
+            conversation_memory._conversation_memory = previous
+            memory.close()
+
+
+if __name__ == "__main__":
+    test_write_behind_is_buffered_until_flush()
+    test_other_worker_sees_history_through_shared_store()
+    test_history_is_trimmed_and_cleared()
+    test_expired_sessions_are_evicted_lazily_and_from_heap()
+    test_touched_session_outlives_stale_heap_entry()
+    test_rolling_summary_folds_older_turns()
+    test_summary_mode_keeps_unsummarized_turns_beyond_max_history()
+    test_summary_mode_context_includes_every_unsummarized_message()
+    print("✅ Conversation memory tests passed")
@@ -0,0 +1,66 @@
+# test/test_embedding_cache.py
+
+# Add project root
+import sys
+import os
+import tempfile
+from typing import List
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+from langchain_core.embeddings import Embeddings
+from utils.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings(Embeddings):
+    """Fake embedding model yang mencatat text apa saja yang di-embed"""
+
+    def __init__(self):
+        self.calls: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.extend(texts)
+        return [[float(len(t)), 0.5, -1.0] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def test_only_changed_chunks_are_embedded():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        model = CountingEmbeddings()
+        cache = EmbeddingCache(os.path.join(tmpdir, "cache.db"))
+        embeddings = CachedEmbeddings(model, cache, "fake-model", 3, "fake")
+
+        first = embeddings.embed_documents(["Biaya SD", "Biaya SMP", "Biaya SMA"])
+        assert model.calls == ["Biaya SD", "Biaya SMP", "Biaya SMA"]
+
+        # Re-chunk setelah edit kecil: hanya chunk yang berubah di-embed
+        second = embeddings.embed_documents(["Biaya SD", "Biaya  SMP\n", "Biaya SMA 2026"])
+        assert model.calls[3:] == ["Biaya SMA 2026"]
+        assert second[0] == first[0]
+        assert second[1] == first[1]  # whitespace dinormalisasi untuk cache key
+        cache.close()
+
+
+def test_cache_is_keyed_by_backend_model_and_dimensions():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        model = CountingEmbeddings()
+        cache = EmbeddingCache(os.path.join(tmpdir, "cache.db"))
+
+        CachedEmbeddings(model, cache, "fake-model", 3, "onnx:model_quantized.onnx").embed_query("Kalau SMP?")
+        CachedEmbeddings(model, cache, "fake-model", 3, "onnx:model_quantized.onnx").embed_query("Kalau SMP?")
+        CachedEmbeddings(model, cache, "other-model", 3, "onnx:model_quantized.onnx").embed_query("Kalau SMP?")
+        # Model & dimensi sama, backend beda (int8 vs fp32): tidak boleh berbagi vector
+        CachedEmbeddings(model, cache, "fake-model", 3, "huggingface").embed_query("Kalau SMP?")
+
+        assert model.calls == ["Kalau SMP?"] * 3
+        assert cache.get_stats()["entries"] == 3
+        assert cache.get_stats()["hits"] == 1
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_only_changed_chunks_are_embedded()
+    test_cache_is_keyed_by_backend_model_and_dimensions()
+    print("✅ Embedding cache tests passed")
@@ -0,0 +1,91 @@
+# test/test_numpy_vector_store.py
+
+# Add project root
+import sys
+import os
+import tempfile
+from typing import List
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+from langchain_core.embeddings import Embeddings
+from core.vector_store import NumpyVectorStore
+
+
+class KeywordEmbeddings(Embeddings):
+    """Fake embedding: satu dimensi per kata kunci"""
+
+    KEYWORDS = ["biaya", "jadwal", "seragam"]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[float(t.lower().count(k)) + 0.01 for k in self.KEYWORDS] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+DOCS = {
+    "1": ("Biaya pendaftaran SD", {"jenjang": "SD", "tahun": "2024"}),
+    "2": ("Biaya pendaftaran SMP", {"jenjang": "SMP", "tahun": "2025"}),
+    "3": ("Jadwal tes SMP", {"jenjang": "SMP", "tahun": "2025"}),
+    "4": ("Seragam SMA", {"jenjang": "SMA", "tahun": "2023"}),
+}
+
+
+def make_store(path: str, **kwargs) -> NumpyVectorStore:
+    embeddings = KeywordEmbeddings()
+    store = NumpyVectorStore(path, "test_kb", embedding_function=embeddings, **kwargs)
+    ids = list(DOCS)
+    documents = [DOCS[i][0] for i in ids]
+    store.upsert(ids, embeddings.embed_documents(documents), documents, [DOCS[i][1] for i in ids])
+    return store
+
+
+def test_search_with_filters():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = make_store(tmpdir)
+        assert store.count() == 4
+
+        top = store.similarity_search("biaya", k=1)
+        assert top[0].page_content.startswith("Biaya")
+
+        docs = store.similarity_search("biaya", k=5, filter={"jenjang": "SMP"})
+        assert [d.page_content for d in docs] == ["Biaya pendaftaran SMP", "Jadwal tes SMP"]
+
+        docs = store.similarity_search("biaya", k=5, filter={"$and": [
+            {"jenjang": {"$in": ["SD", "SMP"]}},
+            {"tahun": {"$gte": "2025"}}
+        ]})
+        assert {d.metadata["jenjang"] for d in docs} == {"SMP"}
+
+        assert store.get(where={"jenjang": {"$ne": "SMP"}}, include=[])["ids"] == ["1", "4"]
+
+
+def test_upsert_delete_and_reload():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = make_store(tmpdir)
+        embeddings = KeywordEmbeddings()
+
+        store.upsert(["4"], embeddings.embed_documents(["Jadwal seragam"]), ["Jadwal seragam"], [{"jenjang": "SMA"}])
+        store.delete(["1"])
+        assert store.count() == 3
+
+        # Proses lain membaca direktori yang sama
+        reopened = NumpyVectorStore(tmpdir, "test_kb", embedding_function=embeddings)
+        assert reopened.count() == 3
+        assert reopened.get(ids=["4"])["documents"] == ["Jadwal seragam"]
+        assert reopened.get(where={"tahun": "2023"}, include=[])["ids"] == []
+
+        # Perubahan store pertama terlihat tanpa reload manual
+        store.delete(["2"])
+        assert reopened.count() == 2
+
+        reopened.compact()
+        assert store.get(include=[])["ids"] == ["3", "4"]
+        assert store.similarity_search("seragam", k=1)[0].page_content == "Jadwal seragam"
+
+
+if __name__ == "__main__":
+    test_search_with_filters()
+    test_upsert_delete_and_reload()
+    print("✅ NumpyVectorStore OK")
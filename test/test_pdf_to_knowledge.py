@@ -0,0 +1,60 @@
+# test/test_pdf_to_knowledge.py
+
+# Add project root
+import sys
+import os
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+from services.pdf_to_knowledge import PDFToKnowledgeConverter
+
+
+class _FakeResponse:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class _FakeLLM:
+    """Fake chat model yang mencatat bagian mana saja yang ditulis ulang"""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, messages):
+        self.prompts.append(messages[-1].content)
+        return _FakeResponse(f"knowledge #{len(self.prompts)}")
+
+
+def _converter(pages):
+    converter = PDFToKnowledgeConverter(openai_api_key="test", rewrite_mode="map_reduce")
+    converter.llm = _FakeLLM()
+    converter.extract_pages = lambda pdf_path: pages
+    return converter
+
+
+def _cached(result):
+    # Sama dengan DocumentRepository.get_page_hashes: {page: (sha, knowledge)}
+    return {page["page_number"]: (page["content_sha256"], page["knowledge_text"]) for page in result.pages}
+
+
+def test_first_revision_rewrites_only_the_changed_page():
+    pages = [(0, "Biaya SD", []), (1, "Biaya SMP", []), (2, "Biaya SMA", [])]
+
+    # Proses pertama: semua halaman ditulis ulang, knowledge per halaman disimpan
+    converter = _converter(pages)
+    first = converter.process("brosur.pdf", cached_pages={})
+    assert len(converter.llm.prompts) == 3
+    assert all(page["knowledge_text"] for page in first.pages)
+
+    # Revisi pertama: satu halaman berubah → tepat satu call LLM
+    revised = [pages[0], (1, "Biaya SMP 2026", []), pages[2]]
+    converter = _converter(revised)
+    second = converter.process("brosur.pdf", cached_pages=_cached(first), previous_knowledge=first.knowledge_text)
+    assert len(converter.llm.prompts) == 1
+    assert "Biaya SMP 2026" in converter.llm.prompts[0]
+    assert [page["reused"] for page in second.pages] == [True, False, True]
+
+
+if __name__ == "__main__":
+    test_first_revision_rewrites_only_the_changed_page()
+    print("✅ PDF to knowledge tests passed")
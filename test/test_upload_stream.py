@@ -0,0 +1,56 @@
+# test/test_upload_stream.py
+
+# Add project root
+import sys
+import os
+import asyncio
+import hashlib
+import io
+import tempfile
+from pathlib import Path
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+from fastapi import UploadFile
+from utils.upload_stream import UploadTooLarge, stream_upload
+
+
+def _upload(data: bytes, size=None) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="brosur.pdf", size=size)
+
+
+def test_oversize_upload_is_rejected_and_temp_file_removed():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Ukuran tidak diketahui di awal: ditolak selagi di-stream
+        try:
+            asyncio.run(stream_upload(_upload(b"x" * 5000), Path(tmpdir), max_bytes=4096, chunk_size=1024))
+            assert False, "UploadTooLarge expected"
+        except UploadTooLarge as e:
+            assert e.max_bytes == 4096
+        assert os.listdir(tmpdir) == []
+
+        # Ukuran dari multipart: ditolak sebelum membaca isi
+        try:
+            asyncio.run(stream_upload(_upload(b"x" * 5000, size=5000), Path(tmpdir), max_bytes=4096))
+            assert False, "UploadTooLarge expected"
+        except UploadTooLarge:
+            pass
+        assert os.listdir(tmpdir) == []
+
+
+def test_upload_is_committed_with_size_and_sha256():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data = b"Biaya pendaftaran SD" * 100
+        upload = asyncio.run(stream_upload(_upload(data), Path(tmpdir), max_bytes=4096, chunk_size=256))
+        assert upload.size == len(data)
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+
+        final = upload.commit(Path(tmpdir) / "brosur.pdf")
+        assert final.read_bytes() == data
+        assert os.listdir(tmpdir) == ["brosur.pdf"]
+
+
+if __name__ == "__main__":
+    test_oversize_upload_is_rejected_and_temp_file_removed()
+    test_upload_is_committed_with_size_and_sha256()
+    print("✅ Upload stream tests passed")
@@ -61,13 +61,32 @@ export default function DocumentsPage() {
   };
 
   const handleProcess = async (documentId: number) => {
+    const toastId = `process-${documentId}`;
     try {
       setProcessingIds((prev) => [...prev, documentId]);
-      await documentService.processDocument(documentId);
-      toast.success("Dokumen berhasil diproses!");
+      const queued = await documentService.processDocument(documentId);
+      toast.loading("Dokumen masuk antrian...", { id: toastId });
+      await fetchDocuments();
+
+      const job = await documentService.waitForJob(queued.id, (current) => {
+        if (current.status === "running") {
+          toast.loading(
+            `Memproses dokumen (${current.stage})... ${Math.round(current.progress * 100)}%`,
+            { id: toastId }
+          );
+        }
+      });
+
+      if (job.status === "completed") {
+        toast.success("Dokumen berhasil diproses!", { id: toastId });
+      } else if (job.status === "cancelled") {
+        toast("Proses dokumen dibatalkan", { id: toastId });
+      } else {
+        toast.error(job.error_message || "Gagal memproses dokumen", { id: toastId });
+      }
       await fetchDocuments();
     } catch (err) {
-      toast.error("Gagal memproses dokumen");
+      toast.error("Gagal memproses dokumen", { id: toastId });
     } finally {
       setProcessingIds((prev) => prev.filter((id) => id !== documentId));
     }
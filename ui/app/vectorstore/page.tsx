@@ -10,6 +10,7 @@ import VectorStoreTable from "@/components/vectorstore/VectorStoreTable";
 
 export default function VectorStorePage() {
   const [documents, setDocuments] = useState<VectorStoreDocument[]>([]);
+  const [total, setTotal] = useState<number | null>(null);
   const [loading, setLoading] = useState(false);
   const [processing, setProcessing] = useState(false);
 
@@ -20,8 +21,11 @@ export default function VectorStorePage() {
   const fetchDocuments = async () => {
     try {
       setLoading(true);
-      const response = await vectorStoreService.getAllDocuments();
+      // Semua halaman (next_cursor): "Add Knowledge Base" mengganti seluruh
+      // chunk per filename, jadi daftar yang terpotong akan menghapus chunk
+      const response = await vectorStoreService.getEveryDocument();
       setDocuments(response.data || []);
+      setTotal(response.pagination?.total ?? null);
       toast.success(response.message);
     } catch (err) {
       toast.error(
@@ -75,7 +79,7 @@ export default function VectorStorePage() {
               Vector Store Documents
             </h1>
             <p className="text-gray-500 mt-1">
-              {documents.length} dokumen dalam vector store
+              {total ?? documents.length} dokumen dalam vector store
             </p>
           </div>
           <div className="flex gap-3">
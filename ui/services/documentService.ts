@@ -4,7 +4,7 @@ import axios from "axios";
 import {
   Document,
   DocumentUploadResponse,
-  DocumentProcessResponse,
+  DocumentJob,
   DocumentListResponse,
   RawTextResponse,
   DocumentRawTextUpdateRequest,
@@ -12,13 +12,18 @@ import {
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
+const FINISHED_JOB_STATUSES = ["completed", "failed", "cancelled"];
+
 class DocumentService {
   private baseUrl = `${API_BASE_URL}/api/documents`;
 
   /**
    * Upload PDF document
    */
-  async uploadDocument(file: File): Promise<DocumentUploadResponse> {
+  async uploadDocument(
+    file: File,
+    replaceDocumentId?: number
+  ): Promise<DocumentUploadResponse> {
     const formData = new FormData();
     formData.append("file", file);
 
@@ -29,6 +34,9 @@ class DocumentService {
         headers: {
           "Content-Type": "multipart/form-data",
         },
+        params: replaceDocumentId
+          ? { replace_document_id: replaceDocumentId }
+          : undefined,
       }
     );
 
@@ -36,16 +44,56 @@ class DocumentService {
   }
 
   /**
-   * Process document (extract content)
+   * Queue document for processing (returns job, see waitForJob)
    */
-  async processDocument(documentId: number): Promise<DocumentProcessResponse> {
-    const response = await axios.post<DocumentProcessResponse>(
+  async processDocument(documentId: number): Promise<DocumentJob> {
+    const response = await axios.post<DocumentJob>(
       `${this.baseUrl}/${documentId}/process`
     );
 
     return response.data;
   }
 
+  /**
+   * Get processing job (status, stage, progress)
+   */
+  async getJob(jobId: number): Promise<DocumentJob> {
+    const response = await axios.get<DocumentJob>(
+      `${this.baseUrl}/jobs/${jobId}`
+    );
+
+    return response.data;
+  }
+
+  /**
+   * Cancel processing job
+   */
+  async cancelJob(jobId: number): Promise<DocumentJob> {
+    const response = await axios.post<DocumentJob>(
+      `${this.baseUrl}/jobs/${jobId}/cancel`
+    );
+
+    return response.data;
+  }
+
+  /**
+   * Poll job sampai completed / failed / cancelled
+   */
+  async waitForJob(
+    jobId: number,
+    onProgress?: (job: DocumentJob) => void,
+    intervalMs: number = 2000
+  ): Promise<DocumentJob> {
+    while (true) {
+      const job = await this.getJob(jobId);
+      onProgress?.(job);
+      if (FINISHED_JOB_STATUSES.includes(job.status)) {
+        return job;
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+  }
+
   /**
    * Get all documents with pagination
    */
@@ -1,4 +1,8 @@
-import { VectorStoreResponse } from "@/types/vectorstore";
+import {
+  VectorStoreDocument,
+  VectorStoreQuery,
+  VectorStoreResponse,
+} from "@/types/vectorstore";
 import { ChunkingRequest, ChunkingResponse, EmbedResponse } from "@/types/chunk";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
@@ -10,9 +14,17 @@ export class VectorStoreService {
     this.baseUrl = `${API_BASE_URL}/api/vectorstore/`;
   }
 
-  // GET - Fetch all documents from vectorstore
-  async getAllDocuments(): Promise<VectorStoreResponse> {
-    const response = await fetch(this.baseUrl, {
+  // GET - Fetch documents from vectorstore (paginated, optional filters)
+  async getAllDocuments(query: VectorStoreQuery = {}): Promise<VectorStoreResponse> {
+    const params = new URLSearchParams();
+    Object.entries(query).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== "") {
+        params.append(key, String(value));
+      }
+    });
+    const url = params.toString() ? `${this.baseUrl}?${params}` : this.baseUrl;
+
+    const response = await fetch(url, {
       method: "GET",
       headers: {
         "Content-Type": "application/json",
@@ -27,6 +39,35 @@ export class VectorStoreService {
     return response.json();
   }
 
+  // GET - Fetch every document by following next_cursor until it is null
+  async getEveryDocument(
+    query: VectorStoreQuery = {},
+    pageSize: number = 1000
+  ): Promise<VectorStoreResponse> {
+    const documents: VectorStoreDocument[] = [];
+    let cursor: string | undefined;
+    let total: number | null = null;
+
+    do {
+      const page = await this.getAllDocuments({ ...query, limit: pageSize, cursor });
+      documents.push(...(page.data || []));
+      total = page.pagination?.total ?? total;
+      cursor = page.pagination?.next_cursor ?? undefined;
+    } while (cursor);
+
+    return {
+      status_code: 200,
+      message: `${documents.length} documents retrieved`,
+      data: documents,
+      pagination: {
+        limit: pageSize,
+        offset: 0,
+        total: total ?? documents.length,
+        next_cursor: null,
+      },
+    };
+  }
+
   // Process documents to chunks
   async processToChunks(
     payload: ChunkingRequest
@@ -46,15 +46,30 @@ export interface DocumentUploadResponse {
   status: string;
 }
 
-export interface DocumentProcessResponse {
-  success: boolean;
-  message: string;
+// POST /api/documents/{id}/process → job di antrian (202)
+export type DocumentJobStatus =
+  | "queued"
+  | "running"
+  | "completed"
+  | "failed"
+  | "cancelled";
+
+export type DocumentJobStage = "queued" | "extract" | "rewrite" | "save" | "done";
+
+export interface DocumentJob {
+  id: number;
   document_id: number;
-  raw_text_preview: string | null;
-  total_pages: number | null;
-  text_length: number | null;
-  tables_count: number | null;
-  images_count: number | null;
+  status: DocumentJobStatus;
+  stage: DocumentJobStage;
+  progress: number; // 0-1
+  message: string | null;
+  error_message: string | null;
+  result: Record<string, any> | null;
+  cancel_requested: boolean;
+  attempts: number;
+  created_at: string | null;
+  started_at: string | null;
+  finished_at: string | null;
 }
 
 export interface DocumentListResponse {
@@ -11,12 +11,33 @@ export interface VectorStoreMetadata {
 }
 
 export interface VectorStoreDocument {
+  id?: string;
   content: string;
   metadata: VectorStoreMetadata;
 }
 
+export interface VectorStorePagination {
+  limit: number;
+  offset: number;
+  total: number | null;
+  next_cursor: string | null;
+}
+
+export interface VectorStoreQuery {
+  limit?: number;
+  offset?: number;
+  cursor?: string;
+  jenjang?: string;
+  kategori?: string;
+  cabang?: string;
+  tahun?: string;
+  filename?: string;
+  source?: string;
+}
+
 export interface VectorStoreResponse {
   status_code: number;
   message: string;
   data: VectorStoreDocument[];
+  pagination?: VectorStorePagination;
 }
\ No newline at end of file
@@ -0,0 +1,258 @@
+# ============================================================================
+# utils/embedding_cache.py
+# ============================================================================
+"""
+Persistent Embedding Cache
+Key: (backend, model name, dimensions, sha256 dari normalized text)
+Value: vector float32 blob
+
+Backend ikut di key karena model yang sama bisa dijalankan beberapa
+backend dengan hasil berbeda (mis. onnx int8 vs huggingface fp32 untuk
+all-MiniLM-L6-v2, sama-sama 384 dimensi): vector-nya tidak boleh tercampur.
+
+Dipakai oleh ingest path (embed_chunks, reembed_chunks, SemanticChunker)
+dan query path, sehingga text yang sama tidak pernah di-embed dua kali.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+def normalize_text(text: str) -> str:
+    """Normalisasi text untuk cache key (whitespace di-collapse)"""
+    return " ".join(text.split())
+
+
+def text_hash(text: str) -> str:
+    """sha256 hex dari normalized text"""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def vector_to_blob(vector: List[float]) -> bytes:
+    """Encode vector sebagai float32 bytes"""
+    return array("f", vector).tobytes()
+
+
+def blob_to_vector(blob: bytes) -> List[float]:
+    """Decode float32 bytes ke list of float"""
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed embedding cache (aman untuk multi-thread & multi-process)
+    """
+
+    def __init__(self, path: str = "./data/embedding_cache.db"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            columns = [
+                row[1] for row in self._conn.execute("PRAGMA table_info(embedding_cache)")
+            ]
+            if columns and "backend" not in columns:
+                # Cache lama tanpa backend: asal vector tidak diketahui, buang
+                self._conn.execute("DROP TABLE embedding_cache")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    backend TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    dimensions INTEGER NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (backend, model, dimensions, text_hash)
+                )
+                """
+            )
+            self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(
+        self,
+        backend: str,
+        model: str,
+        dimensions: int,
+        hashes: Iterable[str]
+    ) -> Dict[str, List[float]]:
+        """
+        Lookup batch hash
+
+        Returns:
+            Dict hash -> vector (hanya yang ditemukan)
+        """
+        hashes = list(dict.fromkeys(hashes))
+        found: Dict[str, List[float]] = {}
+
+        # SQLite membatasi jumlah parameter per query
+        with self._lock:
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embedding_cache "
+                    f"WHERE backend = ? AND model = ? AND dimensions = ? "
+                    f"AND text_hash IN ({placeholders})",
+                    (backend, model, dimensions, *batch)
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = blob_to_vector(blob)
+
+        return found
+
+    def put_many(
+        self,
+        backend: str,
+        model: str,
+        dimensions: int,
+        items: Dict[str, List[float]]
+    ) -> None:
+        """Simpan batch hash -> vector"""
+        if not items:
+            return
+        rows = [
+            (backend, model, dimensions, key, vector_to_blob(vector))
+            for key, vector in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache "
+                "(backend, model, dimensions, text_hash, vector) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def record(self, hits: int, misses: int) -> None:
+        """Tambah counter hits/misses (dipanggil dari banyak thread)"""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def get_stats(self) -> dict:
+        """Cache statistics"""
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "entries": total,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    LangChain Embeddings wrapper: semua embed call lewat EmbeddingCache
+
+    Bisa dipakai langsung sebagai embedding_function Chroma
+    atau embeddings untuk SemanticChunker.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache: EmbeddingCache,
+        model_name: str,
+        dimensions: int,
+        backend: str
+    ):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+        self.dimensions = dimensions
+        self.backend = backend
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents; hanya text yang belum ada di cache yang dikirim ke model"""
+        if not texts:
+            return []
+
+        keys = [text_hash(t) for t in texts]
+        cached = self.cache.get_many(self.backend, self.model_name, self.dimensions, keys)
+
+        # Dedupe text yang sama di dalam satu batch
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        self.cache.record(hits=sum(1 for k in keys if k in cached), misses=len(missing))
+
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            self.cache.put_many(self.backend, self.model_name, self.dimensions, fresh)
+            cached.update(fresh)
+
+        return [cached[k] for k in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed query (di-cache juga, pertanyaan populer sering berulang)"""
+        key = text_hash(text)
+        cached = self.cache.get_many(self.backend, self.model_name, self.dimensions, [key])
+        if key in cached:
+            self.cache.record(hits=1, misses=0)
+            return cached[key]
+
+        self.cache.record(hits=0, misses=1)
+        vector = self.embeddings.embed_query(text)
+        self.cache.put_many(self.backend, self.model_name, self.dimensions, {key: vector})
+        return vector
+
+
+# Shared cache handle per path (satu koneksi SQLite per process)
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(path: str = "./data/embedding_cache.db") -> EmbeddingCache:
+    """Get or create shared EmbeddingCache untuk path"""
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = EmbeddingCache(path)
+        return _caches[path]
+
+
+def with_embedding_cache(
+    embeddings: Embeddings,
+    model_name: str,
+    dimensions: int,
+    backend: str,
+    cache_cfg: Optional[dict] = None
+) -> Embeddings:
+    """
+    Wrap embeddings dengan CachedEmbeddings jika cache enabled
+
+    Args:
+        embeddings: Embeddings asli (OpenAI / HuggingFace)
+        model_name: Nama model (bagian dari cache key)
+        dimensions: Dimensi vector (bagian dari cache key)
+        backend: Backend + presisi (bagian dari cache key, mis. "onnx:model_quantized.onnx")
+        cache_cfg: Section `embeddings.cache` dari config.yaml
+    """
+    cache_cfg = cache_cfg or {}
+    if not cache_cfg.get("enabled", False) or isinstance(embeddings, CachedEmbeddings):
+        return embeddings
+
+    cache = get_embedding_cache(cache_cfg.get("path", "./data/embedding_cache.db"))
+    return CachedEmbeddings(embeddings, cache, model_name, dimensions, backend)
@@ -6,13 +6,42 @@ import time
 from enum import Enum
 from typing import List
 
-from langchain_openai import OpenAIEmbeddings
-from langchain_huggingface import HuggingFaceEmbeddings
+from utils.embedding_cache import with_embedding_cache
+
+# Model OpenAI yang mendukung native dimension truncation (Matryoshka)
+OPENAI_MAX_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+}
+
+
+def openai_embedding_kwargs(model_name: str, dimensions: int = None) -> dict:
+    """
+    Argumen OpenAIEmbeddings untuk model + dimensions dari config
+
+    text-embedding-3-* menerima `dimensions` (<= dimensi penuh);
+    model lama (ada-002) tidak, sehingga dimensions hanya dikirim jika didukung.
+    """
+    kwargs = {"model": model_name}
+    if dimensions is None:
+        return kwargs
+
+    max_dimensions = OPENAI_MAX_DIMENSIONS.get(model_name)
+    if max_dimensions is None:
+        print(f"⚠️ {model_name} tidak mendukung `dimensions`, memakai dimensi default model")
+        return kwargs
+    if not 1 <= dimensions <= max_dimensions:
+        raise ValueError(f"dimensions {model_name} harus 1..{max_dimensions}, bukan {dimensions}")
+
+    kwargs["dimensions"] = dimensions
+    return kwargs
+
 
 class EmbeddingModel(Enum):
     """Model embedding yang tersedia"""
     OPENAI = "openai"
     HUGGINGFACE = "huggingface"
+    ONNX = "onnx"
 
 
 class EmbeddingManager:
@@ -21,7 +50,11 @@ class EmbeddingManager:
     
     Supports:
     - OpenAI embeddings (cloud-based)
-    - HuggingFace embeddings (local)
+    - HuggingFace embeddings (local, PyTorch)
+    - ONNX embeddings (local, int8 ONNX Runtime tanpa torch)
+    
+    Semua embed call lewat persistent EmbeddingCache jika
+    `embeddings.cache.enabled` (atau config['cache']) aktif.
     """
     
     def __init__(
@@ -31,13 +64,55 @@ class EmbeddingManager:
     ):
         self.model_type = model_type
         self.config = config or {}
-        self.embeddings = self._initialize_embeddings()
+        self.embeddings = with_embedding_cache(
+            self._initialize_embeddings(),
+            model_name=self.get_model_name(),
+            dimensions=self.get_embedding_dimension(),
+            backend=self.get_cache_backend(),
+            cache_cfg=self._cache_config()
+        )
+    
+    @classmethod
+    def from_config(cls, embedding_cfg: dict) -> "EmbeddingManager":
+        """
+        Buat manager dari section `embeddings` di config.yaml
+        (embeddings.model memilih sub-section openai/huggingface/onnx)
+        """
+        model_type = EmbeddingModel(embedding_cfg["model"])
+        config = dict(embedding_cfg.get(model_type.value, {}))
+        if "cache" in embedding_cfg:
+            config.setdefault("cache", embedding_cfg["cache"])
+        return cls(model_type=model_type, config=config)
+    
+    def _cache_config(self) -> dict:
+        """Cache settings: config['cache'] atau embeddings.cache di config.yaml"""
+        if 'cache' in self.config:
+            return self.config['cache']
+        
+        from core.config_loader import APP_CONFIG
+        return APP_CONFIG.get('embeddings', {}).get('cache', {})
+    
+    def get_model_name(self) -> str:
+        """Get model name (dipakai sebagai bagian cache key)"""
+        if self.model_type == EmbeddingModel.OPENAI:
+            return self.config.get('model_name', 'text-embedding-3-small')
+        return self.config.get('model_name', 'sentence-transformers/all-MiniLM-L6-v2')
+    
+    def get_cache_backend(self) -> str:
+        """
+        Backend tag untuk cache key: model yang sama di backend lain
+        (onnx int8 vs huggingface fp32) menghasilkan vector berbeda
+        """
+        if self.model_type == EmbeddingModel.ONNX:
+            return f"onnx:{self.config.get('model_file', 'model_quantized.onnx')}"
+        return self.model_type.value
     
     def _initialize_embeddings(self):
         """Initialize embedding model based on type"""
         
         if self.model_type == EmbeddingModel.OPENAI:
             print("🔤 Initializing OpenAI Embeddings...")
+            from langchain_openai import OpenAIEmbeddings
             
             model_name = self.config.get(
                 'model_name',
@@ -45,12 +120,13 @@ class EmbeddingManager:
             )
             
             return OpenAIEmbeddings(
-                model=model_name,
-                dimensions=self.config.get('dimensions', 1536)
+                **openai_embedding_kwargs(model_name, self.config.get('dimensions', 1536))
             )
         
         elif self.model_type == EmbeddingModel.HUGGINGFACE:
             print("🔤 Initializing HuggingFace Embeddings...")
+            # Import lazy: torch hanya di-load jika backend ini dipakai
+            from langchain_huggingface import HuggingFaceEmbeddings
             
             model_name = self.config.get(
                 'model_name',
@@ -58,6 +134,10 @@ class EmbeddingManager:
             )
             
             device = self.config.get('device', 'cpu')
+            if device == 'cuda':
+                import torch
+                if not torch.cuda.is_available():
+                    device = 'cpu'
             
             return HuggingFaceEmbeddings(
                 model_name=model_name,
@@ -65,6 +145,20 @@ class EmbeddingManager:
                 encode_kwargs={'normalize_embeddings': True}
             )
         
+        elif self.model_type == EmbeddingModel.ONNX:
+            print("🔤 Initializing ONNX Embeddings (int8)...")
+            from utils.onnx_embeddings import OnnxEmbeddings
+            
+            return OnnxEmbeddings(
+                model_path=self.config.get('model_path', './models_onnx/all-MiniLM-L6-v2-int8'),
+                model_file=self.config.get('model_file', 'model_quantized.onnx'),
+                intra_op_threads=self.config.get('intra_op_threads', 0),
+                batch_size=self.config.get('batch_size', 32),
+                max_batch_tokens=self.config.get('max_batch_tokens', 8192),
+                max_seq_length=self.config.get('max_seq_length', 256),
+                max_wait_ms=self.config.get('max_wait_ms', 2.0)
+            )
+        
         else:
             raise ValueError(f"Unsupported embedding model: {self.model_type}")
     
@@ -108,6 +202,6 @@ class EmbeddingManager:
         """Get embedding dimension"""
         if self.model_type == EmbeddingModel.OPENAI:
             return self.config.get('dimensions', 1536)
-        elif self.model_type == EmbeddingModel.HUGGINGFACE:
+        elif self.model_type in (EmbeddingModel.HUGGINGFACE, EmbeddingModel.ONNX):
             return self.config.get('dimensions', 384)  # Default for all-MiniLM-L6-v2
         return None
\ No newline at end of file
@@ -13,6 +13,8 @@ from langchain_core.documents import Document
 from langchain_experimental.text_splitter import SemanticChunker
 from langchain_openai import OpenAIEmbeddings
 import yaml
+from utils.embedding_cache import with_embedding_cache
+from utils.embeddings import openai_embedding_kwargs
 from typing import List, Dict, Any
 
 
@@ -71,7 +73,24 @@ class EnhancedChunker:
         breakpoint_threshold_type = cfg.get("breakpoint_threshold_type", "percentile")
         breakpoint_threshold_amount = cfg.get("breakpoint_threshold", 95)
 
-        embeddings = OpenAIEmbeddings() if self.strategy == "semantic" else None
+        embeddings = None
+        if self.strategy == "semantic":
+            # Model & dimensions sama dengan embeddings.openai di config.yaml
+            openai_cfg = self.config.get("embeddings", {}).get("openai", {})
+            embeddings = OpenAIEmbeddings(**openai_embedding_kwargs(
+                openai_cfg.get("model_name", "text-embedding-3-small"),
+                openai_cfg.get("dimensions")
+            ))
+
+            # Sentence embeddings lewat cache: re-chunk dokumen yang sedikit diedit
+            # hanya meng-embed kalimat yang berubah
+            embeddings = with_embedding_cache(
+                embeddings,
+                model_name=embeddings.model,
+                dimensions=embeddings.dimensions or 1536,
+                backend="openai",
+                cache_cfg=self.config.get("embeddings", {}).get("cache")
+            )
 
         return SemanticChunker(
             embeddings=embeddings,
@@ -0,0 +1,212 @@
+# ============================================================================
+# utils/onnx_embeddings.py
+# ============================================================================
+"""
+Quantized ONNX Sentence-Transformer Embeddings (CPU)
+Menjalankan model sentence-transformers (mis. all-MiniLM-L6-v2) sebagai
+ONNX Runtime session int8 tanpa torch:
+
+- Padding-aware bucketing: text diurutkan berdasarkan jumlah token lalu
+  dibagi per batch, setiap batch hanya di-pad sampai token terpanjang
+  di batch itu (bukan max_seq_length)
+- Batch dibatasi jumlah dokumen (batch_size) dan total token (max_batch_tokens)
+- Dynamic batching untuk query: embed_query dari banyak request yang datang
+  bersamaan digabung jadi satu session.run (jendela max_wait_ms)
+- intra_op_num_threads bisa di-set supaya beberapa worker tidak rebutan core
+
+Model dibuat sekali dengan run_onnx_export.py (butuh optimum saat export saja).
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+DEFAULT_MODEL_FILE = "model_quantized.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class _QueryBatcher:
+    """
+    Gabungkan embed_query yang datang bersamaan menjadi satu batch
+    (request pertama menunggu maksimal max_wait_ms untuk teman sebatch)
+    """
+
+    def __init__(self, encode_fn, max_batch_size: int = 32, max_wait_ms: float = 2.0):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="onnx-query-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> List[float]:
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def _loop(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            try:
+                while len(items) < self.max_batch_size:
+                    items.append(self._queue.get(timeout=self.max_wait))
+            except queue.Empty:
+                pass
+
+            try:
+                vectors = self.encode_fn([text for text, _ in items])
+                for (_, future), vector in zip(items, vectors):
+                    future.set_result(vector)
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    LangChain Embeddings untuk sentence-transformer ONNX (int8)
+
+    Args:
+        model_path: Direktori berisi model_quantized.onnx + tokenizer.json
+        model_file: Nama file ONNX di model_path
+        intra_op_threads: Thread per operator (0 = default ONNX Runtime)
+        batch_size: Maksimal dokumen per session.run
+        max_batch_tokens: Maksimal (dokumen x panjang padded) per batch
+        max_seq_length: Truncation token
+        max_wait_ms: Jendela dynamic batching embed_query (0 = nonaktif)
+        normalize: L2-normalize output (sama seperti normalize_embeddings=True)
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        model_file: str = DEFAULT_MODEL_FILE,
+        intra_op_threads: int = 0,
+        batch_size: int = 32,
+        max_batch_tokens: int = 8192,
+        max_seq_length: int = 256,
+        max_wait_ms: float = 2.0,
+        normalize: bool = True
+    ):
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "Backend ONNX membutuhkan `onnxruntime` dan `tokenizers` "
+                "(pip install onnxruntime tokenizers)"
+            ) from e
+
+        model_file_path = os.path.join(model_path, model_file)
+        tokenizer_path = os.path.join(model_path, TOKENIZER_FILE)
+        if not os.path.exists(model_file_path):
+            raise FileNotFoundError(
+                f"Model ONNX tidak ditemukan: {model_file_path} "
+                f"(jalankan: python run_onnx_export.py --output {model_path})"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.inter_op_num_threads = 1
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.session = ort.InferenceSession(
+            model_file_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.no_padding()
+
+        self.batch_size = max(1, batch_size)
+        self.max_batch_tokens = max(max_seq_length, max_batch_tokens)
+        self.normalize = normalize
+
+        self._batcher: Optional[_QueryBatcher] = None
+        if max_wait_ms > 0:
+            self._batcher = _QueryBatcher(self._encode, self.batch_size, max_wait_ms)
+
+    # ------------------------------------------------------------------
+    # Batching
+    # ------------------------------------------------------------------
+    def _buckets(self, lengths: List[int]) -> List[List[int]]:
+        """
+        Urutkan index berdasarkan panjang token lalu potong per batch
+        dengan batas batch_size dan max_batch_tokens (padded)
+        """
+        order = sorted(range(len(lengths)), key=lengths.__getitem__)
+        buckets: List[List[int]] = []
+        current: List[int] = []
+
+        for idx in order:
+            padded_len = lengths[idx]  # terurut naik → item ini yang terpanjang
+            if current and (
+                len(current) >= self.batch_size
+                or (len(current) + 1) * padded_len > self.max_batch_tokens
+            ):
+                buckets.append(current)
+                current = []
+            current.append(idx)
+
+        if current:
+            buckets.append(current)
+        return buckets
+
+    def _run(self, encodings) -> np.ndarray:
+        """session.run satu batch yang di-pad ke token terpanjang di batch"""
+        max_len = max(len(enc.ids) for enc in encodings)
+        input_ids = np.zeros((len(encodings), max_len), dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), max_len), dtype=np.int64)
+
+        for row, enc in enumerate(encodings):
+            input_ids[row, :len(enc.ids)] = enc.ids
+            attention_mask[row, :len(enc.ids)] = 1
+
+        feeds: Dict[str, np.ndarray] = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling (abaikan padding)
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.normalize:
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        encodings = self.tokenizer.encode_batch(texts)
+        result: List[Optional[np.ndarray]] = [None] * len(texts)
+
+        for bucket in self._buckets([len(enc.ids) for enc in encodings]):
+            vectors = self._run([encodings[i] for i in bucket])
+            for i, vector in zip(bucket, vectors):
+                result[i] = vector
+
+        return [vector.tolist() for vector in result]
+
+    # ------------------------------------------------------------------
+    # LangChain interface
+    # ------------------------------------------------------------------
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(list(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        if self._batcher is not None:
+            return self._batcher.submit(text)
+        return self._encode([text])[0]
@@ -7,9 +7,10 @@ Simplified Smart Retriever - Pure Embedding Search
 
 from typing import List, Dict
 from langchain_core.documents import Document
-from langchain_chroma import Chroma
 import numpy as np
 
+from core.vector_store import VectorStore
+
 
 class SmartRetriever:
     """
@@ -18,18 +19,23 @@ class SmartRetriever:
     
     def __init__(
         self,
-        vectorstore: Chroma,
+        vectorstore: VectorStore,
         embedding_function,
         top_k: int = 5,
         similarity_threshold: float = 0.5,
-        min_docs_required: int = 2  # ✅ Minimal 2 dokumen relevan
+        min_docs_required: int = 2,  # ✅ Minimal 2 dokumen relevan
+        archive=None  # KnowledgeBaseArchive: arsip tahun lampau
     ):
-        self.vectorstore = vectorstore
         self.embedding_function = embedding_function
         self.top_k = top_k
         self.similarity_threshold = similarity_threshold
         self.min_docs_required = min_docs_required
-        self.collection = vectorstore._collection
+        self.archive = archive
+        self.set_vectorstore(vectorstore)
+
+    def set_vectorstore(self, vectorstore: VectorStore) -> None:
+        """Tukar collection (versi KB baru) tanpa membuat retriever ulang"""
+        self.vectorstore = vectorstore
     
     def retrieve(self, query: str) -> List[Document]:
         """
@@ -37,6 +43,7 @@ class SmartRetriever:
         1. Preprocess query
         2. Embed query
         3. Search vector database
+           (+ arsip jika query menyebut tahun ajaran lampau)
         4. Filter by similarity threshold
         5. Return documents
         """
@@ -52,24 +59,23 @@ class SmartRetriever:
         query_embedding = self.embedding_function.embed_query(cleaned_query)
         print(f"🔢 Embedding dimension: {len(query_embedding)}")
         
-        # Step 3: Search vector database
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=self.top_k,
-            include=["documents", "metadatas", "distances"]
-        )
+        # Step 3: Search vector database (backend dari vectordb.type)
+        hits = [
+            (distance, doc.page_content, doc.metadata)
+            for doc, distance in self.vectorstore.similarity_search_by_vector_with_score(
+                query_embedding, k=self.top_k
+            )
+        ]
+        archive_hits = self._search_archives(cleaned_query, query_embedding)
+        if archive_hits:
+            hits = sorted(hits + archive_hits, key=lambda hit: hit[0])[:self.top_k]
         
         print(f"🎯 Searching for top {self.top_k} results")
-        print(f"📊 Found {len(results['ids'][0])} relevant chunks")
+        print(f"📊 Found {len(hits)} relevant chunks")
         
         # Step 4: Process results and filter by similarity
         docs = []
-        for i, (doc_id, distance, content, metadata) in enumerate(zip(
-            results['ids'][0],
-            results['distances'][0],
-            results['documents'][0],
-            results['metadatas'][0]
-        )):
+        for i, (distance, content, metadata) in enumerate(hits):
             # Convert distance to similarity
             similarity = 1 - (distance / 2)  # Normalize cosine distance
             
@@ -101,6 +107,20 @@ class SmartRetriever:
         print(f"\n✅ Filtered to {len(docs)} documents (threshold: {self.similarity_threshold})")
         return docs
 
+    def _search_archives(self, query: str, query_embedding: List[float]) -> List[tuple]:
+        """(distance, content, metadata) dari arsip tahun yang disebut query"""
+        if self.archive is None:
+            return []
+        hits = []
+        try:
+            for store in self.archive.stores_for_tahun(query):
+                print(f"🗄️ Searching archive {store.name}")
+                for doc, distance in store.similarity_search_by_vector_with_score(query_embedding, k=self.top_k):
+                    hits.append((distance, doc.page_content, doc.metadata))
+        except Exception as e:
+            print(f"⚠️ Archive search error: {e}")
+        return hits
+
 
 # ============================================================================
 # ENHANCED QUERY CHAIN - SIMPLIFIED
@@ -7,11 +7,13 @@ Enhanced Smart Retriever with:
 - Metadata filtering
 - Re-ranking
 - Fallback mechanisms
+- Arsip tahun lampau (hanya jika query menyebut tahun lama)
 """
 
 from typing import List, Dict, Optional
 from langchain_core.documents import Document
-from langchain_chroma import Chroma
+
+from core.vector_store import VectorStore
 
 
 class EnhancedSmartRetriever:
@@ -28,21 +30,24 @@ class EnhancedSmartRetriever:
     
     def __init__(
         self,
-        vectorstore: Chroma,
+        vectorstore: VectorStore,
         query_processor,
         top_k: int = 5,
         use_hybrid: bool = False,
         enable_reranking: bool = True,
-        diversity_threshold: float = 0.7
+        diversity_threshold: float = 0.7,
+        archive=None
     ):
         """
         Args:
-            vectorstore: ChromaDB vectorstore
+            vectorstore: VectorStore (Chroma atau NumPy, lihat vectordb.type)
             query_processor: QueryProcessor instance
             top_k: Number of documents to retrieve
             use_hybrid: Enable hybrid search (semantic + BM25)
             enable_reranking: Enable re-ranking of results
             diversity_threshold: Min similarity for diversity filtering
+            archive: KnowledgeBaseArchive (services/kb_archive_service.py);
+                None = hanya collection aktif
         """
         self.vectorstore = vectorstore
         self.query_processor = query_processor
@@ -50,6 +55,11 @@ class EnhancedSmartRetriever:
         self.use_hybrid = use_hybrid
         self.enable_reranking = enable_reranking
         self.diversity_threshold = diversity_threshold
+        self.archive = archive
+
+    def set_vectorstore(self, vectorstore: VectorStore) -> None:
+        """Tukar versi KB (promote/rollback) tanpa membuat retriever ulang"""
+        self.vectorstore = vectorstore
     
     def retrieve(
         self,
@@ -132,11 +142,12 @@ class EnhancedSmartRetriever:
         Retrieve using multi-strategy approach
         
         Strategy:
+        0. Query menyebut tahun ajaran yang sudah diarsip → cari di arsip
         1. Try with filters first
         2. If results < threshold, try without filters
         3. Merge results intelligently
         """
-        all_docs = []
+        all_docs = self._archive_search(search_query, filters, top_k * 2)
         
         # Strategy 1: Semantic search with filters
         if filters:
@@ -179,6 +190,42 @@ class EnhancedSmartRetriever:
         
         return all_docs
     
+    def _archive_search(
+        self,
+        query: str,
+        filters: Optional[Dict],
+        k: int
+    ) -> List[Document]:
+        """
+        Semantic search di arsip tahun ajaran yang disebut query
+        """
+        if self.archive is None or not filters or not filters.get("tahun"):
+            return []
+        try:
+            stores = self.archive.stores_for_tahun(filters["tahun"])
+        except Exception as e:
+            print(f"      ⚠️ Archive lookup error: {e}")
+            return []
+        if not stores:
+            return []
+
+        print(f"   📌 Strategy 0: Arsip {', '.join(store.name for store in stores)}")
+
+        # Arsip sudah per tahun ajaran: filter tahun tidak dipakai
+        # (metadata "2023/2024" tidak sama dengan "2023" dari query)
+        where_clause = self._build_where_clause(
+            {key: value for key, value in filters.items() if key != "tahun"}
+        )
+
+        docs = []
+        for store in stores:
+            try:
+                docs.extend(store.similarity_search(query, k=k, filter=where_clause))
+            except Exception as e:
+                print(f"      ⚠️ Archive search error ({store.name}): {e}")
+        print(f"      → {len(docs)} docs")
+        return docs
+
     def _semantic_search_with_filter(
         self,
         query: str,
@@ -428,7 +475,7 @@ class EnhancedSmartRetriever:
         where_clause = self._build_where_clause(filters)
         
         try:
-            results = self.vectorstore._collection.get(
+            results = self.vectorstore.get(
                 where=where_clause,
                 limit=limit,
                 include=["documents", "metadatas"]
@@ -454,7 +501,7 @@ class EnhancedSmartRetriever:
         Useful for UI filters
         """
         try:
-            all_data = self.vectorstore._collection.get(
+            all_data = self.vectorstore.get(
                 include=["metadatas"],
                 limit=10000  # Get all
             )
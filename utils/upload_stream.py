@@ -0,0 +1,96 @@
+# ============================================================================
+# utils/upload_stream.py
+# ============================================================================
+"""
+Streaming upload ke disk
+UploadFile dibaca per chunk (ukuran tetap) dan ditulis ke file sementara
+di direktori tujuan dengan aiofiles: sha256 dihitung dan batas ukuran
+dicek selagi byte masuk, sehingga memory per upload konstan dan file
+yang terlalu besar ditolak tanpa dibaca sampai habis.
+
+File sementara baru dipindah ke nama akhir (os.replace, atomik di
+filesystem yang sama) setelah caller memutuskan file dipakai: upload
+yang gagal / duplikat tidak meninggalkan file setengah jadi.
+"""
+
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import aiofiles
+from fastapi import UploadFile
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+class UploadTooLarge(ValueError):
+    """File melebihi batas ukuran upload"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"File too large (max {max_bytes / (1024 * 1024):.1f}MB)")
+
+
+class StreamedUpload:
+    """File sementara hasil stream_upload (commit atau discard)"""
+
+    def __init__(self, temp_path: Path, size: int, sha256: str):
+        self.temp_path = temp_path
+        self.size = size
+        self.sha256 = sha256
+
+    def commit(self, final_path: Path) -> Path:
+        """Pindahkan ke nama akhir (atomik)"""
+        os.replace(self.temp_path, final_path)
+        return Path(final_path)
+
+    def discard(self) -> None:
+        try:
+            self.temp_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+async def stream_upload(
+    file: UploadFile,
+    directory: Path,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> StreamedUpload:
+    """
+    Tulis upload ke file sementara di `directory`
+
+    Raises:
+        UploadTooLarge: ukuran melebihi max_bytes (file sementara dihapus)
+    """
+    # Ukuran sudah diketahui dari multipart: tolak sebelum membaca isi
+    if max_bytes and file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    temp_path = directory / f".upload-{uuid.uuid4().hex}.part"
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+
+    return StreamedUpload(temp_path, size, digest.hexdigest())
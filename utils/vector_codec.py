@@ -0,0 +1,128 @@
+# ============================================================================
+# utils/vector_codec.py
+# ============================================================================
+"""
+Compact Vector Storage for PostgreSQL
+Mode penyimpanan kolom document_embeddings.vector:
+- json     : array float sebagai JSON (legacy, ~30 KB/row @1536 dims)
+- bytea    : float32 little-endian bytes (4 bytes/dim, ~6 KB/row)
+- pgvector : tipe vector dari extension pgvector (jika package tersedia);
+             tanpa batas dimensi, sehingga migrasi model dengan dimensi lain
+             (run_collection_migration.py) tidak perlu migrasi kolom
+"""
+
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+from sqlalchemy import JSON, LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+FLOAT32 = np.dtype("<f4")
+
+VECTOR_STORAGE_MODES = ("json", "bytea", "pgvector")
+
+
+def encode_float32(vector: Union[Sequence[float], np.ndarray]) -> bytes:
+    """Encode vector ke float32 bytes"""
+    return np.asarray(vector, dtype=FLOAT32).tobytes()
+
+
+def decode_float32(blob: Union[bytes, memoryview]) -> np.ndarray:
+    """
+    Decode float32 bytes ke NumPy array tanpa copy
+    (array read-only, berbagi buffer dengan blob)
+    """
+    return np.frombuffer(blob, dtype=FLOAT32)
+
+
+def decode_many(blobs: Sequence[Union[bytes, memoryview]], dimensions: Optional[int] = None) -> np.ndarray:
+    """
+    Decode banyak blob sekaligus menjadi matrix (n, dimensions)
+    Satu join + satu frombuffer, tanpa loop per-element di Python
+    """
+    if not blobs:
+        return np.empty((0, dimensions or 0), dtype=FLOAT32)
+    matrix = np.frombuffer(b"".join(bytes(b) for b in blobs), dtype=FLOAT32)
+    return matrix.reshape(len(blobs), dimensions or -1)
+
+
+def to_pgvector_text(vector: Union[Sequence[float], np.ndarray]) -> str:
+    """Format vector sebagai literal pgvector: [0.1,0.2,...]"""
+    return "[" + ",".join(repr(float(x)) for x in np.asarray(vector, dtype=FLOAT32)) + "]"
+
+
+class Float32Vector(TypeDecorator):
+    """
+    SQLAlchemy type: list/ndarray <-> bytea float32
+    Result value adalah NumPy array (zero-copy dari buffer driver)
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return encode_float32(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return decode_float32(value)
+
+
+def pgvector_available() -> bool:
+    """Cek apakah package pgvector terinstall"""
+    try:
+        import pgvector.sqlalchemy  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def vector_column_type(storage: str = "json"):
+    """
+    SQLAlchemy column type untuk mode penyimpanan vector
+
+    Args:
+        storage: json, bytea, atau pgvector (kolom `vector` tanpa dimensi)
+    """
+    if storage == "json":
+        return JSON
+    if storage == "bytea":
+        return Float32Vector
+    if storage == "pgvector":
+        if pgvector_available():
+            from pgvector.sqlalchemy import Vector
+            return Vector()
+        print("⚠️ pgvector package tidak tersedia, fallback ke float32 bytea")
+        return Float32Vector
+    raise ValueError(f"Vector storage tidak dikenali: {storage}")
+
+
+def resolve_vector_storage(storage: str) -> str:
+    """Mode efektif (pgvector tanpa package -> bytea)"""
+    if storage == "pgvector" and not pgvector_available():
+        return "bytea"
+    return storage
+
+
+def copy_literal(vector: Union[Sequence[float], np.ndarray], storage: str) -> str:
+    """
+    Literal kolom vector untuk COPY ... FROM STDIN (text format)
+    """
+    if storage == "bytea":
+        # bytea hex format; backslash di-escape untuk COPY text format
+        return "\\\\x" + encode_float32(vector).hex()
+    if storage == "pgvector":
+        return to_pgvector_text(vector)
+    return "[" + ",".join(repr(float(x)) for x in vector) + "]"
+
+
+def as_list(vector) -> List[float]:
+    """Normalisasi vector dari mode apapun ke list of float"""
+    if vector is None:
+        return []
+    if isinstance(vector, (bytes, memoryview)):
+        return decode_float32(vector).tolist()
+    return np.asarray(vector, dtype=FLOAT32).tolist()